@@ -1,42 +1,90 @@
 # ruff: noqa: B008
 
+from collections.abc import Awaitable, Callable
 from datetime import date
 from typing import Literal
 
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy import create_engine
-from sqlalchemy.engine import Engine
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import cache_key, etag_matches, get_response_cache, make_etag
+from app.core.config import settings
+from app.db.data_version import DataVersionReader
+from app.db.session import get_async_db
 from app.schemas.dashboard import MonthlySummaryRow, TrendResponse
-from app.services.dashboard import fetch_monthly_summary, fetch_trend
+from app.services.dashboard import (
+    fetch_monthly_rollup_async,
+    fetch_monthly_summary_async,
+    fetch_trend_async,
+    fetch_trend_rollup_async,
+)
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
+_data_version = DataVersionReader(max_age=settings.cache_version_check_s)
+_monthly_rows = TypeAdapter(list[MonthlySummaryRow])
 
-# If you already have a DB dependency (recommended), replace this with your existing one.
-def get_engine() -> Engine:
-    # expects DATABASE_URL in env
-    import os
 
-    url = os.getenv("DATABASE_URL")
-    if not url:
-        raise RuntimeError("DATABASE_URL is not set")
-    return create_engine(url, pool_pre_ping=True)
+async def _cached_json(
+    request: Request,
+    db: AsyncSession,
+    endpoint: str,
+    params: dict,
+    compute: Callable[[], Awaitable[bytes]],
+) -> Response:
+    """Serve a JSON body from the response cache, keyed by params + data version.
+
+    The ETag is derived from the same key, so a client holding the current
+    version gets a 304 without the query (or the cache) being touched.
+    """
+    version = await _data_version.get(db)
+    key = cache_key(endpoint, params)
+    etag = make_etag(key, version)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={settings.cache_max_age_s}, must-revalidate",
+    }
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    cache = get_response_cache()
+    versioned_key = f"{key}#v{version}"
+    body = await cache.get(versioned_key)
+    headers["X-Cache"] = "hit" if body is not None else "miss"
+    if body is None:
+        body = await compute()
+        await cache.set(versioned_key, body, settings.cache_ttl_s)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.get("/monthly", response_model=list[MonthlySummaryRow])
-def dashboard_monthly(
+async def dashboard_monthly(
+    request: Request,
     start: date | None = Query(default=None),
     end: date | None = Query(default=None),
-    engine: Engine = Depends(get_engine),
+    source: str | None = Query(default=None),
+    category: str | None = Query(default=None, description="'' selects uncategorized rows"),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    with engine.begin() as conn:
-        rows = fetch_monthly_summary(conn, start=start, end=end)
-        return [MonthlySummaryRow(**r) for r in rows]
+    async def compute() -> bytes:
+        # async route: waiting on Postgres does not hold a threadpool thread
+        conn = await db.connection()
+        if source is None and category is None:
+            rows = await fetch_monthly_summary_async(conn, start=start, end=end)
+        else:
+            rows = await fetch_monthly_rollup_async(
+                conn, start=start, end=end, source=source, category=category
+            )
+        return _monthly_rows.dump_json([MonthlySummaryRow(**r) for r in rows], exclude_none=True)
+
+    params = {"start": start, "end": end, "source": source, "category": category}
+    return await _cached_json(request, db, "monthly", params, compute)
 
 
 @router.get("/trend", response_model=TrendResponse)
-def dashboard_trend(
+async def dashboard_trend(
+    request: Request,
     start: date = Query(..., description="Inclusive start date"),
     end: date = Query(..., description="Exclusive end date"),
     granularity: Literal["day", "week", "month"] = Query(default="day"),
@@ -47,16 +95,54 @@ def dashboard_trend(
         "distinct_sources",
         "distinct_categories",
     ] = Query(default="total_records"),
-    engine: Engine = Depends(get_engine),
+    source: str | None = Query(default=None),
+    category: str | None = Query(default=None, description="'' selects uncategorized rows"),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    with engine.begin() as conn:
-        points = fetch_trend(conn, start=start, end=end, granularity=granularity, metric=metric)
-
-    return TrendResponse(
-        granularity=granularity,
-        metric=metric,
-        start=start,
-        end=end,
-        points=[{"bucket_start": p["bucket_start"], "value": int(p["value"])} for p in points],
-        note="Trend is aggregated from summary.daily_metrics (Week 06).",
-    )
+    sliced = source is not None or category is not None
+    if sliced and metric != "total_records":
+        raise HTTPException(
+            status_code=400, detail="source/category filters only support metric=total_records"
+        )
+
+    async def compute() -> bytes:
+        conn = await db.connection()
+        if sliced:
+            points = await fetch_trend_rollup_async(
+                conn,
+                start=start,
+                end=end,
+                granularity=granularity,
+                source=source,
+                category=category,
+            )
+            note = "Trend is aggregated from summary.daily_rollup (clean records)."
+        else:
+            points = await fetch_trend_async(
+                conn, start=start, end=end, granularity=granularity, metric=metric
+            )
+            note = "Trend is aggregated from summary.daily_metrics (Week 06)."
+        return (
+            TrendResponse(
+                granularity=granularity,
+                metric=metric,
+                start=start,
+                end=end,
+                points=[
+                    {"bucket_start": p["bucket_start"], "value": int(p["value"])} for p in points
+                ],
+                note=note,
+            )
+            .model_dump_json()
+            .encode("utf-8")
+        )
+
+    params = {
+        "start": start,
+        "end": end,
+        "granularity": granularity,
+        "metric": metric,
+        "source": source,
+        "category": category,
+    }
+    return await _cached_json(request, db, "trend", params, compute)
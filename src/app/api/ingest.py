@@ -2,13 +2,18 @@
 
 from __future__ import annotations
 
+import uuid
 from pathlib import Path
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.db.session import get_async_db, get_db
 from app.ingestion.service import IngestionError, ingest_files
+from app.schemas.ingest import IngestRunStatus
+from app.services.ingest_runs import fetch_ingest_run, fetch_recent_ingest_runs
 
 router = APIRouter(prefix="/ingest", tags=["ingest"])
 
@@ -32,12 +37,14 @@ async def ingest_uploaded_files(
         for f in files:
             payloads.append((f.filename or "unknown", await f.read()))
 
-        result = ingest_files(db=db, source="upload", files=payloads)
+        # ingest is sync (Session); keep it off the event loop
+        result = await run_in_threadpool(ingest_files, db=db, source="upload", files=payloads)
         return {
             "run_id": str(result.run_id),
             "total_records": result.total_records,
             "inserted_records": result.inserted_records,
             "deduped_records": result.deduped_records,
+            "rejected_records": result.rejected_records,
             "per_file": result.per_file,
         }
     except IngestionError as e:
@@ -57,9 +64,27 @@ def ingest_samples(db: Session = Depends(get_db)):
             "total_records": result.total_records,
             "inserted_records": result.inserted_records,
             "deduped_records": result.deduped_records,
+            "rejected_records": result.rejected_records,
             "per_file": result.per_file,
         }
     except FileNotFoundError as e:
         raise HTTPException(status_code=500, detail=f"Missing sample file: {e}") from e
     except IngestionError as e:
         raise HTTPException(status_code=400, detail=str(e)) from e
+
+
+@router.get("/runs", response_model=list[IngestRunStatus])
+async def list_ingest_runs(
+    source: str | None = Query(default=None),
+    limit: int = Query(default=20, ge=1, le=500),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await fetch_recent_ingest_runs(await db.connection(), source=source, limit=limit)
+
+
+@router.get("/runs/{run_id}", response_model=IngestRunStatus)
+async def get_ingest_run(run_id: uuid.UUID, db: AsyncSession = Depends(get_async_db)):
+    row = await fetch_ingest_run(await db.connection(), run_id)
+    if row is None:
+        raise HTTPException(status_code=404, detail="Ingest run not found")
+    return row
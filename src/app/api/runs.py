@@ -0,0 +1,80 @@
+# ruff: noqa: B008
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.db.session import get_db
+from app.schemas.runs import RegressionResponse, RunRow, RunStatsRow, StepStatsRow
+from app.services.runs import (
+    detect_regressions,
+    fetch_recent_runs,
+    fetch_run_stats,
+    fetch_step_samples,
+    fetch_step_stats,
+)
+
+router = APIRouter(prefix="/runs", tags=["runs"])
+
+
+def _since(days: int) -> datetime:
+    return datetime.now(UTC) - timedelta(days=days)
+
+
+@router.get("", response_model=list[RunRow])
+def list_runs(
+    pipeline: str | None = Query(default=None),
+    status: str | None = Query(default=None),
+    limit: int = Query(default=50, ge=1, le=1000),
+    db: Session = Depends(get_db),
+):
+    return fetch_recent_runs(db.connection(), pipeline=pipeline, status=status, limit=limit)
+
+
+@router.get("/stats", response_model=list[RunStatsRow])
+def run_stats(
+    pipeline: str | None = Query(default=None),
+    days: int = Query(default=30, ge=1, le=365, description="Look-back window"),
+    bucket: Literal["hour", "day", "week"] = Query(default="day"),
+    db: Session = Depends(get_db),
+):
+    return fetch_run_stats(db.connection(), since=_since(days), bucket=bucket, pipeline=pipeline)
+
+
+@router.get("/steps/stats", response_model=list[StepStatsRow])
+def step_stats(
+    pipeline: str = Query(...),
+    step: str | None = Query(default=None),
+    days: int = Query(default=30, ge=1, le=365, description="Look-back window"),
+    bucket: Literal["hour", "day", "week"] = Query(default="day"),
+    db: Session = Depends(get_db),
+):
+    return fetch_step_stats(
+        db.connection(), pipeline=pipeline, since=_since(days), bucket=bucket, step=step
+    )
+
+
+@router.get("/regressions", response_model=RegressionResponse)
+def step_regressions(
+    pipeline: str = Query(...),
+    step: str | None = Query(default=None),
+    factor: float = Query(
+        default=1.5, gt=1.0, description="Flag when duration > factor x baseline"
+    ),
+    window: int = Query(default=20, ge=1, le=500, description="Runs in the rolling baseline"),
+    min_samples: int = Query(default=5, ge=1),
+    days: int = Query(default=30, ge=1, le=365, description="Look-back window"),
+    latest_only: bool = Query(default=True, description="Only check each step's latest run"),
+    db: Session = Depends(get_db),
+):
+    samples = fetch_step_samples(db.connection(), pipeline=pipeline, since=_since(days), step=step)
+    regressions = detect_regressions(
+        samples, factor=factor, window=window, min_samples=min_samples, latest_only=latest_only
+    )
+    return RegressionResponse(
+        pipeline=pipeline, factor=factor, window=window, regressions=regressions
+    )
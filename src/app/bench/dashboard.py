@@ -0,0 +1,121 @@
+"""Load benchmark: sync (threadpool) vs async dashboard trend endpoint.
+
+Drives both variants in-process through httpx's ASGI transport with the same
+concurrency, so the difference is the request path: the sync variant holds a
+threadpool thread (default 40) per in-flight query, the async one does not.
+
+Both variants run fetch_trend on every request. The async app's response cache is
+replaced by a no-op backend (every request misses), so the measured async path is
+data-version check + query + JSON encoding; `--cached` keeps the real cache to
+measure hits instead.
+
+    PYTHONPATH=src python -m app.bench.dashboard --requests 2000 --concurrency 200
+
+Needs a migrated database with summary.daily_metrics (make demo) and httpx (dev group).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import date
+
+import httpx
+from fastapi import FastAPI
+
+from app.api import dashboard as dashboard_api
+from app.db.session import engine
+from app.main import app as async_app
+from app.services.dashboard import fetch_trend
+
+TREND_PATH = "/dashboard/trend"
+
+
+class NoCache:
+    """Response cache backend that never stores anything."""
+
+    async def get(self, key: str) -> bytes | None:
+        return None
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        return None
+
+
+def build_sync_app() -> FastAPI:
+    """The pre-async trend route: `def` endpoint over the sync engine."""
+    sync_app = FastAPI()
+
+    @sync_app.get(TREND_PATH)
+    def trend(start: date, end: date, granularity: str = "day", metric: str = "total_records"):
+        with engine.connect() as conn:
+            points = fetch_trend(conn, start, end, granularity, metric)
+        return [{"bucket_start": p["bucket_start"], "value": int(p["value"])} for p in points]
+
+    return sync_app
+
+
+async def run_load(app, n_requests: int, concurrency: int, params: dict) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    sem = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def one() -> None:
+            nonlocal errors
+            async with sem:
+                t0 = time.perf_counter()
+                r = await client.get(TREND_PATH, params=params)
+                latencies.append(time.perf_counter() - t0)
+                if r.status_code != 200:
+                    errors += 1
+
+        # warm the pool before timing
+        await asyncio.gather(*(one() for _ in range(min(concurrency, n_requests))))
+        latencies.clear()
+        errors = 0
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(n_requests)))
+        elapsed = time.perf_counter() - t0
+
+    q = statistics.quantiles(latencies, n=100)
+    return {
+        "requests": n_requests,
+        "errors": errors,
+        "req_per_sec": round(n_requests / elapsed, 1),
+        "p50_ms": round(q[49] * 1000, 1),
+        "p95_ms": round(q[94] * 1000, 1),
+        "p99_ms": round(q[98] * 1000, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--start", default="2025-01-01")
+    parser.add_argument("--end", default="2026-01-01")
+    parser.add_argument("--granularity", default="week", choices=["day", "week", "month"])
+    parser.add_argument(
+        "--cached",
+        action="store_true",
+        help="keep the async app's response cache (measures cache hits, not queries)",
+    )
+    args = parser.parse_args()
+
+    if not args.cached:
+        no_cache = NoCache()
+        dashboard_api.get_response_cache = lambda: no_cache
+
+    params = {"start": args.start, "end": args.end, "granularity": args.granularity}
+    for name, app in (("sync", build_sync_app()), ("async", async_app)):
+        result = asyncio.run(run_load(app, args.requests, args.concurrency, params))
+        print(f"{name:5s} {result}")
+
+
+if __name__ == "__main__":
+    main()
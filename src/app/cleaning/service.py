@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import uuid
-from datetime import UTC, datetime
 
 from sqlalchemy import func
 from sqlalchemy.dialects.postgresql import insert as pg_insert
@@ -9,14 +8,16 @@ from sqlalchemy.orm import Session
 
 from app.cleaning.pipeline import CleaningConfig, clean_row
 from app.cleaning.rules import normalize_currency_to_decimal
+from app.db.data_version import bump_data_version
 from app.db.models import CleanRecord, RawRecord
+from app.ingestion.payload import full_payload
 from app.observability.logging import get_logger
 from app.observability.run_tracking import RunTracker
 
 
 def refresh_clean_records(db: Session, *, limit: int = 5000) -> int:
     logger = get_logger(__name__)
-    tracker = RunTracker(db, logger, pipeline="clean", input_ref=f"raw_records(limit={limit})")
+    tracker = RunTracker(logger, pipeline="clean", input_ref=f"raw_records(limit={limit})")
 
     cfg = CleaningConfig(
         allowed_keys={"source_id", "event_time", "value", "category"},
@@ -27,13 +28,29 @@ def refresh_clean_records(db: Session, *, limit: int = 5000) -> int:
 
     try:
         with tracker.step("fetch_raw_records", meta={"limit": limit}):
-            raws = db.query(RawRecord).order_by(RawRecord.ingested_at.desc()).limit(limit).all()
+            # id breaks ties within a run; matches ix_raw_records_ingested_at
+            raws = (
+                db.query(RawRecord)
+                .order_by(RawRecord.ingested_at.desc(), RawRecord.id)
+                .limit(limit)
+                .all()
+            )
 
         with tracker.step("upsert_clean_records", meta={"record_count": len(raws)}):
-            now = datetime.now(UTC)
+            # database transaction start, not the app clock: the daily_rollup watermark
+            # relies on cleaned_at >= the writing transaction's xact_start
+            now = func.now()
             rows = []
             for r in raws:
-                cleaned = clean_row(dict(r.payload), cfg)
+                # payload may hold only the extra columns (RAW_PAYLOAD_MODE=extras)
+                source_row = full_payload(
+                    r.payload,
+                    source_id=r.source_id,
+                    event_time=r.event_time,
+                    category=r.category,
+                    value=r.value,
+                )
+                cleaned = clean_row(source_row, cfg)
                 value_text = None if cleaned.get("value") is None else str(cleaned.get("value"))
                 value_decimal = normalize_currency_to_decimal(cleaned.get("value"))
 
@@ -59,12 +76,12 @@ def refresh_clean_records(db: Session, *, limit: int = 5000) -> int:
             if rows:
                 stmt = pg_insert(CleanRecord.__table__).values(rows)
                 stmt = stmt.on_conflict_do_update(
-                    index_elements=["source", "record_hash"],
+                    # event_time is the partition key (and part of the conflict key)
+                    index_elements=["source", "record_hash", "event_time"],
                     set_={
                         "raw_id": stmt.excluded.raw_id,
                         "run_id": stmt.excluded.run_id,
                         "source_id": stmt.excluded.source_id,
-                        "event_time": stmt.excluded.event_time,
                         "category": stmt.excluded.category,
                         "value_text": stmt.excluded.value_text,
                         "value_decimal": stmt.excluded.value_decimal,
@@ -73,6 +90,7 @@ def refresh_clean_records(db: Session, *, limit: int = 5000) -> int:
                     },
                 )
                 db.execute(stmt)
+                bump_data_version(db)
 
         db.commit()
         total_clean = db.query(func.count(CleanRecord.id)).scalar() or 0
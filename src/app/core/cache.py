@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Protocol
+from urllib.parse import urlencode
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend(Protocol):
+    async def get(self, key: str) -> bytes | None: ...
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+
+class TTLCache:
+    """In-process LRU with per-entry expiry (per worker process)."""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._data: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> bytes | None:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class RedisCache:
+    """Shared backend (CACHE_URL=redis://...); errors degrade to cache misses."""
+
+    def __init__(self, url: str):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:  # pragma: no cover - depends on the environment
+            raise RuntimeError(
+                "CACHE_URL is set but the 'redis' package (redis extra) is not installed"
+            ) from e
+        self._client = redis.from_url(url)
+
+    async def get(self, key: str) -> bytes | None:
+        try:
+            return await self._client.get(key)
+        except Exception:
+            logger.warning("cache_get_failed", exc_info=True)
+            return None
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        try:
+            await self._client.set(key, value, px=max(1, int(ttl * 1000)))
+        except Exception:
+            logger.warning("cache_set_failed", exc_info=True)
+
+
+def cache_key(endpoint: str, params: dict) -> str:
+    """Stable key: endpoint + sorted query params (None values dropped)."""
+    items = sorted((k, str(v)) for k, v in params.items() if v is not None)
+    return f"{endpoint}?{urlencode(items)}"
+
+
+def make_etag(key: str, version: int) -> str:
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    return f'"v{version}-{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # weak comparison; browsers may send W/"..." and lists
+    tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+    return etag in tags
+
+
+_cache: CacheBackend | None = None
+
+
+def get_response_cache() -> CacheBackend:
+    global _cache
+    if _cache is None:
+        from app.core.config import settings
+
+        _cache = (
+            RedisCache(settings.cache_url)
+            if settings.cache_url
+            else TTLCache(settings.cache_max_entries)
+        )
+    return _cache
@@ -1,8 +1,48 @@
+from typing import Literal
+
+from pydantic import AliasChoices, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
-    database_url: str
+    database_url: str = Field(validation_alias=AliasChoices("DATABASE_URL", "DB_URL"))
+
+    # connection pool of the process-wide engine (app.db.session.engine)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    # separate pool of the async engine (async routes); a process can hold up to
+    # db_pool_size + db_max_overflow + db_async_pool_size + db_async_max_overflow
+    db_async_pool_size: int = 5
+    db_async_max_overflow: int = 5
+    db_pool_timeout: float = 30.0  # seconds to wait for a free connection
+    db_pool_recycle: int = 1800  # seconds; replace connections older than this
+    db_pool_pre_ping: bool = True
+    db_statement_timeout_ms: int = 0  # 0 = no server-side statement timeout
+
+    # dashboard response cache (app.core.cache); keys embed the summary data version
+    cache_url: str | None = None  # redis://... for a shared backend; default in-process
+    cache_ttl_s: float = 300.0
+    cache_max_entries: int = 512
+    cache_version_check_s: float = 1.0  # how long a worker trusts its last version read
+    cache_max_age_s: int = 0  # browser Cache-Control max-age (0 = always revalidate)
+
+    # raw_records.payload: full source row, or only the columns not denormalized into
+    # typed columns (app/ingestion/payload.py)
+    raw_payload_mode: Literal["full", "extras"] = "full"
+
+    # ingest upserts: rows per committed batch, and whether concurrent ingests of the
+    # same source serialize per batch (advisory) or rely on sorted lock order (none)
+    # (a batch is written in INSERTs of at most 65535 // 11 rows: Postgres' bind cap)
+    ingest_batch_size: int = 5000
+    ingest_lock_mode: Literal["none", "advisory"] = "none"
+    # arrow: columnar CSV/Parquet ingest written with COPY (app/ingestion/arrow_engine.py)
+    ingest_engine: Literal["python", "arrow"] = "python"
+    # rows failing key extraction: fail the run, or quarantine them in ingest_rejects and
+    # fail once more than ingest_max_error_rate of the rows read were rejected (checked
+    # per batch from ingest_error_rate_min_rows rows on, and over the whole run at the end)
+    ingest_on_error: Literal["fail", "quarantine"] = "fail"
+    ingest_max_error_rate: float = 0.01
+    ingest_error_rate_min_rows: int = 10_000
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
@@ -0,0 +1,118 @@
+"""Batched, resumable row rewrites for data migrations.
+
+Rows are read in keyset order (`WHERE key > :after ORDER BY key LIMIT n`), new
+values are computed in Python, and each batch is written with a single
+`UPDATE ... FROM (VALUES ...)`. Memory stays bounded by the batch size.
+
+In an Alembic migration, run it inside `autocommit_block()` so every batch
+commits on its own. Then a crash loses at most one batch, and a re-run only
+touches rows that still match `pending`:
+
+    with op.get_context().autocommit_block():
+        batched_update(op.get_bind(), "raw_records", read=[...], columns={...},
+                       compute=..., pending="record_hash IS NULL")
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Mapping, Sequence
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.observability.logging import get_logger
+
+DEFAULT_BATCH_SIZE = 5000
+# Postgres caps bind parameters per statement at 65535
+MAX_PARAMS = 65_535
+
+
+def _update_sql(table: str, key: str, key_type: str, columns: Mapping[str, str], n: int):
+    names = [key, *columns]
+    rows = ", ".join(
+        "(" + ", ".join(f":p{i}_{j}" for j in range(len(names))) + ")" for i in range(n)
+    )
+    assignments = ", ".join(f"{c} = CAST(v.{c} AS {t})" for c, t in columns.items())
+    return text(
+        f"UPDATE {table} AS t SET {assignments} "
+        f"FROM (VALUES {rows}) AS v({', '.join(names)}) "
+        f"WHERE t.{key} = CAST(v.{key} AS {key_type})"
+    )
+
+
+def batched_update(
+    conn: Connection,
+    table: str,
+    *,
+    read: Sequence[str],
+    columns: Mapping[str, str],
+    compute: Callable[[Mapping[str, Any]], Mapping[str, Any] | None],
+    key: str = "id",
+    key_type: str = "uuid",
+    pending: str | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    commit: Callable[[], None] | None = None,
+) -> int:
+    """Rewrite `columns` of `table` batch by batch; returns the number of rows updated.
+
+    read: select-list expressions over `table` passed to `compute` (by name/alias).
+    columns: column -> SQL type of the values `compute` returns (None skips the row).
+    pending: SQL predicate for rows that still need work, so re-runs resume.
+    commit: called after each batch when not running in autocommit mode.
+    """
+    logger = get_logger(__name__)
+    batch_size = max(1, min(batch_size, MAX_PARAMS // (len(columns) + 1)))
+    pending_sql = f"({pending})" if pending else "TRUE"
+
+    def page(where: str):
+        return text(
+            f"SELECT {key}, {', '.join(read)} FROM {table} WHERE {where} "
+            f"ORDER BY {key} LIMIT :limit"
+        )
+
+    # separate first-page query: no OR on a null bound, so the key index is always usable
+    first_page = page(pending_sql)
+    next_page = page(f"{key} > CAST(:after AS {key_type}) AND {pending_sql}")
+
+    after = None
+    updated = batches = 0
+    started = time.perf_counter()
+    while True:
+        if after is None:
+            result = conn.execute(first_page, {"limit": batch_size})
+        else:
+            result = conn.execute(next_page, {"after": after, "limit": batch_size})
+        rows = result.mappings().all()
+        if not rows:
+            break
+        after = rows[-1][key]
+
+        changes = []
+        for row in rows:
+            values = compute(row)
+            if values is not None:
+                changes.append([row[key], *(values[c] for c in columns)])
+        if changes:
+            params = {
+                f"p{i}_{j}": v for i, change in enumerate(changes) for j, v in enumerate(change)
+            }
+            conn.execute(_update_sql(table, key, key_type, columns, len(changes)), params)
+            updated += len(changes)
+        if commit is not None:
+            commit()
+
+        batches += 1
+        elapsed = time.perf_counter() - started
+        logger.info(
+            "batched_update_progress",
+            extra={
+                "table": table,
+                "batch": batches,
+                "rows_updated": updated,
+                "last_key": str(after),
+                "rows_per_sec": round(updated / elapsed, 1) if elapsed else None,
+            },
+        )
+    return updated
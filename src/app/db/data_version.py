@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import time
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.orm import Session
+
+# data set behind the dashboard (summary.* tables/views and their clean/raw inputs)
+SUMMARY = "summary"
+
+_BUMP_SQL = text(
+    """
+    INSERT INTO summary.data_versions (name, version, updated_at)
+    VALUES (:name, 1, now())
+    ON CONFLICT (name) DO UPDATE
+      SET version = summary.data_versions.version + 1, updated_at = now()
+    RETURNING version
+    """
+)
+
+_READ_SQL = text("SELECT version FROM summary.data_versions WHERE name = :name")
+
+
+def bump_data_version(db: Session | Connection, name: str = SUMMARY) -> int:
+    """Increment the version inside the caller's transaction (visible on commit)."""
+    return int(db.execute(_BUMP_SQL, {"name": name}).scalar_one())
+
+
+async def fetch_data_version(conn: AsyncConnection | AsyncSession, name: str = SUMMARY) -> int:
+    return int((await conn.execute(_READ_SQL, {"name": name})).scalar() or 0)
+
+
+class DataVersionReader:
+    """Memoizes the current version for `max_age` seconds (0 = read on every call)."""
+
+    def __init__(self, name: str = SUMMARY, max_age: float = 1.0):
+        self.name = name
+        self.max_age = max_age
+        self._value: int | None = None
+        self._read_at = 0.0
+
+    async def get(self, conn: AsyncConnection | AsyncSession) -> int:
+        now = time.monotonic()
+        if self._value is None or now - self._read_at >= self.max_age:
+            self._value = await fetch_data_version(conn, self.name)
+            self._read_at = now
+        return self._value
@@ -0,0 +1,26 @@
+"""raw_records event_time index (incremental daily_metrics)
+
+Revision ID: 4a6b8c0d2e1f
+Revises: e3f7a9c2d4b6
+Create Date: 2026-03-07
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "4a6b8c0d2e1f"
+down_revision = "e3f7a9c2d4b6"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # per-day range reads when refreshing summary.daily_metrics for the days an
+    # ingest touched (existing event_time indexes lead with source)
+    op.create_index("ix_raw_records_event_time", "raw_records", ["event_time"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_raw_records_event_time", table_name="raw_records")
@@ -0,0 +1,43 @@
+"""pipeline_runs history indexes (run analytics)
+
+Revision ID: 5b8e2f4a9c17
+Revises: c7d9e1f2a3b4
+Create Date: 2026-02-14
+
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "5b8e2f4a9c17"
+down_revision = "c7d9e1f2a3b4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # (pipeline, started_at DESC) serves "latest runs of X" and time-bucketed stats;
+    # it also covers pipeline-only lookups, so the single-column index is redundant
+    op.create_index(
+        "ix_pipeline_runs_pipeline_started_at",
+        "pipeline_runs",
+        ["pipeline", sa.text("started_at DESC")],
+    )
+    op.drop_index("ix_pipeline_runs_pipeline", table_name="pipeline_runs")
+
+    # containment lookups on steps: steps @> '[{"step": "upsert"}]'
+    op.create_index(
+        "ix_pipeline_runs_steps_gin",
+        "pipeline_runs",
+        ["steps"],
+        postgresql_using="gin",
+        postgresql_ops={"steps": "jsonb_path_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_pipeline_runs_steps_gin", table_name="pipeline_runs")
+    op.create_index("ix_pipeline_runs_pipeline", "pipeline_runs", ["pipeline"])
+    op.drop_index("ix_pipeline_runs_pipeline_started_at", table_name="pipeline_runs")
@@ -0,0 +1,39 @@
+"""summary data_versions (dashboard cache invalidation)
+
+Revision ID: 9d4c3b2a1e07
+Revises: 5b8e2f4a9c17
+Create Date: 2026-02-21
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "9d4c3b2a1e07"
+down_revision = "5b8e2f4a9c17"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE SCHEMA IF NOT EXISTS summary;")
+    # one monotonically increasing counter per data set; bumped in the same
+    # transaction as the data change by successful ingest / clean / metrics runs
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS summary.data_versions (
+          name text PRIMARY KEY,
+          version bigint NOT NULL DEFAULT 0,
+          updated_at timestamptz NOT NULL DEFAULT now()
+        );
+        """
+    )
+    op.execute(
+        "INSERT INTO summary.data_versions (name, version) VALUES ('summary', 0) "
+        "ON CONFLICT (name) DO NOTHING;"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS summary.data_versions;")
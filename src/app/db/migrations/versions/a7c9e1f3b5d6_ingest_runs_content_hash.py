@@ -0,0 +1,29 @@
+"""ingest_runs.content_hash for skipping already-ingested files
+
+Revision ID: a7c9e1f3b5d6
+Revises: f6b8d0e2a4c5
+Create Date: 2026-04-14
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "a7c9e1f3b5d6"
+down_revision = "f6b8d0e2a4c5"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE public.ingest_runs ADD COLUMN IF NOT EXISTS content_hash varchar(64);")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_ingest_runs_source_content_hash "
+        "ON public.ingest_runs (source, content_hash);"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS public.ix_ingest_runs_source_content_hash;")
+    op.execute("ALTER TABLE public.ingest_runs DROP COLUMN IF EXISTS content_hash;")
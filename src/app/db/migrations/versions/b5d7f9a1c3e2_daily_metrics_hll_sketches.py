@@ -0,0 +1,31 @@
+"""daily_metrics HyperLogLog sketch columns
+
+Revision ID: b5d7f9a1c3e2
+Revises: 4a6b8c0d2e1f
+Create Date: 2026-03-14
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "b5d7f9a1c3e2"
+down_revision = "4a6b8c0d2e1f"
+branch_labels = None
+depends_on = None
+
+SKETCH_COLUMNS = ("hll_records", "hll_source_ids", "hll_sources", "hll_categories")
+
+
+def upgrade() -> None:
+    # nullable: existing days get sketches on their next refresh or via
+    # `python -m app.transform.daily_metrics` (backfill); readers fall back to exact
+    # counts for buckets containing days without a sketch
+    for col in SKETCH_COLUMNS:
+        op.execute(f"ALTER TABLE summary.daily_metrics ADD COLUMN IF NOT EXISTS {col} bytea;")
+
+
+def downgrade() -> None:
+    for col in SKETCH_COLUMNS:
+        op.execute(f"ALTER TABLE summary.daily_metrics DROP COLUMN IF EXISTS {col};")
@@ -0,0 +1,25 @@
+"""ingest_runs.checkpoints for resumable ingests
+
+Revision ID: b8d0f2a4c6e7
+Revises: a7c9e1f3b5d6
+Create Date: 2026-04-16
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "b8d0f2a4c6e7"
+down_revision = "a7c9e1f3b5d6"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # filename -> {"rows", "offset", "done"}, updated in the same transaction as each batch
+    op.execute("ALTER TABLE public.ingest_runs ADD COLUMN IF NOT EXISTS checkpoints jsonb;")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE public.ingest_runs DROP COLUMN IF EXISTS checkpoints;")
@@ -14,9 +14,10 @@ from collections.abc import Sequence
 from datetime import UTC, datetime
 from typing import Any
 
-import sqlalchemy as sa
 from alembic import op
 
+from app.db.batched import batched_update
+
 # revision identifiers, used by Alembic.
 revision: str = "c7b2d771f7a0"
 down_revision: str | Sequence[str] | None = "3d1e14bb5580"
@@ -58,66 +59,64 @@ def _compute_hash(source_id: str, event_dt: datetime, category: str, value: str)
     return hashlib.sha256(encoded).hexdigest()
 
 
+def _backfill_values(row: Any) -> dict[str, Any]:
+    payload = row["payload"]
+    if isinstance(payload, str):
+        payload_dict = json.loads(payload)
+    else:
+        payload_dict = dict(payload)
+
+    source_id = _norm_str(payload_dict.get("source_id"))
+    category = _norm_str(payload_dict.get("category")).lower()
+    value = _norm_str(payload_dict.get("value"))
+    event_dt = _parse_event_time(payload_dict.get("event_time"))
+    return {
+        "source": row["run_source"],
+        "record_hash": _compute_hash(source_id, event_dt, category, value),
+        "source_id": source_id,
+        "event_time": event_dt,
+        "category": category,
+        "value": value,
+    }
+
+
 def upgrade() -> None:
-    # 1) Add new columns (nullable first so we can backfill)
-    op.add_column("raw_records", sa.Column("source", sa.String(length=50), nullable=True))
-    op.add_column("raw_records", sa.Column("record_hash", sa.String(length=64), nullable=True))
-    op.add_column("raw_records", sa.Column("source_id", sa.String(length=100), nullable=True))
-    op.add_column("raw_records", sa.Column("event_time", sa.DateTime(timezone=True), nullable=True))
-    op.add_column("raw_records", sa.Column("category", sa.String(length=100), nullable=True))
-    op.add_column("raw_records", sa.Column("value", sa.Text(), nullable=True))
-
-    # 2) Backfill from existing rows (join ingest_runs for source)
-    bind = op.get_bind()
-
-    rows = bind.execute(
-        sa.text(
-            """
-            SELECT rr.id, rr.payload, ir.source
-            FROM raw_records rr
-            JOIN ingest_runs ir ON ir.id = rr.run_id
-            """
-        )
-    ).fetchall()
-
-    for row in rows:
-        raw_id = row[0]
-        payload = row[1]
-        source = row[2]
-
-        if isinstance(payload, str):
-            payload_dict = json.loads(payload)
-        else:
-            payload_dict = dict(payload)
-
-        source_id = _norm_str(payload_dict.get("source_id"))
-        category = _norm_str(payload_dict.get("category")).lower()
-        value = _norm_str(payload_dict.get("value"))
-        event_dt = _parse_event_time(payload_dict.get("event_time"))
-        record_hash = _compute_hash(source_id, event_dt, category, value)
-
-        bind.execute(
-            sa.text(
-                """
-                UPDATE raw_records
-                SET source = :source,
-                    record_hash = :record_hash,
-                    source_id = :source_id,
-                    event_time = :event_time,
-                    category = :category,
-                    value = :value
-                WHERE id = :id
-                """
-            ),
-            {
-                "id": raw_id,
-                "source": source,
-                "record_hash": record_hash,
-                "source_id": source_id,
-                "event_time": event_dt,
-                "category": category,
-                "value": value,
+    # 1) Add new columns (nullable first so we can backfill). IF NOT EXISTS: the
+    #    backfill commits per batch, so an interrupted upgrade is re-run from here.
+    op.execute(
+        """
+        ALTER TABLE raw_records
+          ADD COLUMN IF NOT EXISTS source varchar(50),
+          ADD COLUMN IF NOT EXISTS record_hash varchar(64),
+          ADD COLUMN IF NOT EXISTS source_id varchar(100),
+          ADD COLUMN IF NOT EXISTS event_time timestamptz,
+          ADD COLUMN IF NOT EXISTS category varchar(100),
+          ADD COLUMN IF NOT EXISTS value text
+        """
+    )
+
+    # 2) Backfill from existing rows (source from ingest_runs): keyset batches, one
+    #    UPDATE ... FROM (VALUES ...) and one commit per batch; resumes at the rows
+    #    that still have no record_hash.
+    with op.get_context().autocommit_block():
+        batched_update(
+            op.get_bind(),
+            "raw_records",
+            read=[
+                "payload",
+                "(SELECT ir.source FROM ingest_runs ir WHERE ir.id = raw_records.run_id)"
+                " AS run_source",
+            ],
+            columns={
+                "source": "varchar(50)",
+                "record_hash": "varchar(64)",
+                "source_id": "varchar(100)",
+                "event_time": "timestamptz",
+                "category": "varchar(100)",
+                "value": "text",
             },
+            compute=_backfill_values,
+            pending="record_hash IS NULL",
         )
 
     # 3) Enforce NOT NULL (safe after backfill)
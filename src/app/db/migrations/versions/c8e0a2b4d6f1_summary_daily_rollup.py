@@ -0,0 +1,69 @@
+"""summary.daily_rollup (day x source x category cube)
+
+Revision ID: c8e0a2b4d6f1
+Revises: b5d7f9a1c3e2
+Create Date: 2026-03-21
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "c8e0a2b4d6f1"
+down_revision = "b5d7f9a1c3e2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE SCHEMA IF NOT EXISTS summary;")
+    # category '' stands for NULL (primary key columns can't be null)
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS summary.daily_rollup (
+          day_date date NOT NULL,
+          source text NOT NULL,
+          category text NOT NULL,
+          record_count bigint NOT NULL,
+          value_count bigint NOT NULL,
+          value_sum numeric(24, 4) NOT NULL,
+          PRIMARY KEY (day_date, source, category)
+        );
+        """
+    )
+    # covering indexes: filtered dashboard queries are index-only scans
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_daily_rollup_source_day
+        ON summary.daily_rollup (source, day_date)
+        INCLUDE (category, record_count, value_count, value_sum);
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_daily_rollup_category_day
+        ON summary.daily_rollup (category, day_date)
+        INCLUDE (source, record_count, value_count, value_sum);
+        """
+    )
+
+    # incremental maintenance state (one row per derived table)
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS summary.rollup_watermarks (
+          name text PRIMARY KEY,
+          watermark timestamptz NULL,
+          updated_at timestamptz NOT NULL DEFAULT now()
+        );
+        """
+    )
+
+    # finds silver rows changed since the last rollup refresh
+    op.create_index("ix_clean_records_cleaned_at", "clean_records", ["cleaned_at"], schema="clean")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_clean_records_cleaned_at", table_name="clean_records", schema="clean")
+    op.execute("DROP TABLE IF EXISTS summary.rollup_watermarks;")
+    op.execute("DROP TABLE IF EXISTS summary.daily_rollup;")
@@ -0,0 +1,42 @@
+"""ingest_rejects quarantine table
+
+Revision ID: c9e1a3b5d7f8
+Revises: b8d0f2a4c6e7
+Create Date: 2026-04-18
+
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision = "c9e1a3b5d7f8"
+down_revision = "b8d0f2a4c6e7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ingest_rejects",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "run_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("ingest_runs.id"),
+            nullable=False,
+        ),
+        sa.Column("filename", sa.Text(), nullable=False),
+        sa.Column("row_num", sa.Integer(), nullable=False),
+        sa.Column("payload", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("error", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_ingest_rejects_run_id", "ingest_rejects", ["run_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_ingest_rejects_run_id", table_name="ingest_rejects")
+    op.drop_table("ingest_rejects")
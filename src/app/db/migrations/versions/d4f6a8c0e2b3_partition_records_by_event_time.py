@@ -0,0 +1,160 @@
+"""monthly range partitions on event_time for raw_records and clean.clean_records
+
+Revision ID: d4f6a8c0e2b3
+Revises: c8e0a2b4d6f1
+Create Date: 2026-03-28
+
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, date, datetime
+
+from alembic import op
+
+revision = "d4f6a8c0e2b3"
+down_revision = "c8e0a2b4d6f1"
+branch_labels = None
+depends_on = None
+
+# Partitioned tables need the partition key in every unique constraint. record_hash
+# already hashes event_time, so (source, record_hash, event_time) dedupes exactly like
+# (source, record_hash) did.
+TABLES: dict[str, dict] = {
+    "public.raw_records": {
+        "pkey": "raw_records_pkey",
+        "unique": "uq_raw_records_source_record_hash",
+        "indexes": {
+            "ix_raw_records_run_id": "run_id",
+            "ix_raw_records_record_hash": "record_hash",
+            "ix_raw_records_source": "source",
+            "ix_raw_records_source_event_time": "source, event_time",
+            "ix_raw_records_source_source_id": "source, source_id",
+            "ix_raw_records_category": "category",
+            "ix_raw_records_event_time": "event_time",
+        },
+        "foreign_keys": {"raw_records_run_id_fkey": ("run_id", "public.ingest_runs (id)")},
+    },
+    "clean.clean_records": {
+        "pkey": "clean_records_pkey",
+        "unique": "uq_clean_records_source_record_hash",
+        "indexes": {
+            "ix_clean_records_source_event_time": "source, event_time",
+            "ix_clean_records_category": "category",
+            "ix_clean_records_cleaned_at": "cleaned_at",
+        },
+        "foreign_keys": {},
+    },
+}
+
+# keep in sync with src/app/db/partitions.py (DEFAULT_MONTHS_AHEAD)
+MONTHS_AHEAD = 3
+# monthly partitions reach back at most this far: older rows (or a bogus timestamp
+# like 0001-01-01) go to the default partition instead of creating one table per month
+MAX_HISTORY_MONTHS = 120
+
+# summary.monthly_metrics reads clean.clean_records and blocks the table swap
+MONTHLY_METRICS_SELECT = """
+SELECT
+  date_trunc('month', event_time)::date AS month_start,
+  COUNT(*) AS total_records,
+  COUNT(DISTINCT record_hash) AS distinct_records,
+  COUNT(DISTINCT source_id) AS distinct_source_ids,
+  COUNT(DISTINCT source) AS distinct_sources,
+  COUNT(DISTINCT category) AS distinct_categories
+FROM clean.clean_records
+WHERE event_time IS NOT NULL
+GROUP BY 1
+"""
+
+
+def _add_months(d: date, months: int) -> date:
+    y, m = divmod(d.year * 12 + d.month - 1 + months, 12)
+    return date(y, m + 1, 1)
+
+
+def _drop_monthly_metrics() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS summary.monthly_metrics;")
+
+
+def _create_monthly_metrics() -> None:
+    op.execute(f"CREATE MATERIALIZED VIEW summary.monthly_metrics AS {MONTHLY_METRICS_SELECT}")
+    op.execute(
+        "CREATE UNIQUE INDEX ux_monthly_metrics_month_start "
+        "ON summary.monthly_metrics (month_start);"
+    )
+
+
+def _swap_in(table: str, staging: str) -> None:
+    """Copy `table` into `staging`, drop `table` and give `staging` its name."""
+    op.execute(f"INSERT INTO {staging} SELECT * FROM {table};")
+    op.execute(f"DROP TABLE {table};")
+    op.execute(f"ALTER TABLE {staging} RENAME TO {table.split('.')[1]};")
+
+
+def _add_keys(table: str, spec: dict, key: str) -> None:
+    op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {spec['pkey']} PRIMARY KEY (id{key});")
+    op.execute(
+        f"ALTER TABLE {table} ADD CONSTRAINT {spec['unique']} UNIQUE (source, record_hash{key});"
+    )
+    for name, (column, target) in spec["foreign_keys"].items():
+        op.execute(
+            f"ALTER TABLE {table} ADD CONSTRAINT {name} FOREIGN KEY ({column}) REFERENCES {target};"
+        )
+    for name, columns in spec["indexes"].items():
+        op.execute(f"CREATE INDEX {name} ON {table} ({columns});")
+
+
+def _partition(table: str, spec: dict) -> None:
+    staging = f"{table}_partitioned"
+    op.execute(
+        f"CREATE TABLE {staging} (LIKE {table} INCLUDING DEFAULTS) PARTITION BY RANGE (event_time);"
+    )
+
+    # one partition per month from the oldest row (MAX_HISTORY_MONTHS back at most) up
+    # to MONTHS_AHEAD months from now; anything outside lands in the default partition
+    this_month = datetime.now(UTC).date().replace(day=1)
+    floor = _add_months(this_month, -MAX_HISTORY_MONTHS)
+    oldest = (
+        op.get_bind()
+        .exec_driver_sql(
+            f"SELECT min(event_time) FROM {table} WHERE event_time >= '{floor} 00:00:00+00'"
+        )
+        .scalar()
+    )
+    month = this_month if oldest is None else min(oldest.date().replace(day=1), this_month)
+    last = _add_months(this_month, MONTHS_AHEAD)
+    while month <= last:
+        nxt = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE {table}_p{month:%Y_%m} PARTITION OF {staging} "
+            f"FOR VALUES FROM ('{month} 00:00:00+00') TO ('{nxt} 00:00:00+00');"
+        )
+        month = nxt
+    op.execute(f"CREATE TABLE {table}_default PARTITION OF {staging} DEFAULT;")
+
+    _swap_in(table, staging)
+    # constraints/indexes on the parent cascade to every partition (built after the load)
+    _add_keys(table, spec, key=", event_time")
+
+
+def _unpartition(table: str, spec: dict) -> None:
+    staging = f"{table}_plain"
+    op.execute(f"CREATE TABLE {staging} (LIKE {table} INCLUDING DEFAULTS);")
+    # dropping the parent drops its partitions
+    _swap_in(table, staging)
+    _add_keys(table, spec, key="")
+
+
+def upgrade() -> None:
+    _drop_monthly_metrics()
+    for table, spec in TABLES.items():
+        _partition(table, spec)
+    _create_monthly_metrics()
+
+
+def downgrade() -> None:
+    _drop_monthly_metrics()
+    for table, spec in TABLES.items():
+        _unpartition(table, spec)
+    _create_monthly_metrics()
@@ -0,0 +1,71 @@
+"""monthly_metrics as a materialized view
+
+Revision ID: e3f7a9c2d4b6
+Revises: 9d4c3b2a1e07
+Create Date: 2026-02-28
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "e3f7a9c2d4b6"
+down_revision = "9d4c3b2a1e07"
+branch_labels = None
+depends_on = None
+
+# keep in sync with src/app/transform/monthly_metrics.sql
+MONTHLY_METRICS_SELECT = """
+SELECT
+  date_trunc('month', event_time)::date AS month_start,
+  COUNT(*) AS total_records,
+  COUNT(DISTINCT record_hash) AS distinct_records,
+  COUNT(DISTINCT source_id) AS distinct_source_ids,
+  COUNT(DISTINCT source) AS distinct_sources,
+  COUNT(DISTINCT category) AS distinct_categories
+FROM clean.clean_records
+WHERE event_time IS NOT NULL
+GROUP BY 1
+"""
+
+
+def _drop_monthly_metrics() -> None:
+    # the object may be a table (week 06 migration), a view (transform) or a matview
+    op.execute(
+        """
+        DO $$
+        DECLARE
+          kind char;
+        BEGIN
+          SELECT c.relkind INTO kind
+          FROM pg_class c
+          JOIN pg_namespace n ON n.oid = c.relnamespace
+          WHERE n.nspname = 'summary' AND c.relname = 'monthly_metrics';
+
+          IF kind = 'r' THEN
+            EXECUTE 'DROP TABLE summary.monthly_metrics';
+          ELSIF kind = 'v' THEN
+            EXECUTE 'DROP VIEW summary.monthly_metrics';
+          ELSIF kind = 'm' THEN
+            EXECUTE 'DROP MATERIALIZED VIEW summary.monthly_metrics';
+          END IF;
+        END $$;
+        """
+    )
+
+
+def upgrade() -> None:
+    op.execute("CREATE SCHEMA IF NOT EXISTS summary;")
+    _drop_monthly_metrics()
+    op.execute(f"CREATE MATERIALIZED VIEW summary.monthly_metrics AS {MONTHLY_METRICS_SELECT}")
+    # required by REFRESH MATERIALIZED VIEW CONCURRENTLY; also serves month_start filters
+    op.execute(
+        "CREATE UNIQUE INDEX ux_monthly_metrics_month_start "
+        "ON summary.monthly_metrics (month_start);"
+    )
+
+
+def downgrade() -> None:
+    _drop_monthly_metrics()
+    op.execute(f"CREATE VIEW summary.monthly_metrics AS {MONTHLY_METRICS_SELECT}")
@@ -0,0 +1,84 @@
+"""index audit: drop redundant record indexes, add ingested_at and covering indexes
+
+Revision ID: e5a7c9d1f3b4
+Revises: d4f6a8c0e2b3
+Create Date: 2026-04-04
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "e5a7c9d1f3b4"
+down_revision = "d4f6a8c0e2b3"
+branch_labels = None
+depends_on = None
+
+# Both record tables are partitioned, so indexes are built per partition inside the
+# migration transaction (CREATE INDEX CONCURRENTLY is not supported on a partitioned
+# parent). Writes to the table wait until it commits.
+
+# Redundant with a wider index that has them as prefix:
+# - raw record_hash: never filtered alone; (source, record_hash) lookups use the unique key
+# - raw/clean source: prefix of (source, event_time) and of the unique key
+# The clean ones only exist on databases built from the models (index=True), not by
+# migrations, hence IF EXISTS.
+REDUNDANT = {
+    "public.ix_raw_records_record_hash": "public.raw_records (record_hash)",
+    "public.ix_raw_records_source": "public.raw_records (source)",
+    "clean.ix_clean_records_source": None,
+    "clean.ix_clean_records_record_hash": None,
+}
+
+# name -> (table, plain definition, covering definition)
+COVERING = {
+    # daily_metrics refresh and the exact distinct-trend fallback read these per day
+    "public.ix_raw_records_event_time": (
+        "public.raw_records",
+        "(event_time)",
+        "(event_time) INCLUDE (source, record_hash, source_id, category)",
+    ),
+    # daily_rollup re-aggregation of (day, source) pairs
+    "clean.ix_clean_records_source_event_time": (
+        "clean.clean_records",
+        "(source, event_time)",
+        "(source, event_time) INCLUDE (category, value_decimal)",
+    ),
+    # daily_rollup changed-pair scan since the watermark
+    "clean.ix_clean_records_cleaned_at": (
+        "clean.clean_records",
+        "(cleaned_at)",
+        "(cleaned_at) INCLUDE (source, event_time)",
+    ),
+}
+
+
+def _bare(name: str) -> str:
+    return name.split(".")[1]
+
+
+def _recreate(which: int) -> None:
+    for name, spec in COVERING.items():
+        op.execute(f"DROP INDEX IF EXISTS {name};")
+        op.execute(f"CREATE INDEX {_bare(name)} ON {spec[0]} {spec[which]};")
+
+
+def upgrade() -> None:
+    for name in REDUNDANT:
+        op.execute(f"DROP INDEX IF EXISTS {name};")
+
+    # ORDER BY ingested_at DESC, id LIMIT n (clean fetch, flags): a merge of per-partition
+    # index scans instead of a full sort
+    op.execute(
+        "CREATE INDEX ix_raw_records_ingested_at ON public.raw_records (ingested_at DESC, id);"
+    )
+    _recreate(2)
+
+
+def downgrade() -> None:
+    _recreate(1)
+    op.execute("DROP INDEX IF EXISTS public.ix_raw_records_ingested_at;")
+    for name, definition in REDUNDANT.items():
+        if definition is not None:
+            op.execute(f"CREATE INDEX {_bare(name)} ON {definition};")
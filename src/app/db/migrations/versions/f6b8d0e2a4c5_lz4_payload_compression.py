@@ -0,0 +1,34 @@
+"""lz4 TOAST compression for raw/clean payload columns
+
+Revision ID: f6b8d0e2a4c5
+Revises: e5a7c9d1f3b4
+Create Date: 2026-04-11
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "f6b8d0e2a4c5"
+down_revision = "e5a7c9d1f3b4"
+branch_labels = None
+depends_on = None
+
+# (table, jsonb column); ALTER on the partitioned parent recurses to its partitions and
+# new partitions inherit the setting. Only values written from now on use lz4: existing
+# rows keep pglz until they are rewritten (e.g. VACUUM FULL on a detached partition).
+COLUMNS = (
+    ("public.raw_records", "payload"),
+    ("clean.clean_records", "payload_clean"),
+)
+
+
+def upgrade() -> None:
+    for table, column in COLUMNS:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET COMPRESSION lz4;")
+
+
+def downgrade() -> None:
+    for table, column in COLUMNS:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET COMPRESSION default;")
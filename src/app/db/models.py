@@ -21,6 +21,10 @@ class Base(DeclarativeBase):
 
 class IngestRun(Base):
     __tablename__ = "ingest_runs"
+    __table_args__ = (
+        # CLI ingests skip files whose content was already loaded for the source
+        Index("ix_ingest_runs_source_content_hash", "source", "content_hash"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
@@ -29,6 +33,10 @@ class IngestRun(Base):
     status: Mapped[str] = mapped_column(String(20), default="started")
     files: Mapped[str] = mapped_column(Text)  # newline-separated filenames for now
     error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # sha256 of the input file as stored (CLI ingests, one file per run)
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    # filename -> {"rows", "offset", "done"}: progress committed with each batch
+    checkpoints: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
 
     records: Mapped[list[RawRecord]] = relationship(back_populates="run")
 
@@ -37,11 +45,24 @@ class RawRecord(Base):
     __tablename__ = "raw_records"
 
     # Dedupe rule: a raw record is uniquely identified per source by its stable record_hash.
+    # Monthly range partitions on event_time (app/db/partitions.py): unique keys must
+    # include it, which changes nothing since record_hash already hashes event_time.
     __table_args__ = (
-        UniqueConstraint("source", "record_hash", name="uq_raw_records_source_record_hash"),
+        UniqueConstraint(
+            "source", "record_hash", "event_time", name="uq_raw_records_source_record_hash"
+        ),
         Index("ix_raw_records_source_event_time", "source", "event_time"),
         Index("ix_raw_records_source_source_id", "source", "source_id"),
         Index("ix_raw_records_category", "category"),
+        # covering: per-day reads for daily_metrics are index-only
+        Index(
+            "ix_raw_records_event_time",
+            "event_time",
+            postgresql_include=["source", "record_hash", "source_id", "category"],
+        ),
+        # newest-first fetches (cleaning, flags): ORDER BY ingested_at DESC, id LIMIT n
+        Index("ix_raw_records_ingested_at", sa.text("ingested_at DESC"), "id"),
+        {"postgresql_partition_by": "RANGE (event_time)"},
     )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -52,10 +73,10 @@ class RawRecord(Base):
     )
 
     # Denormalized keys for idempotency + query performance.
-    source: Mapped[str] = mapped_column(String(50), index=True)
-    record_hash: Mapped[str] = mapped_column(String(64), index=True)
+    source: Mapped[str] = mapped_column(String(50))
+    record_hash: Mapped[str] = mapped_column(String(64))
     source_id: Mapped[str] = mapped_column(String(100))
-    event_time: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    event_time: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
     category: Mapped[str] = mapped_column(String(100))
     value: Mapped[str] = mapped_column(Text)
 
@@ -66,12 +87,41 @@ class RawRecord(Base):
     run: Mapped[IngestRun] = relationship(back_populates="records")
 
 
+class IngestReject(Base):
+    """Rows quarantined by INGEST_ON_ERROR=quarantine: the raw row and why it failed."""
+
+    __tablename__ = "ingest_rejects"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    run_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("ingest_runs.id"),
+        index=True,
+    )
+    filename: Mapped[str] = mapped_column(Text)
+    row_num: Mapped[int] = mapped_column(Integer)
+    payload: Mapped[dict] = mapped_column(JSONB)
+    error: Mapped[str] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
+
+
 class PipelineRun(Base):
     __tablename__ = "pipeline_runs"
+    __table_args__ = (
+        # run history per pipeline, newest first (/runs, /runs/stats)
+        Index("ix_pipeline_runs_pipeline_started_at", "pipeline", sa.text("started_at DESC")),
+        # step lookups: steps @> '[{"step": "..."}]'
+        Index(
+            "ix_pipeline_runs_steps_gin",
+            "steps",
+            postgresql_using="gin",
+            postgresql_ops={"steps": "jsonb_path_ops"},
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
-    pipeline: Mapped[str] = mapped_column(String(50), index=True)
+    pipeline: Mapped[str] = mapped_column(String(50))
     status: Mapped[str] = mapped_column(String(20), default="running", index=True)
 
     started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
@@ -93,10 +143,22 @@ class PipelineRun(Base):
 class CleanRecord(Base):
     __tablename__ = "clean_records"
     __table_args__ = (
-        UniqueConstraint("source", "record_hash", name="uq_clean_records_source_record_hash"),
-        Index("ix_clean_records_source_event_time", "source", "event_time"),
+        # partitioned like raw_records (see RawRecord)
+        UniqueConstraint(
+            "source", "record_hash", "event_time", name="uq_clean_records_source_record_hash"
+        ),
+        # covering: daily_rollup reads are index-only
+        Index(
+            "ix_clean_records_source_event_time",
+            "source",
+            "event_time",
+            postgresql_include=["category", "value_decimal"],
+        ),
         Index("ix_clean_records_category", "category"),
-        {"schema": "clean"},
+        Index(
+            "ix_clean_records_cleaned_at", "cleaned_at", postgresql_include=["source", "event_time"]
+        ),
+        {"schema": "clean", "postgresql_partition_by": "RANGE (event_time)"},
     )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -104,11 +166,11 @@ class CleanRecord(Base):
     raw_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
     run_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
 
-    source: Mapped[str] = mapped_column(String(50), index=True)
-    record_hash: Mapped[str] = mapped_column(String(64), index=True)
+    source: Mapped[str] = mapped_column(String(50))
+    record_hash: Mapped[str] = mapped_column(String(64))
 
     source_id: Mapped[str] = mapped_column(String(100))
-    event_time: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    event_time: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
 
     category: Mapped[str | None] = mapped_column(String(100), nullable=True)
 
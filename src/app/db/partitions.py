@@ -0,0 +1,134 @@
+"""Monthly range partitions of raw_records / clean.clean_records on event_time.
+
+Partitions are named `<table>_pYYYY_MM` and cover [month start, next month start) in
+UTC. Rows outside every monthly partition land in `<table>_default`; creating a month
+that already has rows there moves them into the new partition first.
+
+    PYTHONPATH=src python -m app.db.partitions --months-ahead 3
+"""
+
+from __future__ import annotations
+
+import argparse
+from datetime import UTC, date, datetime
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.observability.logging import get_logger
+from app.observability.run_tracking import RunTracker
+
+PARTITIONED_TABLES = ("public.raw_records", "clean.clean_records")
+PARTITION_KEY = "event_time"
+DEFAULT_MONTHS_AHEAD = 3
+
+
+def month_start(d: date) -> date:
+    return d.replace(day=1)
+
+
+def add_months(d: date, months: int) -> date:
+    y, m = divmod(d.year * 12 + d.month - 1 + months, 12)
+    return date(y, m + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y_%m}"
+
+
+def default_partition_name(table: str) -> str:
+    return f"{table}_default"
+
+
+def _bound(month: date) -> str:
+    return f"{month.isoformat()} 00:00:00+00"
+
+
+def _exists(db: Session, qualified: str) -> bool:
+    return db.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": qualified}).scalar()
+
+
+def create_month_partition(db: Session, table: str, month: date) -> bool:
+    """Create the partition for `month` unless it exists; True when created."""
+    name = partition_name(table, month)
+    if _exists(db, name):
+        return False
+
+    lo, hi = _bound(month), _bound(add_months(month, 1))
+    default = default_partition_name(table)
+    in_default = (
+        _exists(db, default)
+        and db.execute(
+            text(
+                f"SELECT EXISTS (SELECT 1 FROM {default} "
+                f"WHERE {PARTITION_KEY} >= :lo AND {PARTITION_KEY} < :hi)"
+            ),
+            {"lo": lo, "hi": hi},
+        ).scalar()
+    )
+
+    if not in_default:
+        db.execute(
+            text(f"CREATE TABLE {name} PARTITION OF {table} FOR VALUES FROM ('{lo}') TO ('{hi}')")
+        )
+        return True
+
+    # Postgres refuses a new partition whose range has rows in the default one:
+    # move them into a standalone table, then attach it (indexes are built on attach).
+    db.execute(text(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING COMPRESSION)"))
+    db.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {default} "
+            f"WHERE {PARTITION_KEY} >= :lo AND {PARTITION_KEY} < :hi RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        ),
+        {"lo": lo, "hi": hi},
+    )
+    db.execute(
+        text(f"ALTER TABLE {table} ATTACH PARTITION {name} FOR VALUES FROM ('{lo}') TO ('{hi}')")
+    )
+    return True
+
+
+def ensure_partitions(db: Session, table: str, first: date, last: date) -> list[str]:
+    """Create monthly partitions for every month in [first, last]; returns the new names."""
+    created = []
+    month = month_start(first)
+    while month <= last:
+        if create_month_partition(db, table, month):
+            created.append(partition_name(table, month))
+        month = add_months(month, 1)
+    return created
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Create monthly partitions ahead of time.")
+    p.add_argument("--months-ahead", type=int, default=DEFAULT_MONTHS_AHEAD)
+    args = p.parse_args()
+
+    from app.db.session import SessionLocal
+
+    logger = get_logger(__name__)
+    this_month = month_start(datetime.now(UTC).date())
+    last = add_months(this_month, args.months_ahead)
+    with SessionLocal() as db:
+        tracker = RunTracker(
+            logger, pipeline="partitions", input_ref=f"months_ahead={args.months_ahead}"
+        )
+        try:
+            created = 0
+            for table in PARTITIONED_TABLES:
+                with tracker.step("ensure_partitions", meta={"table": table}) as step:
+                    names = ensure_partitions(db, table, this_month, last)
+                    db.commit()
+                    step.meta["created"] = names
+                    created += len(names)
+            tracker.succeed(records_out=created)
+        except Exception as e:
+            db.rollback()
+            tracker.fail(e)
+            raise
+
+
+if __name__ == "__main__":
+    main()
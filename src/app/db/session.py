@@ -1,14 +1,66 @@
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import Session, sessionmaker
 
-from app.core.config import settings
+from app.core.config import Settings, settings
+from app.observability.metrics import REGISTRY
 
-engine = create_engine(settings.database_url, pool_pre_ping=True)
+
+def _engine_kwargs(cfg: Settings, pool_size: int, max_overflow: int) -> dict:
+    connect_args = {}
+    if cfg.db_statement_timeout_ms > 0:
+        connect_args["options"] = f"-c statement_timeout={cfg.db_statement_timeout_ms}"
+    return {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": cfg.db_pool_timeout,
+        "pool_recycle": cfg.db_pool_recycle,
+        "pool_pre_ping": cfg.db_pool_pre_ping,
+        "connect_args": connect_args,
+    }
+
+
+def build_engine(cfg: Settings) -> Engine:
+    """The one engine (and pool) a process should use; tuned via DB_* settings."""
+    return create_engine(
+        cfg.database_url, **_engine_kwargs(cfg, cfg.db_pool_size, cfg.db_max_overflow)
+    )
+
+
+def build_async_engine(cfg: Settings) -> AsyncEngine:
+    """Async counterpart for async API routes (psycopg3 async driver).
+
+    Its pool is sized by DB_ASYNC_POOL_SIZE / DB_ASYNC_MAX_OVERFLOW; the other DB_*
+    settings are shared with the sync engine.
+    """
+    kwargs = _engine_kwargs(cfg, cfg.db_async_pool_size, cfg.db_async_max_overflow)
+    return create_async_engine(cfg.database_url, **kwargs)
+
+
+def max_connections(cfg: Settings = settings) -> int:
+    """Most connections one process can open: both pools full, overflow included."""
+    return (
+        cfg.db_pool_size + cfg.db_max_overflow + cfg.db_async_pool_size + cfg.db_async_max_overflow
+    )
+
+
+engine = build_engine(settings)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# separate pool: async routes never borrow connections from the sync pool (CLIs, sync routes)
+async_engine = build_async_engine(settings)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 
 def get_db() -> Generator[Session, None, None]:
     db = SessionLocal()
@@ -16,3 +68,47 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def pool_stats(e: Engine = engine, max_overflow: int = settings.db_max_overflow) -> dict:
+    pool = e.pool
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        # negative while the pool has not yet opened pool_size connections
+        "overflow": pool.overflow(),
+        "max_overflow": max_overflow,
+        "timeout_s": settings.db_pool_timeout,
+        "recycle_s": settings.db_pool_recycle,
+    }
+
+
+def async_pool_stats() -> dict:
+    return pool_stats(async_engine.sync_engine, settings.db_async_max_overflow)
+
+
+def _pool_metrics() -> list[str]:
+    pools = {"sync": pool_stats(), "async": async_pool_stats()}
+    lines = [
+        "# HELP d2d_db_pool_connections Connections of the shared engine pools by state.",
+        "# TYPE d2d_db_pool_connections gauge",
+    ]
+    for name, stats in pools.items():
+        for state in ("checked_in", "checked_out"):
+            lines.append(f'd2d_db_pool_connections{{pool="{name}",state="{state}"}} {stats[state]}')
+    lines += [
+        "# HELP d2d_db_pool_size Configured pool size of the shared engines.",
+        "# TYPE d2d_db_pool_size gauge",
+    ]
+    for name, stats in pools.items():
+        lines.append(f'd2d_db_pool_size{{pool="{name}"}} {stats["size"]}')
+    return lines
+
+
+REGISTRY.register_collector(_pool_metrics)
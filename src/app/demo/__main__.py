@@ -75,7 +75,7 @@ def format_demo_summary(
 def main() -> int:
     logger = get_logger(__name__)
     db = SessionLocal()
-    tracker = RunTracker(db, logger, pipeline="demo", input_ref="make demo")
+    tracker = RunTracker(logger, pipeline="demo", input_ref="make demo")
 
     exit_code = 0
 
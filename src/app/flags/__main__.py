@@ -4,14 +4,14 @@ import os
 from datetime import UTC, datetime
 from pathlib import Path
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 
-from app.db.session import SessionLocal
+from app.db.session import engine
 from app.observability.logging import get_logger
 from app.observability.run_tracking import RunTracker
 
 from .engine import flag_records
-from .report_csv import write_flag_report_csv
+from .report import normalize_format, resolve_report_path, write_flag_report
 
 DEFAULT_QUERY = """
 SELECT
@@ -26,26 +26,25 @@ SELECT
   record_hash,
   ingested_at
 FROM public.raw_records
-ORDER BY ingested_at DESC
+ORDER BY ingested_at DESC, id
 LIMIT :limit
 """
 
 
 def main() -> None:
-    database_url = os.getenv("DATABASE_URL") or os.getenv("DB_URL")
-    if not database_url:
-        raise SystemExit("DATABASE_URL (or DB_URL) is required to generate the flags report.")
-
     limit = int(os.getenv("FLAGS_LIMIT", "5000"))
-    out_path = Path(os.getenv("FLAGS_REPORT_PATH", "docs/assets/week-07/flags_report.csv"))
+    # csv | csv.gz | csv.zst | parquet (the path suffix follows the format)
+    report_format = normalize_format(os.getenv("FLAGS_REPORT_FORMAT", "csv"))
+    out_path = resolve_report_path(
+        Path(os.getenv("FLAGS_REPORT_PATH", "docs/assets/week-07/flags_report.csv")),
+        report_format,
+    )
 
     logger = get_logger(__name__)
-    db = SessionLocal()
-    tracker = RunTracker(db, logger, pipeline="flags", input_ref=f"limit={limit}")
+    tracker = RunTracker(logger, pipeline="flags", input_ref=f"limit={limit}")
 
     try:
         with tracker.step("fetch_raw_records", meta={"limit": limit}):
-            engine = create_engine(database_url)
             with engine.connect() as conn:
                 rows = conn.execute(text(DEFAULT_QUERY), {"limit": limit}).mappings().all()
                 records = [dict(r) for r in rows]
@@ -56,9 +55,16 @@ def main() -> None:
 
         with tracker.step(
             "write_flag_report_csv",
-            meta={"flagged_count": len(flagged), "output_path": out_path.as_posix()},
-        ):
-            out = write_flag_report_csv(flagged, out_path)
+            meta={
+                "flagged_count": len(flagged),
+                "output_path": out_path.as_posix(),
+                "format": report_format,
+            },
+        ) as step:
+            stats = write_flag_report(flagged, out_path, report_format)
+            # rows/bytes per second land in pipeline_runs.steps
+            step.meta.update(stats.as_meta())
+            out = stats.path
 
         # wire counts into run tracker
         try:
@@ -83,8 +89,6 @@ def main() -> None:
     except Exception as e:
         tracker.fail(e)
         raise
-    finally:
-        db.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import gzip
+import io
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from .models import FlaggedRecord
+from .report_csv import REPORT_COLUMNS, report_row, write_csv_rows
+
+# format name -> file suffix
+REPORT_SUFFIXES: dict[str, str] = {
+    "csv": ".csv",
+    "csv.gz": ".csv.gz",
+    "csv.zst": ".csv.zst",
+    "parquet": ".parquet",
+}
+REPORT_FORMATS = tuple(REPORT_SUFFIXES)
+
+# rows buffered per Parquet row group (bounded memory for large reports)
+DEFAULT_ROW_GROUP_SIZE = 50_000
+
+
+class ReportFormatError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class ReportStats:
+    path: Path
+    format: str
+    rows: int
+    bytes_written: int
+    duration_ms: int
+
+    def as_meta(self) -> dict[str, Any]:
+        """Throughput fields for the run's step meta."""
+        secs = max(self.duration_ms, 1) / 1000
+        return {
+            "format": self.format,
+            "output_path": self.path.as_posix(),
+            "rows_written": self.rows,
+            "bytes_written": self.bytes_written,
+            "rows_per_sec": round(self.rows / secs, 1),
+            "mb_per_sec": round(self.bytes_written / 1_000_000 / secs, 3),
+        }
+
+
+def normalize_format(fmt: str | None) -> str:
+    name = (fmt or "csv").strip().lower()
+    if name not in REPORT_SUFFIXES:
+        raise ReportFormatError(
+            f"Unsupported flags report format: {fmt!r} (expected one of {list(REPORT_FORMATS)})"
+        )
+    return name
+
+
+def resolve_report_path(out_path: str | Path, fmt: str) -> Path:
+    """Swap any known report suffix on out_path for the suffix of fmt."""
+    out_path = Path(out_path)
+    name = out_path.name
+    # longest suffix first so "x.csv.gz" doesn't match ".csv" only
+    for suffix in sorted(REPORT_SUFFIXES.values(), key=len, reverse=True):
+        if name.endswith(suffix):
+            name = name[: -len(suffix)]
+            break
+    return out_path.with_name(name + REPORT_SUFFIXES[fmt])
+
+
+def _write_csv(flagged: Iterable[FlaggedRecord], out_path: Path) -> int:
+    with out_path.open("w", newline="", encoding="utf-8") as f:
+        return write_csv_rows(f, flagged)
+
+
+def _write_csv_gz(flagged: Iterable[FlaggedRecord], out_path: Path) -> int:
+    # level 6: close to max ratio for CSV, much faster than gzip's default 9
+    with gzip.open(out_path, "wt", newline="", encoding="utf-8", compresslevel=6) as f:
+        return write_csv_rows(f, flagged)
+
+
+def _write_csv_zst(flagged: Iterable[FlaggedRecord], out_path: Path) -> int:
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ReportFormatError(
+            "csv.zst reports require the optional 'zstandard' package (zstd extra)"
+        ) from e
+
+    with out_path.open("wb") as raw:
+        cctx = zstandard.ZstdCompressor(level=3)
+        with cctx.stream_writer(raw, closefd=False) as zw:
+            with io.TextIOWrapper(zw, encoding="utf-8", newline="") as f:
+                return write_csv_rows(f, flagged)
+
+
+def _as_text(v: Any) -> str | None:
+    if v is None or v == "":
+        return None
+    if isinstance(v, datetime):
+        return v.isoformat()
+    return str(v)
+
+
+def _as_datetime(v: Any) -> datetime | None:
+    if isinstance(v, datetime):
+        return v if v.tzinfo else v.replace(tzinfo=UTC)
+    if isinstance(v, str) and v:
+        try:
+            dt = datetime.fromisoformat(v.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+        return dt if dt.tzinfo else dt.replace(tzinfo=UTC)
+    return None
+
+
+def _as_int(v: Any) -> int | None:
+    if v is None or v == "":
+        return None
+    try:
+        return int(v)
+    except (TypeError, ValueError):
+        return None
+
+
+def _write_parquet(flagged: Iterable[FlaggedRecord], out_path: Path, row_group_size: int) -> int:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ReportFormatError(
+            "parquet reports require the optional 'pyarrow' package (arrow extra)"
+        ) from e
+
+    ts = pa.timestamp("us", tz="UTC")
+    schema = pa.schema(
+        [
+            ("id", pa.string()),
+            ("run_id", pa.string()),
+            ("row_num", pa.int64()),
+            ("source", pa.string()),
+            ("source_id", pa.string()),
+            ("category", pa.string()),
+            ("event_time", ts),
+            ("value", pa.string()),
+            ("record_hash", pa.string()),
+            ("ingested_at", ts),
+            ("severity", pa.int32()),
+            ("flag_codes", pa.string()),
+            ("flag_messages", pa.string()),
+        ]
+    )
+    # per-column converters, aligned with REPORT_COLUMNS / report_row()
+    converters = [
+        _as_text,
+        _as_text,
+        _as_int,
+        _as_text,
+        _as_text,
+        _as_text,
+        _as_datetime,
+        _as_text,
+        _as_text,
+        _as_datetime,
+        _as_int,
+        _as_text,
+        _as_text,
+    ]
+
+    n = 0
+    cols: list[list[Any]] = [[] for _ in REPORT_COLUMNS]
+
+    def _flush(writer) -> None:
+        batch = pa.RecordBatch.from_arrays(
+            [pa.array(c, type=schema.field(i).type) for i, c in enumerate(cols)],
+            schema=schema,
+        )
+        writer.write_batch(batch, row_group_size=row_group_size)
+        for c in cols:
+            c.clear()
+
+    with pq.ParquetWriter(out_path, schema, compression="zstd") as writer:
+        for fr in flagged:
+            for col, conv, v in zip(cols, converters, report_row(fr), strict=True):
+                col.append(conv(v))
+            n += 1
+            if len(cols[0]) >= row_group_size:
+                _flush(writer)
+        if cols[0] or n == 0:
+            _flush(writer)
+    return n
+
+
+def write_flag_report(
+    flagged: Iterable[FlaggedRecord],
+    out_path: str | Path,
+    fmt: str = "csv",
+    *,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+) -> ReportStats:
+    """Write the flags report in the requested format and measure throughput.
+
+    out_path is used as-is; call resolve_report_path() first to match the suffix to fmt.
+    """
+    fmt = normalize_format(fmt)
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+
+    t0 = time.perf_counter()
+    if fmt == "csv":
+        rows = _write_csv(flagged, out_path)
+    elif fmt == "csv.gz":
+        rows = _write_csv_gz(flagged, out_path)
+    elif fmt == "csv.zst":
+        rows = _write_csv_zst(flagged, out_path)
+    else:
+        rows = _write_parquet(flagged, out_path, row_group_size)
+    duration_ms = int((time.perf_counter() - t0) * 1000)
+
+    return ReportStats(
+        path=out_path,
+        format=fmt,
+        rows=rows,
+        bytes_written=out_path.stat().st_size,
+        duration_ms=duration_ms,
+    )
@@ -3,6 +3,7 @@ from __future__ import annotations
 import csv
 from collections.abc import Iterable
 from pathlib import Path
+from typing import Any
 
 from .models import FlaggedRecord
 
@@ -23,31 +24,42 @@ REPORT_COLUMNS = [
 ]
 
 
+def report_row(fr: FlaggedRecord) -> tuple[Any, ...]:
+    """One report row, in REPORT_COLUMNS order (no per-row dict)."""
+    r = fr.record
+    return (
+        r.get("id", ""),
+        r.get("run_id", ""),
+        r.get("row_num", ""),
+        r.get("source", ""),
+        r.get("source_id", ""),
+        r.get("category", ""),
+        r.get("event_time", ""),
+        r.get("value", ""),
+        r.get("record_hash", ""),
+        r.get("ingested_at", ""),
+        fr.severity,
+        fr.flag_codes,
+        fr.flag_messages,
+    )
+
+
+def write_csv_rows(f, flagged: Iterable[FlaggedRecord]) -> int:
+    """Write header + rows to an open text stream; returns the row count."""
+    w = csv.writer(f)
+    w.writerow(REPORT_COLUMNS)
+    n = 0
+    for fr in flagged:
+        w.writerow(report_row(fr))
+        n += 1
+    return n
+
+
 def write_flag_report_csv(flagged: Iterable[FlaggedRecord], out_path: str | Path) -> Path:
     out_path = Path(out_path)
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
     with out_path.open("w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=REPORT_COLUMNS)
-        w.writeheader()
-        for fr in flagged:
-            r = fr.record
-            w.writerow(
-                {
-                    "id": r.get("id", ""),
-                    "run_id": r.get("run_id", ""),
-                    "row_num": r.get("row_num", ""),
-                    "source": r.get("source", ""),
-                    "source_id": r.get("source_id", ""),
-                    "category": r.get("category", ""),
-                    "event_time": r.get("event_time", ""),
-                    "value": r.get("value", ""),
-                    "record_hash": r.get("record_hash", ""),
-                    "ingested_at": r.get("ingested_at", ""),
-                    "severity": fr.severity,
-                    "flag_codes": fr.flag_codes,
-                    "flag_messages": fr.flag_messages,
-                }
-            )
+        write_csv_rows(f, flagged)
 
     return out_path
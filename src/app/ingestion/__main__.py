@@ -3,10 +3,18 @@ from __future__ import annotations
 import argparse
 import json
 import sys
+import uuid
 from pathlib import Path
 
 from app.db.session import SessionLocal
-from app.ingestion.service import ingest_files
+from app.ingestion.files import expand_paths, file_sha256
+from app.ingestion.service import (
+    IngestResult,
+    already_ingested,
+    ingest_files,
+    resumable_run,
+    resume_run,
+)
 
 
 def _samples_dir() -> Path:
@@ -14,8 +22,77 @@ def _samples_dir() -> Path:
     return Path(__file__).resolve().parents[3] / "data" / "samples"
 
 
+def _counts(result: IngestResult) -> dict:
+    return {
+        "run_id": str(result.run_id),
+        "ingest_run_id": str(result.ingest_run_id),
+        "total_records": result.total_records,
+        "inserted_records": result.inserted_records,
+        "deduped_records": result.deduped_records,
+        "rejected_records": result.rejected_records,
+    }
+
+
+def _ingest_paths(db, source: str, paths: list[Path], force: bool) -> tuple[list[dict], int]:
+    """One run per file; files already loaded for `source` (same content hash) are skipped.
+
+    A file whose last run for `source` failed resumes that run from its checkpoints.
+    A failed file is reported and the remaining files still run; exit code 1 if any failed.
+    """
+    results: list[dict] = []
+    exit_code = 0
+    for path in paths:
+        digest = file_sha256(path)
+        entry: dict = {"file": str(path), "content_hash": digest}
+        if not force and already_ingested(db, source, digest):
+            results.append({**entry, "status": "skipped"})
+            continue
+        resumable = None if force else resumable_run(db, source, digest)
+        try:
+            with path.open("rb") as fh:
+                if resumable is not None:
+                    # same content as the failed run, so its checkpoints apply
+                    result = resume_run(db, resumable, open_file=lambda _name, fh=fh: fh)
+                else:
+                    result = ingest_files(
+                        db=db, source=source, files=[(str(path), fh)], content_hash=digest
+                    )
+        except Exception as e:
+            # the run is recorded as failed with its checkpoints; the next invocation
+            # resumes it (or use --resume INGEST_RUN_ID). The session may still be in
+            # a failed transaction, and the lookup must not abort the remaining files.
+            db.rollback()
+            try:
+                failed = resumable_run(db, source, digest)
+            except Exception:
+                db.rollback()
+                failed = None
+            results.append(
+                {
+                    **entry,
+                    "status": "failed",
+                    "error": str(e),
+                    "ingest_run_id": str(failed) if failed else None,
+                }
+            )
+            exit_code = 1
+            continue
+        results.append(
+            {**entry, "status": "succeeded", "resumed": resumable is not None, **_counts(result)}
+        )
+    return results, exit_code
+
+
 def main() -> int:
     p = argparse.ArgumentParser(description="Run ingestion from CLI (used by make demo).")
+    p.add_argument(
+        "paths",
+        nargs="*",
+        help=(
+            "Files, directories (recursive) or glob patterns: "
+            ".csv/.xlsx/.ndjson/.jsonl/.parquet, optionally .gz/.zst."
+        ),
+    )
     p.add_argument(
         "--samples",
         action="store_true",
@@ -26,10 +103,87 @@ def main() -> int:
         default="samples",
         help="Source label stored on ingest_runs/raw_records (default: samples).",
     )
+    p.add_argument(
+        "--force",
+        action="store_true",
+        help="Ingest paths even if the same file content was already ingested for the source.",
+    )
+    p.add_argument(
+        "--resume",
+        metavar="INGEST_RUN_ID",
+        type=uuid.UUID,
+        help="Continue a failed ingest run from its checkpoints (files reopened by stored path).",
+    )
     args = p.parse_args()
 
+    if sum([args.samples, bool(args.paths), args.resume is not None]) > 1:
+        print("Use only one of --samples, --resume or paths.", file=sys.stderr)
+        return 2
+
+    if args.resume is not None:
+        db = SessionLocal()
+        try:
+            result = resume_run(db, args.resume)
+        except Exception as e:
+            # the run stays failed with its checkpoints; fix the cause and resume again
+            print(
+                json.dumps(
+                    {
+                        "pipeline": "ingest",
+                        "status": "failed",
+                        "resumed": True,
+                        "ingest_run_id": str(args.resume),
+                        "error": str(e),
+                    },
+                    indent=2,
+                    sort_keys=True,
+                )
+            )
+            return 1
+        finally:
+            db.close()
+        print(
+            json.dumps(
+                {
+                    "pipeline": "ingest",
+                    "status": "succeeded",
+                    "resumed": True,
+                    **_counts(result),
+                    "per_file": result.per_file,
+                },
+                indent=2,
+                sort_keys=True,
+            )
+        )
+        return 0
+
+    if args.paths:
+        try:
+            paths = expand_paths(args.paths)
+        except FileNotFoundError as e:
+            print(f"No such file or directory: {e}", file=sys.stderr)
+            return 2
+
+        db = SessionLocal()
+        try:
+            results, exit_code = _ingest_paths(db, args.source, paths, args.force)
+        finally:
+            db.close()
+        print(
+            json.dumps(
+                {"pipeline": "ingest", "source": args.source, "files": results},
+                indent=2,
+                sort_keys=True,
+            )
+        )
+        return exit_code
+
     if not args.samples:
-        print("Nothing to do. Try: python -m app.ingestion --samples", file=sys.stderr)
+        print(
+            "Nothing to do. Try: python -m app.ingestion --samples "
+            "or python -m app.ingestion data/landing/",
+            file=sys.stderr,
+        )
         return 2
 
     samples = _samples_dir()
@@ -50,6 +204,7 @@ def main() -> int:
                     "total_records": result.total_records,
                     "inserted_records": result.inserted_records,
                     "deduped_records": result.deduped_records,
+                    "rejected_records": result.rejected_records,
                     "per_file": result.per_file,
                 },
                 indent=2,
@@ -0,0 +1,421 @@
+"""INGEST_ENGINE=arrow: columnar ingest of CSV and Parquet via pyarrow record batches.
+
+Key columns are normalized with Arrow compute kernels and the record-hash input is
+built column-wise. Each batch is then written with one COPY into a temp staging table
+and one `INSERT ... SELECT ... ON CONFLICT DO NOTHING`, so no per-row dicts or bind
+parameters are built. Only the sha256 itself still runs per row.
+
+Rows must hash exactly like the Python engine (`service._extract_keys`), so whatever
+the kernels can't reproduce byte for byte goes through Python: rows whose key strings
+need JSON escaping (non-ASCII, quotes, backslashes, control characters) one by one, and
+batches whose key columns have other types (floats, booleans, ...) as a whole.
+xlsx and NDJSON inputs always use the Python engine, and so does the rest of a CSV
+file once Arrow fails to parse it (e.g. a row with fewer fields than the header).
+"""
+
+from __future__ import annotations
+
+import csv
+import hashlib
+import io
+import json
+import uuid
+from collections.abc import Callable, Iterable, Iterator
+from datetime import UTC, datetime
+from functools import partial
+from itertools import islice
+from typing import BinaryIO
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+from .payload import DENORMALIZED_KEYS
+from .service import (
+    Batch,
+    IngestionError,
+    _decompress,
+    _extract_keys,
+    _json_safe,
+    _lock_source,
+    _open_rows,
+    _parse_event_time,
+    _python_batches,
+    _skip_to,
+    _validate_headers,
+)
+
+UTC_TS = pa.timestamp("us", tz="UTC")
+# printable ASCII except '"' and '\': json.dumps writes these strings unescaped
+_PLAIN = r"^[ !#-\[\]-~]*$"
+_CONTROL = r"[\x00-\x1f]"
+
+STAGE_COLUMNS = (
+    "row_num",
+    "payload",
+    "source_id",
+    "event_time",
+    "category",
+    "value",
+    "record_hash",
+)
+
+_STAGE_DDL = """
+CREATE TEMP TABLE ingest_stage (
+  row_num integer,
+  payload jsonb,
+  source_id text,
+  event_time timestamptz,
+  category text,
+  value text,
+  record_hash text
+) ON COMMIT DROP
+"""
+
+# sorted like service._upsert_batches (source is constant) so lock order stays global
+_INSERT = text(
+    """
+    INSERT INTO raw_records (
+      id, run_id, row_num, payload, ingested_at,
+      source, record_hash, source_id, event_time, category, value
+    )
+    SELECT
+      gen_random_uuid(), :run_id, row_num, payload, :now,
+      :source, record_hash, source_id, event_time, category, value
+    FROM ingest_stage
+    ORDER BY record_hash, event_time
+    ON CONFLICT (source, record_hash, event_time) DO NOTHING
+    """
+)
+
+
+def _is_text(t: pa.DataType) -> bool:
+    return pa.types.is_string(t) or pa.types.is_large_string(t)
+
+
+def _as_text(col: pa.Array) -> pa.Array | None:
+    """A key column as `_norm_str` sees it before stripping; None if not reproducible."""
+    if _is_text(col.type) or pa.types.is_integer(col.type) or pa.types.is_null(col.type):
+        return pc.fill_null(col.cast(pa.string()), "")
+    return None
+
+
+def _event_times(col: pa.Array) -> pa.Array:
+    """event_time as UTC timestamps; naive values are UTC, like `_parse_event_time`."""
+    t = col.type
+    if pa.types.is_timestamp(t):
+        return pc.assume_timezone(col, "UTC") if t.tz is None else col.cast(UTC_TS)
+    if pa.types.is_date(t):
+        return pc.assume_timezone(col.cast(pa.timestamp("us")), "UTC")
+    if _is_text(t):
+        s = pc.ascii_trim_whitespace(col.cast(pa.string()))
+        try:
+            return s.cast(UTC_TS)
+        except pa.ArrowInvalid:
+            pass
+        try:
+            return pc.assume_timezone(s.cast(pa.timestamp("us")), "UTC")
+        except pa.ArrowInvalid:
+            pass
+    # mixed offsets/naive values or other formats: parse value by value
+    return pa.array([_parse_event_time(v) for v in col.to_pylist()], type=UTC_TS)
+
+
+def _isoformat(ts: pa.Array, suffix: str = "+00:00") -> pa.Array:
+    """`datetime.isoformat()` of UTC timestamps: microseconds only when non-zero."""
+    seconds = pc.floor_temporal(ts, unit="second")
+    whole = pc.strftime(seconds.cast(pa.timestamp("s")), format="%Y-%m-%dT%H:%M:%S")
+    micros = pc.subtract(ts.cast(pa.int64()), seconds.cast(pa.int64()))
+    frac = pc.binary_join_element_wise(".", pc.utf8_lpad(micros.cast(pa.string()), 6, "0"), "")
+    frac = pc.if_else(pc.equal(micros, 0), "", frac)
+    return pc.binary_join_element_wise(whole, frac, suffix, "")
+
+
+def _quoted(col: pa.Array) -> pa.Array:
+    return pc.binary_join_element_wise('"', col, '"', "")
+
+
+def _json_column(col: pa.Array) -> pa.Array | None:
+    """Each value as JSON text (null -> null); None for types handled by Python only."""
+    t = col.type
+    if _is_text(t):
+        escaped = pc.replace_substring(col.cast(pa.string()), "\\", "\\\\")
+        out = _quoted(pc.replace_substring(escaped, '"', '\\"'))
+    elif pa.types.is_integer(t) or pa.types.is_floating(t):
+        out = col.cast(pa.string())
+    elif pa.types.is_boolean(t):
+        out = pc.if_else(col, "true", "false")
+    elif pa.types.is_decimal(t):
+        out = _quoted(col.cast(pa.string()))  # str(Decimal), as in service._json_safe
+    elif pa.types.is_timestamp(t):
+        ts = col.cast(UTC_TS) if t.tz else col.cast(pa.timestamp("us"))
+        out = _quoted(_isoformat(ts, "+00:00" if t.tz else ""))
+    elif pa.types.is_date(t):
+        out = _quoted(pc.strftime(col.cast(pa.timestamp("s")), format="%Y-%m-%d"))
+    elif pa.types.is_null(t):
+        out = col.cast(pa.string())
+    else:
+        return None
+    return pc.fill_null(out, "null")
+
+
+def _payload(batch: pa.RecordBatch) -> pa.Array | None:
+    """JSON text of `stored_payload(row, RAW_PAYLOAD_MODE)` for every row."""
+    names = batch.schema.names
+    if settings.raw_payload_mode == "extras":
+        names = [n for n in names if n not in DENORMALIZED_KEYS]
+    if not names:
+        return pa.repeat("{}", batch.num_rows)
+
+    fragments = []
+    needs_python = pa.repeat(False, batch.num_rows)
+    for name in names:
+        col = batch.column(name)
+        value = _json_column(col)
+        if value is None:
+            return None
+        fragments.append(pc.binary_join_element_wise(json.dumps(name) + ":", value, ""))
+        if _is_text(col.type):
+            # control characters must be \u-escaped in JSON strings
+            controls = pc.fill_null(pc.match_substring_regex(col, _CONTROL), False)
+            needs_python = pc.or_(needs_python, controls)
+
+    payload = pc.binary_join_element_wise(
+        "{", pc.binary_join_element_wise(*fragments, ","), "}", ""
+    )
+    rows = pc.indices_nonzero(needs_python).to_pylist()
+    if not rows:
+        return payload
+    fixed = payload.to_pylist()
+    for i in rows:
+        row = batch.slice(i, 1).to_pylist()[0]
+        fixed[i] = json.dumps(_json_safe({n: row[n] for n in names}))
+    return pa.array(fixed, type=pa.string())
+
+
+def normalize_batch(batch: pa.RecordBatch, first_row_num: int) -> pa.Table | None:
+    """Stage columns (STAGE_COLUMNS) for one record batch, or None to use Python."""
+    texts = {c: _as_text(batch.column(c)) for c in ("source_id", "category", "value")}
+    if any(v is None for v in texts.values()):
+        return None
+    payload = _payload(batch)
+    if payload is None:
+        return None
+
+    event_times = _event_times(batch.column("event_time"))
+    if event_times.null_count:
+        raise IngestionError("event_time is required")
+    event_iso = _isoformat(event_times)
+
+    source_id = pc.ascii_trim_whitespace(texts["source_id"])
+    category = pc.ascii_lower(pc.ascii_trim_whitespace(texts["category"]))
+    value = pc.ascii_trim_whitespace(texts["value"])
+
+    # the same JSON as service._record_hash (sorted keys, no spaces)
+    hash_input = pc.binary_join_element_wise(
+        '{"category":"',
+        category,
+        '","event_time":"',
+        event_iso,
+        '","source_id":"',
+        source_id,
+        '","value":"',
+        value,
+        '"}',
+        "",
+    )
+    hashes = [hashlib.sha256(b).hexdigest() for b in hash_input.cast(pa.binary()).to_pylist()]
+
+    plain = pc.and_(
+        pc.and_(
+            pc.match_substring_regex(source_id, _PLAIN),
+            pc.match_substring_regex(category, _PLAIN),
+        ),
+        pc.match_substring_regex(value, _PLAIN),
+    )
+    rows = pc.indices_nonzero(pc.invert(plain)).to_pylist()
+    if rows:
+        # strings JSON would escape (or str.strip/str.lower treat differently): Python
+        sids, cats, vals = source_id.to_pylist(), category.to_pylist(), value.to_pylist()
+        raw = {c: texts[c].to_pylist() for c in texts}
+        times = event_times.to_pylist()
+        for i in rows:
+            sids[i], _, cats[i], vals[i], hashes[i] = _extract_keys(
+                {
+                    "source_id": raw["source_id"][i],
+                    "event_time": times[i],
+                    "category": raw["category"][i],
+                    "value": raw["value"][i],
+                }
+            )
+        source_id, category, value = (pa.array(v, type=pa.string()) for v in (sids, cats, vals))
+
+    row_num = pa.array(range(first_row_num, first_row_num + batch.num_rows), type=pa.int32())
+    return pa.Table.from_arrays(
+        [row_num, payload, source_id, event_iso, category, value, pa.array(hashes)],
+        names=list(STAGE_COLUMNS),
+    )
+
+
+def _copy_upsert(
+    db: Session, run_id: uuid.UUID, source: str, now: datetime, staged: pa.Table
+) -> int:
+    """COPY one staged batch into a temp table and upsert it; returns rows inserted."""
+    _lock_source(db, source)
+    db.execute(text(_STAGE_DDL))
+
+    sink = pa.BufferOutputStream()
+    pacsv.write_csv(staged, sink, pacsv.WriteOptions(include_header=False))
+    conn = db.connection().connection.dbapi_connection
+    copy_sql = f"COPY ingest_stage ({', '.join(STAGE_COLUMNS)}) FROM STDIN (FORMAT csv)"
+    with conn.cursor() as cur, cur.copy(copy_sql) as copy:
+        copy.write(memoryview(sink.getvalue()))
+
+    # ingest_stage is dropped when the caller commits the batch
+    return db.execute(_INSERT, {"run_id": run_id, "now": now, "source": source}).rowcount
+
+
+def _record_batches(
+    stream: BinaryIO, name: str, offset: int | None = None
+) -> Iterable[pa.RecordBatch]:
+    """Record batches of one file; headers are validated now, rows parsed lazily.
+
+    Parse errors (e.g. a CSV row with fewer fields than the header) raise
+    `pa.ArrowInvalid` while iterating, never from this call.
+    """
+    if name.endswith(".csv"):
+        # every column as text, exactly as csv.DictReader hands it to the Python engine
+        header = stream.readline()
+        names = next(csv.reader([header.decode("utf-8")]), [])
+        _validate_headers(names)
+        if offset is not None:
+            # byte offset checkpoint (written by the Python engine)
+            _skip_to(stream, len(header), offset)
+
+        def rows() -> Iterator[pa.RecordBatch]:
+            # open_csv parses its first block right away: keep it inside the iteration
+            yield from pacsv.open_csv(
+                stream,
+                read_options=pacsv.ReadOptions(column_names=names),
+                parse_options=pacsv.ParseOptions(newlines_in_values=True),
+                convert_options=pacsv.ConvertOptions(column_types={n: pa.string() for n in names}),
+            )
+
+        return rows()
+    try:
+        pf = pq.ParquetFile(stream)
+    except pa.ArrowException as e:
+        raise IngestionError(f"Invalid parquet file: {e}") from e
+    _validate_headers(pf.schema_arrow.names)
+    return pf.iter_batches(batch_size=max(1, settings.ingest_batch_size))
+
+
+def _arrow_batches(
+    db: Session,
+    run_id: uuid.UUID,
+    source: str,
+    batches: Iterable[pa.RecordBatch],
+    first_row_num: int = 1,
+    skip: int = 0,
+    filename: str = "",
+    fallback: Callable[[int], Iterator[Batch]] | None = None,
+) -> Iterator[Batch]:
+    """Upsert batches from `batches`; `fallback(rows_done)` continues the file in Python.
+
+    The Python engine reads some files Arrow rejects (csv.DictReader pads short rows),
+    so a parse error hands the rest of the file to `fallback`, after the batches
+    already yielded. Without one, it fails the file as an IngestionError.
+    """
+    size = max(1, settings.ingest_batch_size)
+    count = first_row_num - 1
+    now = datetime.now(UTC)
+    reader = iter(batches)
+    while True:
+        try:
+            record_batch = next(reader, None)
+        except pa.ArrowException as e:
+            if fallback is None:
+                raise IngestionError(f"{filename}: {e}") from e
+            yield from fallback(count)
+            return
+        if record_batch is None:
+            break
+        if skip:
+            # row index checkpoint: drop rows committed before the resume
+            dropped = min(skip, record_batch.num_rows)
+            record_batch = record_batch.slice(dropped)
+            skip -= dropped
+        for offset in range(0, record_batch.num_rows, size):
+            batch = record_batch.slice(offset, size)
+            try:
+                staged = normalize_batch(batch, count + 1)
+            except pa.ArrowException:
+                staged = None  # a cast the kernels can't do: Python decides per row
+            except IngestionError:
+                if settings.ingest_on_error != "quarantine":
+                    raise
+                staged = None  # the Python engine quarantines the bad rows one by one
+            if staged is None:
+                rows = iter(batch.to_pylist())
+                yield from _python_batches(
+                    db, run_id, source, rows, first_row_num=count + 1, filename=filename
+                )
+            else:
+                write = partial(_copy_upsert, db, run_id, source, now, staged)
+                # Arrow's CSV reader doesn't expose byte positions: resume by row index
+                checkpoint = {"rows": count + batch.num_rows, "offset": None}
+                yield Batch(batch.num_rows, write, checkpoint)
+            count += batch.num_rows
+
+
+def open_batches(
+    db: Session,
+    run_id: uuid.UUID,
+    source: str,
+    filename: str,
+    data: bytes | BinaryIO,
+    start: dict | None = None,
+) -> Iterator[Batch] | None:
+    """Columnar upsert batches for CSV / Parquet (headers checked now); None otherwise.
+
+    `start` is a checkpoint as in service._open_rows.
+    """
+    base = filename.lower().removesuffix(".gz").removesuffix(".zst")
+    if not base.endswith((".csv", ".parquet")):
+        return None
+
+    raw = io.BytesIO(data) if isinstance(data, bytes) else data
+    origin = raw.tell() if raw.seekable() else None
+    name, stream = _decompress(filename, raw)
+    if name.endswith(".parquet") and stream is not raw:
+        stream = io.BytesIO(stream.read())  # parquet needs a seekable file
+    start = start or {}
+    offset = start.get("offset") if name.endswith(".csv") else None
+    rows = start.get("rows", 0)
+
+    def python_rest(done: int) -> Iterator[Batch]:
+        # reread the file from the checkpoint it was opened at, then skip what Arrow did
+        raw.seek(origin)
+        resume_at = {"rows": rows, "offset": offset} if offset is not None else None
+        reader = _open_rows(filename, raw, resume_at)
+        skipped = done - (rows if offset is not None else 0)
+        next(islice(reader, skipped, skipped), None)
+        return _python_batches(
+            db, run_id, source, reader, first_row_num=done + 1, filename=filename
+        )
+
+    return _arrow_batches(
+        db,
+        run_id,
+        source,
+        _record_batches(stream, name, offset),
+        first_row_num=rows + 1,
+        skip=0 if offset is not None else rows,
+        filename=filename,
+        fallback=python_rest if name.endswith(".csv") and origin is not None else None,
+    )
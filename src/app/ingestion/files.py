@@ -0,0 +1,58 @@
+"""Input discovery for CLI ingests: paths, directories and globs, plus content hashes.
+
+Supported files are `.csv`, `.xlsx`, `.ndjson` / `.jsonl` and `.parquet`, optionally
+compressed as `.gz` or `.zst`.
+The content hash is the sha256 of the file as stored (compressed bytes included),
+so re-running a cron over a landing directory skips files that were already loaded.
+"""
+
+from __future__ import annotations
+
+import glob
+import hashlib
+from collections.abc import Iterable
+from pathlib import Path
+
+FORMATS = (".csv", ".xlsx", ".ndjson", ".jsonl", ".parquet")
+COMPRESSIONS = ("", ".gz", ".zst")
+
+
+def is_ingestable(path: Path) -> bool:
+    name = path.name.lower()
+    return any(name.endswith(fmt + comp) for fmt in FORMATS for comp in COMPRESSIONS)
+
+
+def _has_magic(pattern: str) -> bool:
+    return any(c in pattern for c in "*?[")
+
+
+def expand_paths(args: Iterable[str]) -> list[Path]:
+    """Resolve CLI arguments to a sorted, de-duplicated list of files.
+
+    Files named explicitly are kept as given (an unsupported type fails at ingest).
+    Directories are searched recursively and glob matches are filtered to supported
+    types; hidden files (e.g. `.upload.csv.gz` still being written) are skipped.
+    Raises FileNotFoundError for a path that does not exist.
+    """
+    found: dict[Path, Path] = {}
+    for arg in args:
+        path = Path(arg)
+        if _has_magic(arg):
+            candidates = [Path(m) for m in glob.glob(arg, recursive=True)]
+        elif path.is_dir():
+            candidates = list(path.rglob("*"))
+        elif path.is_file():
+            found.setdefault(path.resolve(), path)
+            continue
+        else:
+            raise FileNotFoundError(arg)
+
+        for c in candidates:
+            if c.is_file() and not c.name.startswith(".") and is_ingestable(c):
+                found.setdefault(c.resolve(), c)
+    return sorted(found.values())
+
+
+def file_sha256(path: Path) -> str:
+    with path.open("rb") as fh:
+        return hashlib.file_digest(fh, "sha256").hexdigest()
@@ -0,0 +1,45 @@
+"""What raw_records.payload holds, and how the full source row is rebuilt from it.
+
+RAW_PAYLOAD_MODE=full (default) stores the original row. `extras` drops the
+columns that are already denormalized into typed columns (source_id, event_time,
+category, value) and keeps only the rest. Readers go through `full_payload`, which
+accepts rows written in either mode.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Literal
+
+PayloadMode = Literal["full", "extras"]
+
+DENORMALIZED_KEYS = ("source_id", "event_time", "category", "value")
+
+
+def stored_payload(row: dict[str, Any], mode: PayloadMode) -> dict[str, Any]:
+    if mode == "extras":
+        return {k: v for k, v in row.items() if k not in DENORMALIZED_KEYS}
+    return row
+
+
+def full_payload(
+    payload: dict[str, Any] | None,
+    *,
+    source_id: str,
+    event_time: datetime,
+    category: str,
+    value: str,
+) -> dict[str, Any]:
+    """Source row from the typed columns plus stored extras.
+
+    Keys present in `payload` (full-mode rows) win. For extras-mode rows the
+    denormalized keys come back in their normalized form: trimmed, category
+    lower-cased, event_time as ISO 8601 UTC.
+    """
+    typed = {
+        "source_id": source_id,
+        "event_time": event_time.isoformat(),
+        "category": category,
+        "value": value,
+    }
+    return {**typed, **(payload or {})}
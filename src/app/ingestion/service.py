@@ -1,20 +1,36 @@
 from __future__ import annotations
 
 import csv
+import gzip
 import hashlib
 import io
 import json
 import uuid
+from collections.abc import Callable, Iterator
+from contextlib import ExitStack
 from dataclasses import dataclass
-from datetime import UTC, datetime
+from datetime import UTC, date, datetime
+from datetime import time as dt_time
+from decimal import Decimal
+from functools import partial
+from itertools import chain, islice
+from typing import BinaryIO, NamedTuple
 
 from openpyxl import load_workbook
+from sqlalchemy import select, text
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
-from app.db.models import IngestRun, RawRecord
+from app.core.config import settings
+from app.db.batched import MAX_PARAMS
+from app.db.data_version import bump_data_version
+from app.db.models import IngestReject, IngestRun, RawRecord
 from app.observability.logging import get_logger
+from app.observability.metrics import RECORDS_DEDUPED
 from app.observability.run_tracking import RunTracker
+from app.transform.daily_metrics import days_for_ingest_run, refresh_daily_metrics
+
+from .payload import stored_payload
 
 REQUIRED_COLUMNS = ["source_id", "event_time", "value", "category"]
 
@@ -30,6 +46,10 @@ class IngestResult:
     inserted_records: int
     deduped_records: int
     per_file: dict[str, int]
+    # ingest_runs.id (run_id above is the pipeline run); what resume_run takes
+    ingest_run_id: uuid.UUID | None = None
+    # rows quarantined in ingest_rejects (INGEST_ON_ERROR=quarantine)
+    rejected_records: int = 0
 
 
 def _parse_event_time(v: object) -> datetime:
@@ -69,15 +89,20 @@ def _extract_keys(payload: dict) -> tuple[str, datetime, str, str, str]:
     value = _norm_str(payload.get("value"))
     event_dt = _parse_event_time(payload.get("event_time"))
 
+    record_hash = _record_hash(source_id, event_dt.isoformat(), category, value)
+    return source_id, event_dt, category, value, record_hash
+
+
+def _record_hash(source_id: str, event_time: str, category: str, value: str) -> str:
+    # the Arrow engine builds this exact JSON column-wise; keep them in sync
     key = {
         "source_id": source_id,
-        "event_time": event_dt.isoformat(),
+        "event_time": event_time,
         "category": category,
         "value": value,
     }
     encoded = json.dumps(key, sort_keys=True, separators=(",", ":")).encode("utf-8")
-    record_hash = hashlib.sha256(encoded).hexdigest()
-    return source_id, event_dt, category, value, record_hash
+    return hashlib.sha256(encoded).hexdigest()
 
 
 def _validate_headers(headers: list[str]) -> None:
@@ -86,102 +111,493 @@ def _validate_headers(headers: list[str]) -> None:
         raise IngestionError(f"Missing required columns: {missing}")
 
 
-def _parse_csv(data: bytes) -> list[dict]:
-    text = data.decode("utf-8")
-    reader = csv.DictReader(io.StringIO(text))
-    headers = reader.fieldnames or []
+def _decompress(filename: str, stream: BinaryIO) -> tuple[str, BinaryIO]:
+    """Strip a `.gz` / `.zst` suffix and wrap `stream` in the matching decompressor."""
+    name = filename.lower()
+    if name.endswith(".gz"):
+        return name[:-3], gzip.GzipFile(fileobj=stream, mode="rb")
+    if name.endswith(".zst"):
+        try:
+            import zstandard
+        except ImportError as e:
+            raise IngestionError(
+                f"{filename}: .zst files require the optional 'zstandard' package (zstd extra)"
+            ) from e
+        # buffered: the raw zstd reader can't be iterated line by line (NDJSON)
+        return name[:-4], io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(stream))
+    return name, stream
+
+
+def _skip_to(stream: BinaryIO, position: int, offset: int) -> None:
+    """Move `stream` from byte `position` to `offset` (reading forward if it can't seek)."""
+    if stream.seekable():
+        stream.seek(offset)
+        return
+    remaining = offset - position
+    while remaining > 0 and (chunk := stream.read(min(remaining, 1 << 20))):
+        remaining -= len(chunk)
+
+
+class _CsvRows:
+    """csv.DictReader over binary lines; `offset` is the byte position after the last row.
+
+    Checkpoints store that offset, so a resumed run seeks past the committed rows
+    instead of re-reading them (decompressed streams that can't seek read them away).
+    """
+
+    def __init__(self, stream: BinaryIO, offset: int | None = None):
+        self.offset = 0
+        self._stream = stream
+        lines = self._lines()
+        headers = next(csv.reader(lines), None) or []
+        _validate_headers(headers)
+        if offset is not None:
+            _skip_to(self._stream, self.offset, offset)
+            self.offset = offset
+        self._reader = csv.DictReader(lines, fieldnames=headers)
+
+    def _lines(self) -> Iterator[str]:
+        while line := self._stream.readline():
+            self.offset += len(line)
+            yield line.decode("utf-8")
+
+    def __iter__(self) -> Iterator[dict]:
+        return self
+
+    def __next__(self) -> dict:
+        return next(self._reader)
+
+
+def _iter_xlsx(stream: BinaryIO) -> Iterator[dict]:
+    wb = load_workbook(stream, read_only=True, data_only=True)
+    rows = wb.active.iter_rows(values_only=True)
+    first = next(rows, None)
+    if first is None:
+        return iter(())
+    headers = [str(h).strip() for h in first]
     _validate_headers(headers)
-    return [row for row in reader]
+    return ({headers[i]: r[i] for i in range(len(headers))} for r in rows)
 
 
-def _parse_xlsx(data: bytes) -> list[dict]:
-    wb = load_workbook(io.BytesIO(data), read_only=True, data_only=True)
-    ws = wb.active
-    rows = list(ws.iter_rows(values_only=True))
-    if not rows:
-        return []
-    headers = [str(h).strip() for h in rows[0]]
-    _validate_headers(headers)
-    out: list[dict] = []
-    for r in rows[1:]:
-        row = {headers[i]: r[i] for i in range(len(headers))}
-        out.append(row)
-    return out
+def _json_loads() -> Callable[[bytes], object]:
+    try:
+        import orjson
+    except ImportError:
+        return json.loads
+    return orjson.loads
 
 
-def _parse_by_extension(filename: str, data: bytes) -> list[dict]:
-    name = filename.lower()
+def _iter_ndjson(stream: BinaryIO) -> Iterator[dict]:
+    """One JSON object per line; the first object's keys are validated as the header."""
+    loads = _json_loads()
+
+    def records() -> Iterator[dict]:
+        for line_no, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                obj = loads(line)
+            except ValueError as e:
+                raise IngestionError(f"Invalid JSON on line {line_no}: {e}") from e
+            if not isinstance(obj, dict):
+                raise IngestionError(f"Line {line_no} is not a JSON object")
+            yield obj
+
+    it = records()
+    first = next(it, None)
+    if first is None:
+        return iter(())
+    _validate_headers(list(first))
+    return chain([first], it)
+
+
+def _iter_parquet(stream: BinaryIO) -> Iterator[dict]:
+    """Rows of a Parquet file, read one record batch at a time.
+
+    Typed columns keep their Python types: a timestamp `event_time` arrives as a
+    datetime and skips string parsing in `_parse_event_time`.
+    """
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise IngestionError(
+            "parquet files require the optional 'pyarrow' package (arrow extra)"
+        ) from e
+
+    pf = pq.ParquetFile(stream)
+    _validate_headers(pf.schema_arrow.names)
+    batches = pf.iter_batches(batch_size=max(1, settings.ingest_batch_size))
+    return (row for batch in batches for row in batch.to_pylist())
+
+
+def _open_rows(filename: str, data: bytes | BinaryIO, start: dict | None = None) -> Iterator[dict]:
+    """Lazy row iterator for one file; headers are validated before it is returned.
+
+    `start` is a checkpoint: CSV seeks to its byte offset, other formats skip its rows.
+    """
+    raw = io.BytesIO(data) if isinstance(data, bytes) else data
+    name, stream = _decompress(filename, raw)
+    if name.endswith(".csv") and start and start.get("offset") is not None:
+        return _CsvRows(stream, start["offset"])
     if name.endswith(".csv"):
-        return _parse_csv(data)
-    if name.endswith(".xlsx"):
-        return _parse_xlsx(data)
-    raise IngestionError(f"Unsupported file type: {filename}")
+        rows = _CsvRows(stream)
+    elif name.endswith((".ndjson", ".jsonl")):
+        rows = _iter_ndjson(stream)
+    # xlsx (zip) and parquet (footer) need a seekable file, so buffer decompressed ones
+    elif name.endswith(".xlsx"):
+        rows = _iter_xlsx(stream if stream is raw else io.BytesIO(stream.read()))
+    elif name.endswith(".parquet"):
+        rows = _iter_parquet(stream if stream is raw else io.BytesIO(stream.read()))
+    else:
+        raise IngestionError(f"Unsupported file type: {filename}")
 
+    if start and start.get("rows"):
+        # row index checkpoint: read the committed rows again, without any DB work
+        next(islice(rows, start["rows"], start["rows"]), None)
+    return rows
+
+
+_JSON_TYPES = (str, int, float, bool, type(None), dict, list)
 
-def ingest_files(db: Session, source: str, files: list[tuple[str, bytes]]) -> IngestResult:
-    logger = get_logger(__name__)
-    input_ref = ",".join([f[0] for f in files])
-    tracker = RunTracker(db, logger, pipeline="ingest", input_ref=input_ref)
 
-    run = IngestRun(source=source, files="\n".join([f[0] for f in files]), status="started")
+def _json_safe(row: dict) -> dict:
+    """Typed cells (Parquet, xlsx dates) as JSON values for the payload column."""
+    if all(isinstance(v, _JSON_TYPES) for v in row.values()):
+        return row
+    return {k: _json_value(v) for k, v in row.items()}
+
+
+def _json_value(v: object) -> object:
+    if isinstance(v, datetime | date | dt_time):
+        return v.isoformat()
+    if isinstance(v, Decimal):
+        return str(v)
+    return v
+
+
+def _raw_values(run_id: uuid.UUID, source: str, row_num: int, payload: dict, now: datetime) -> dict:
+    source_id, event_dt, category, value, record_hash = _extract_keys(payload)
+    return {
+        "id": uuid.uuid4(),
+        "run_id": run_id,
+        "row_num": row_num,
+        "payload": stored_payload(_json_safe(payload), settings.raw_payload_mode),
+        "ingested_at": now,
+        "source": source,
+        "record_hash": record_hash,
+        "source_id": source_id,
+        "event_time": event_dt,
+        "category": category,
+        "value": value,
+    }
+
+
+def already_ingested(db: Session, source: str, content_hash: str) -> bool:
+    """True when a successful run for `source` already loaded a file with this content."""
+    stmt = (
+        select(IngestRun.id)
+        .where(
+            IngestRun.source == source,
+            IngestRun.content_hash == content_hash,
+            IngestRun.status == "success",
+        )
+        .limit(1)
+    )
+    return db.execute(stmt).first() is not None
+
+
+def _max_rows(table) -> int:
+    """Rows per multi-row INSERT into `table` that stay under Postgres' bind parameter cap."""
+    return max(1, MAX_PARAMS // len(table.columns))
+
+
+def _upsert_batches(values: list[dict]) -> list[list[dict]]:
+    """Rows sorted by the dedupe key, cut into INGEST_BATCH_SIZE chunks.
+
+    Every batch transaction inserts (and so locks unique-index entries) in key order,
+    so two overlapping ingests can wait on each other but never deadlock. Chunks are
+    capped at `_max_rows(raw_records)` so a large INGEST_BATCH_SIZE still binds.
+    """
+    ordered = sorted(values, key=lambda v: (v["source"], v["record_hash"], v["event_time"]))
+    size = max(1, min(settings.ingest_batch_size, _max_rows(RawRecord.__table__)))
+    return [ordered[i : i + size] for i in range(0, len(ordered), size)]
+
+
+def _lock_source(db: Session, source: str) -> None:
+    if settings.ingest_lock_mode == "advisory":
+        # one writer per source at a time (per batch transaction)
+        db.execute(
+            text("SELECT pg_advisory_xact_lock(hashtext(:key))"),
+            {"key": f"raw_records:{source}"},
+        )
+
+
+def _upsert_batch(db: Session, source: str, batch: list[dict]) -> int:
+    """Insert one batch, skipping known records; returns the number inserted."""
+    _lock_source(db, source)
+
+    stmt = pg_insert(RawRecord.__table__).values(batch)
+    stmt = stmt.on_conflict_do_nothing(index_elements=["source", "record_hash", "event_time"])
+
+    # ✅ Reliable inserted count for ON CONFLICT DO NOTHING: the command tag
+    # (INSERT 0 n) counts only rows actually inserted; no per-row RETURNING.
+    return db.execute(stmt).rowcount
+
+
+def resumable_run(db: Session, source: str, content_hash: str) -> uuid.UUID | None:
+    """The latest failed run for `source` over a file with this content, if any."""
+    stmt = (
+        select(IngestRun.id)
+        .where(
+            IngestRun.source == source,
+            IngestRun.content_hash == content_hash,
+            IngestRun.status == "failed",
+        )
+        .order_by(IngestRun.created_at.desc())
+        .limit(1)
+    )
+    return db.execute(stmt).scalar_one_or_none()
+
+
+class Batch(NamedTuple):
+    row_count: int  # rows read, rejected ones included
+    write: Callable[[], int]  # upserts the batch (and stores its rejects); returns inserted
+    checkpoint: dict  # {"rows", "offset"}: where the file stands once this batch commits
+    rejected: int = 0
+
+
+def _upsert_values(db: Session, source: str, values: list[dict], rejects: list[dict]) -> int:
+    size = _max_rows(IngestReject.__table__)
+    for i in range(0, len(rejects), size):
+        db.execute(pg_insert(IngestReject.__table__).values(rejects[i : i + size]))
+    return sum(_upsert_batch(db, source, batch) for batch in _upsert_batches(values))
+
+
+def _python_batches(
+    db: Session,
+    run_id: uuid.UUID,
+    source: str,
+    rows: Iterator[dict],
+    first_row_num: int = 1,
+    filename: str = "",
+) -> Iterator[Batch]:
+    size = max(1, settings.ingest_batch_size)
+    quarantine = settings.ingest_on_error == "quarantine"
+    count = first_row_num - 1
+    now = datetime.now(UTC)
+    while chunk := list(islice(rows, size)):
+        values: list[dict] = []
+        rejects: list[dict] = []
+        for row_num, payload in enumerate(chunk, start=count + 1):
+            try:
+                values.append(_raw_values(run_id, source, row_num, payload, now))
+            except IngestionError as e:
+                if not quarantine:
+                    raise
+                rejects.append(
+                    {
+                        "id": uuid.uuid4(),
+                        "run_id": run_id,
+                        "filename": filename,
+                        "row_num": row_num,
+                        "payload": _json_safe(payload),
+                        "error": str(e),
+                        "created_at": now,
+                    }
+                )
+        count += len(chunk)
+        checkpoint = {"rows": count, "offset": getattr(rows, "offset", None)}
+        write = partial(_upsert_values, db, source, values, rejects)
+        yield Batch(len(chunk), write, checkpoint, len(rejects))
+
+
+def _open_batches(
+    db: Session,
+    run_id: uuid.UUID,
+    source: str,
+    filename: str,
+    data: bytes | BinaryIO,
+    start: dict | None = None,
+) -> Iterator[Batch]:
+    """Upsert batches for one file from checkpoint `start`; headers are validated first."""
+    if settings.ingest_engine == "arrow":
+        try:
+            from . import arrow_engine
+        except ImportError as e:
+            raise IngestionError(
+                "INGEST_ENGINE=arrow requires the optional 'pyarrow' package (arrow extra)"
+            ) from e
+        batches = arrow_engine.open_batches(db, run_id, source, filename, data, start)
+        if batches is not None:
+            return batches
+    rows = _open_rows(filename, data, start)
+    first_row_num = (start or {}).get("rows", 0) + 1
+    return _python_batches(db, run_id, source, rows, first_row_num=first_row_num, filename=filename)
+
+
+def _check_error_rate(rejected: int, read: int, *, final: bool = False) -> None:
+    """Fail the run when the share of rejected rows exceeds the limit.
+
+    Mid-run (after a batch) the rate is only enforced once INGEST_ERROR_RATE_MIN_ROWS
+    rows were read, so a cluster of bad rows early in a file doesn't abort it; the
+    `final` check over the whole run always applies.
+    """
+    if not rejected or (not final and read < settings.ingest_error_rate_min_rows):
+        return
+    rate = rejected / read
+    if rate > settings.ingest_max_error_rate:
+        raise IngestionError(
+            f"Rejected {rejected} of {read} rows ({rate:.2%}), "
+            f"above INGEST_MAX_ERROR_RATE={settings.ingest_max_error_rate}"
+        )
+
+
+def ingest_files(
+    db: Session,
+    source: str,
+    files: list[tuple[str, bytes | BinaryIO]],
+    *,
+    content_hash: str | None = None,
+) -> IngestResult:
+    """Ingest `(filename, bytes or binary file)` pairs as one run.
+
+    Files are streamed: rows are read, hashed and upserted INGEST_BATCH_SIZE at a time
+    (columnar for CSV / Parquet with INGEST_ENGINE=arrow, see arrow_engine.py). Every
+    batch commits together with the file's checkpoint, so a failed run can continue
+    with `resume_run`. `content_hash` (CLI, one file per run) is stored on the run for
+    `already_ingested`.
+    """
+    run = IngestRun(
+        source=source,
+        files="\n".join([f[0] for f in files]),
+        status="started",
+        content_hash=content_hash,
+    )
     db.add(run)
     db.flush()  # get run.id
+    return _ingest(db, run, files)
+
+
+def resume_run(
+    db: Session,
+    run_id: uuid.UUID,
+    *,
+    open_file: Callable[[str], BinaryIO] | None = None,
+) -> IngestResult:
+    """Continue a failed (or interrupted) run from its per-file checkpoints.
+
+    Files are reopened by the names stored on the run (CLI runs store paths), or via
+    `open_file(name)`. Finished files are skipped, CSV seeks to the checkpoint's byte
+    offset and other formats skip its rows. A batch committed after its checkpoint
+    can't exist (both commit together); anything re-read dedupes on record_hash.
+    Counts cover the whole run except inserted/deduped, which are for this call.
+    """
+    run = db.get(IngestRun, run_id)
+    if run is None:
+        raise IngestionError(f"Ingest run not found: {run_id}")
+    if run.status == "success":
+        raise IngestionError(f"Ingest run {run_id} already succeeded")
+
+    checkpoints = run.checkpoints or {}
+    opener = open_file or (lambda name: open(name, "rb"))
+    with ExitStack() as stack:
+        files: list[tuple[str, bytes | BinaryIO | None]] = []
+        for name in run.files.splitlines():
+            if checkpoints.get(name, {}).get("done"):
+                files.append((name, None))
+                continue
+            try:
+                files.append((name, stack.enter_context(opener(name))))
+            except OSError as e:
+                raise IngestionError(f"Cannot reopen {name} to resume run {run_id}: {e}") from e
+
+        run.status = "started"
+        run.error = None
+        return _ingest(db, run, files, resume=True)
+
+
+def _ingest(
+    db: Session,
+    run: IngestRun,
+    files: list[tuple[str, bytes | BinaryIO | None]],
+    resume: bool = False,
+) -> IngestResult:
+    logger = get_logger(__name__)
+    input_ref = ",".join([f[0] for f in files])
+    run_ref = {"ingest_run_id": str(run.id)}  # usable after a rollback expires `run`
+    meta = {**run_ref, **({"resumed": True} if resume else {})}
+    tracker = RunTracker(logger, pipeline="ingest", input_ref=input_ref, meta=meta)
+    checkpoints = dict(run.checkpoints or {}) if resume else {}
 
     per_file: dict[str, int] = {}
     total = 0
     inserted = 0
     deduped = 0
+    rejected = 0
+    read = 0
 
     try:
         for filename, data in files:
-            with tracker.step("parse", meta={"filename": filename}):
-                rows = _parse_by_extension(filename, data)
-
-            per_file[filename] = len(rows)
-            total += len(rows)
-
-            if not rows:
+            start = checkpoints.get(filename)
+            if start:
+                # resumed: rows committed earlier count toward the error rate
+                read += start["rows"]
+                rejected += start.get("rejected", 0)
+            if start and start.get("done"):
+                per_file[filename] = start["rows"]
+                total += start["rows"]
                 continue
 
-            with tracker.step("upsert", meta={"filename": filename, "row_count": len(rows)}):
-                now = datetime.now(UTC)
-                values: list[dict] = []
-                for idx, payload in enumerate(rows, start=1):
-                    source_id, event_dt, category, value, record_hash = _extract_keys(payload)
-                    values.append(
-                        {
-                            "id": uuid.uuid4(),
-                            "run_id": run.id,
-                            "row_num": idx,
-                            "payload": payload,
-                            "ingested_at": now,
-                            "source": source,
-                            "record_hash": record_hash,
-                            "source_id": source_id,
-                            "event_time": event_dt,
-                            "category": category,
-                            "value": value,
-                        }
-                    )
-
-                stmt = pg_insert(RawRecord.__table__).values(values)
-                stmt = stmt.on_conflict_do_nothing(index_elements=["source", "record_hash"])
-
-                # ✅ Reliable inserted count for ON CONFLICT DO NOTHING:
-                # RETURNING yields only rows that were actually inserted.
-                stmt = stmt.returning(RawRecord.__table__.c.id)
-
-                res = db.execute(stmt)
-                added = len(res.fetchall())
+            with tracker.step("parse", meta={"filename": filename, "start": start}):
+                batches = _open_batches(db, run.id, run.source, filename, data, start)
+
+            checkpoint = start or {"rows": 0, "offset": None}
+            file_rejected = checkpoint.get("rejected", 0)
+            for batch_no, batch in enumerate(batches, start=1):
+                file_rejected += batch.rejected
+                checkpoint = {**batch.checkpoint, "rejected": file_rejected}
+                meta = {"filename": filename, "batch": batch_no, "row_count": batch.row_count}
+                # log lines for the first batch only; every batch is recorded in steps
+                with tracker.step("upsert", meta=meta, quiet=batch_no > 1) as step:
+                    added = batch.write()
+                    checkpoints[filename] = checkpoint
+                    run.checkpoints = dict(checkpoints)
+                    # bounded transactions: row locks are held for one batch, not a file;
+                    # the checkpoint commits with the rows it covers
+                    db.commit()
+                    step.meta["inserted"] = added
+                    step.meta["rejected"] = batch.rejected
+                    step.meta["checkpoint"] = checkpoint
 
                 inserted += added
-                deduped += len(values) - added
+                deduped += batch.row_count - batch.rejected - added
+                rejected += batch.rejected
+                read += batch.row_count
+                _check_error_rate(rejected, read)
+
+            # committed with the next batch or the final status update
+            checkpoints[filename] = {**checkpoint, "done": True}
+            run.checkpoints = dict(checkpoints)
+            per_file[filename] = checkpoint["rows"]
+            total += checkpoint["rows"]
+
+        _check_error_rate(rejected, read, final=True)
+
+        if inserted:
+            # keep the trend rollup current: recompute only the days this run touched
+            # (committed batches are visible; the refresh serializes on its own lock)
+            with tracker.step("refresh_daily_metrics") as step:
+                days = days_for_ingest_run(db, run.id)
+                step.meta["day_count"] = refresh_daily_metrics(db, days)
+            # invalidates cached dashboard responses once this transaction commits
+            bump_data_version(db)
 
         run.status = "success"
         db.commit()
 
         # pass counts directly into the tracker success path
         tracker.succeed(records_in=total, records_out=inserted)
+        RECORDS_DEDUPED.inc(deduped, pipeline="ingest")
 
         return IngestResult(
             # use the tracker run_id so all outputs/logs share the same run id
@@ -190,13 +606,32 @@ def ingest_files(db: Session, source: str, files: list[tuple[str, bytes]]) -> In
             inserted_records=inserted,
             deduped_records=deduped,
             per_file=per_file,
+            ingest_run_id=run.id,
+            rejected_records=rejected,
         )
 
     except Exception as e:
         tracker.fail(e)
         db.rollback()
-        run.status = "failed"
-        run.error = str(e)
-        db.add(run)
-        db.commit()
+        try:
+            # rollback expired `run`: it reloads with the last committed checkpoints
+            run.status = "failed"
+            run.error = str(e)
+            db.add(run)
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.warning("ingest_failed_status_not_saved", extra=run_ref, exc_info=True)
+            raise e from None
+        if inserted:
+            # batches committed before the failure stay (resume_run continues after
+            # them, a plain re-run dedupes them); keep daily_metrics in line with them.
+            # Best effort: the same DB error may strike again, the status is saved.
+            try:
+                refresh_daily_metrics(db, days_for_ingest_run(db, run.id))
+                bump_data_version(db)
+                db.commit()
+            except Exception:
+                db.rollback()
+                logger.warning("ingest_failed_metrics_refresh_failed", extra=run_ref, exc_info=True)
         raise
@@ -2,16 +2,29 @@ from fastapi import FastAPI
 
 from app.api.dashboard import router as dashboard_api_router
 from app.api.ingest import router as ingest_router
+from app.api.metrics import RequestMetricsMiddleware
+from app.api.metrics import router as metrics_router
+from app.api.runs import router as runs_router
+from app.db.session import async_pool_stats, max_connections, pool_stats
 from app.web.dashboard_page import router as dashboard_page_router
 
 app = FastAPI(title="ai-system-data-to-decision")
+app.add_middleware(RequestMetricsMiddleware)
 
 # Register routers
 app.include_router(ingest_router)
 app.include_router(dashboard_api_router)
 app.include_router(dashboard_page_router)
+app.include_router(metrics_router)
+app.include_router(runs_router)
 
 
 @app.get("/health")
 def health():
     return {"status": "ok"}
+
+
+@app.get("/health/pool")
+def health_pool():
+    # sync pool at the top level; max_connections covers both pools (DB_* + DB_ASYNC_*)
+    return {**pool_stats(), "async": async_pool_stats(), "max_connections": max_connections()}
@@ -1,16 +1,73 @@
 # app/observability/logging.py
 from __future__ import annotations
 
+import atexit
+import copy
 import json
 import logging
+import logging.handlers
+import os
+import queue
 import sys
+import threading
+import time
 from datetime import UTC, datetime
 
+from .metrics import REGISTRY
+
+try:  # optional fast path
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+# LogRecord attributes that are not structured extras (built once, not per record)
+RESERVED_ATTRS = frozenset(
+    {
+        "msg",
+        "args",
+        "levelname",
+        "levelno",
+        "name",
+        "pathname",
+        "filename",
+        "module",
+        "exc_info",
+        "exc_text",
+        "stack_info",
+        "lineno",
+        "funcName",
+        "created",
+        "msecs",
+        "relativeCreated",
+        "thread",
+        "threadName",
+        "processName",
+        "process",
+        "taskName",
+    }
+)
+
+DEFAULT_QUEUE_SIZE = 10_000
+DEFAULT_RATE_LIMIT_KEYS = 1024
+
+LOG_RECORDS_DROPPED = REGISTRY.counter(
+    "d2d_log_records_dropped_total",
+    "Log records dropped because the async log queue was full or rate-limited.",
+    ("reason",),
+)
+
+
+def _dumps(payload: dict) -> str:
+    if orjson is not None:
+        return orjson.dumps(payload, default=str).decode("utf-8")
+    return json.dumps(payload, ensure_ascii=False, default=str)
+
 
 class JsonFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:
         payload = {
-            "ts": datetime.now(UTC).isoformat(),
+            # time of the log call, not of formatting (which may happen on the listener thread)
+            "ts": datetime.fromtimestamp(record.created, UTC).isoformat(),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -18,37 +75,136 @@ class JsonFormatter(logging.Formatter):
 
         # include structured extras
         for k, v in record.__dict__.items():
-            if k in {
-                "msg",
-                "args",
-                "levelname",
-                "levelno",
-                "name",
-                "pathname",
-                "filename",
-                "module",
-                "exc_info",
-                "exc_text",
-                "stack_info",
-                "lineno",
-                "funcName",
-                "created",
-                "msecs",
-                "relativeCreated",
-                "thread",
-                "threadName",
-                "processName",
-                "process",
-            }:
-                continue
-            if k.startswith("_"):
+            if k in RESERVED_ATTRS or k.startswith("_"):
                 continue
             payload.setdefault(k, v)
 
         if record.exc_info:
             payload["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            # already rendered by AsyncQueueHandler.prepare on the calling thread
+            payload["exc_info"] = record.exc_text
+
+        return _dumps(payload)
+
+
+class RateLimitFilter(logging.Filter):
+    """Token bucket per (logger, message) for high-frequency INFO/DEBUG events.
+
+    Warnings and errors always pass. When a limited event passes again, it carries
+    `suppressed=<n>` with the number of records dropped since the last one. At most
+    `max_keys` buckets are kept; the least recently seen event is evicted first.
+    """
+
+    def __init__(
+        self,
+        per_second: float,
+        burst: int | None = None,
+        max_keys: int = DEFAULT_RATE_LIMIT_KEYS,
+    ):
+        super().__init__()
+        self.per_second = per_second
+        self.burst = burst or max(1, int(per_second))
+        self.max_keys = max(1, max_keys)
+        # key -> [tokens, last_refill, suppressed], least recently seen first
+        self._buckets: dict[tuple[str, object], list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+
+        key = (record.name, record.msg)
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.pop(key, None)
+            if bucket is None:
+                bucket = [float(self.burst), now, 0]
+                if len(self._buckets) >= self.max_keys:
+                    del self._buckets[next(iter(self._buckets))]
+            self._buckets[key] = bucket  # (re)inserted last: most recently seen
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.per_second)
+            bucket[1] = now
+            if tokens < 1:
+                bucket[0] = tokens
+                bucket[2] += 1
+                LOG_RECORDS_DROPPED.inc(reason="rate_limited")
+                return False
+            bucket[0] = tokens - 1
+            suppressed, bucket[2] = bucket[2], 0
+
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+
+class AsyncQueueHandler(logging.handlers.QueueHandler):
+    """Enqueue records without blocking; serialization + I/O happen on the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # only what must happen on the calling thread: merge args and render the
+        # traceback (frames can't outlive the caller). No JSON encoding here.
+        record = copy.copy(record)
+        # dict/list extras (e.g. a step's meta) may still be updated by the caller
+        # while the record waits in the queue: serialize a snapshot instead
+        for k, v in list(record.__dict__.items()):
+            if k not in RESERVED_ATTRS and isinstance(v, dict | list):
+                record.__dict__[k] = copy.copy(v)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc(reason="queue_full")
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    v = os.getenv(name)
+    if v is None:
+        return default
+    return v.strip().lower() in {"1", "true", "yes", "y", "on"}
+
+
+_handler: logging.Handler | None = None
+_listener: logging.handlers.QueueListener | None = None
+_handler_lock = threading.Lock()
+
+
+def _shared_handler() -> logging.Handler:
+    """One stdout handler per process (async by default, LOG_ASYNC=0 for sync)."""
+    global _handler, _listener
+    if _handler is not None:
+        return _handler
+
+    with _handler_lock:
+        if _handler is not None:
+            return _handler
+
+        stream = logging.StreamHandler(sys.stdout)
+        stream.setFormatter(JsonFormatter())
+
+        if _env_flag("LOG_ASYNC", True):
+            q: queue.Queue = queue.Queue(int(os.getenv("LOG_QUEUE_SIZE", DEFAULT_QUEUE_SIZE)))
+            handler: logging.Handler = AsyncQueueHandler(q)
+            _listener = logging.handlers.QueueListener(q, stream)
+            _listener.start()
+            # drain remaining records on exit
+            atexit.register(_listener.stop)
+        else:
+            handler = stream
+
+        rate = float(os.getenv("LOG_RATE_LIMIT_PER_SEC", "0") or 0)
+        if rate > 0:
+            handler.addFilter(RateLimitFilter(rate))
 
-        return json.dumps(payload, ensure_ascii=False)
+        _handler = handler
+        return _handler
 
 
 def get_logger(name: str = "d2d") -> logging.Logger:
@@ -57,8 +213,6 @@ def get_logger(name: str = "d2d") -> logging.Logger:
         return logger
 
     logger.setLevel(logging.INFO)
-    handler = logging.StreamHandler(sys.stdout)
-    handler.setFormatter(JsonFormatter())
-    logger.addHandler(handler)
+    logger.addHandler(_shared_handler())
     logger.propagate = False
     return logger
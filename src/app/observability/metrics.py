@@ -0,0 +1,235 @@
+# app/observability/metrics.py
+from __future__ import annotations
+
+import bisect
+import math
+import threading
+from collections.abc import Callable, Iterable
+
+# seconds; covers fast API calls through multi-minute pipeline steps
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+    300.0,
+)
+
+
+def _fmt(v: float) -> str:
+    if v == math.inf:
+        return "+Inf"
+    if float(v).is_integer():
+        return str(int(v))
+    return repr(float(v))
+
+
+def _escape(v: str) -> str:
+    return v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values, strict=True)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    """Base for per-thread accumulated metrics.
+
+    Each thread writes only to its own shard (no lock on the hot path); a lock is
+    taken once per thread to register the shard, and shards are summed on collect.
+    """
+
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: list[dict] = []
+        self._lock = threading.Lock()
+
+    def _shard(self) -> dict:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = {}
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+        return shard
+
+    def _key(self, labels: dict[str, object]) -> tuple[str, ...]:
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def _snapshot(self) -> list[dict]:
+        with self._lock:
+            shards = list(self._shards)
+        # dict copies are atomic under the GIL; values may be a few events stale
+        return [dict(s) for s in shards]
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._render_samples())
+        return lines
+
+    def _render_samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels: object) -> None:
+        shard = self._shard()
+        key = self._key(labels)
+        shard[key] = shard.get(key, 0) + amount
+
+    def value(self, **labels: object) -> float:
+        key = self._key(labels)
+        return sum(s.get(key, 0) for s in self._snapshot())
+
+    def _render_samples(self) -> list[str]:
+        totals: dict[tuple[str, ...], float] = {}
+        for shard in self._snapshot():
+            for key, v in shard.items():
+                totals[key] = totals.get(key, 0) + v
+        return [
+            f"{self.name}{_labels(self.labelnames, key)} {_fmt(v)}"
+            for key, v in sorted(totals.items())
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: object) -> None:
+        shard = self._shard()
+        key = self._key(labels)
+        state = shard.get(key)
+        if state is None:
+            # [per-bucket counts..., +Inf count, sum]
+            state = shard[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        state[bisect.bisect_left(self.buckets, value)] += 1
+        state[-1] += value
+
+    def count(self, **labels: object) -> int:
+        key = self._key(labels)
+        return sum(sum(s[key][:-1]) for s in self._snapshot() if key in s)
+
+    def _render_samples(self) -> list[str]:
+        totals: dict[tuple[str, ...], list[float]] = {}
+        for shard in self._snapshot():
+            for key, state in shard.items():
+                acc = totals.setdefault(key, [0] * len(state))
+                for i, v in enumerate(list(state)):
+                    acc[i] += v
+
+        lines: list[str] = []
+        for key, state in sorted(totals.items()):
+            cumulative = 0
+            for bound, n in zip((*self.buckets, math.inf), state[:-1], strict=True):
+                cumulative += n
+                le = f'le="{_fmt(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_labels(self.labelnames, key, le)} {_fmt(cumulative)}"
+                )
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_fmt(state[-1])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {_fmt(cumulative)}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Callable[[], list[str]]] = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))  # type: ignore[return-value]
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))  # type: ignore[return-value]
+
+    def register_collector(self, fn: Callable[[], list[str]]) -> None:
+        """Add a callback returning ready-made exposition lines (evaluated on scrape)."""
+        with self._lock:
+            self._collectors.append(fn)
+
+    def render(self) -> str:
+        """Prometheus text exposition format (0.0.4)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        lines: list[str] = []
+        for m in metrics:
+            lines.extend(m.render())
+        for fn in collectors:
+            lines.extend(fn())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+STEP_DURATION = REGISTRY.histogram(
+    "d2d_pipeline_step_duration_seconds",
+    "Pipeline step duration by pipeline, step and status.",
+    ("pipeline", "step", "status"),
+)
+RUN_DURATION = REGISTRY.histogram(
+    "d2d_pipeline_run_duration_seconds",
+    "Pipeline run duration by pipeline and final status.",
+    ("pipeline", "status"),
+)
+RECORDS_IN = REGISTRY.counter(
+    "d2d_pipeline_records_in_total", "Records read by pipeline runs.", ("pipeline",)
+)
+RECORDS_OUT = REGISTRY.counter(
+    "d2d_pipeline_records_out_total", "Records produced by pipeline runs.", ("pipeline",)
+)
+RECORDS_DEDUPED = REGISTRY.counter(
+    "d2d_pipeline_records_deduped_total",
+    "Records skipped as duplicates by pipeline runs.",
+    ("pipeline",),
+)
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    "d2d_http_request_duration_seconds",
+    "HTTP request latency by method, route template and status code.",
+    ("method", "route", "status"),
+)
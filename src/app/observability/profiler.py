@@ -0,0 +1,116 @@
+# app/observability/profiler.py
+from __future__ import annotations
+
+import cProfile
+import os
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+
+DEFAULT_PROFILE_DIR = "profiles"
+DEFAULT_SAMPLE_INTERVAL = 0.005
+MAX_STACK_DEPTH = 256
+
+
+def profile_mode(value: str | None = None) -> str | None:
+    """D2D_PROFILE: unset/0 = off, 1/cprofile = cProfile + sampler, sample = sampler only."""
+    v = (value if value is not None else os.getenv("D2D_PROFILE", "")).strip().lower()
+    if v in {"", "0", "false", "no", "off"}:
+        return None
+    if v == "sample":
+        return "sample"
+    return "cprofile"
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Samples one thread's Python stack at a fixed interval (collapsed-stack counts)."""
+
+    def __init__(self, thread_id: int, interval: float = DEFAULT_SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            labels = []
+            while frame is not None and len(labels) < MAX_STACK_DEPTH:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            if labels:
+                self.stacks[";".join(reversed(labels))] += 1
+
+    def write_collapsed(self, path: Path) -> None:
+        """One `frame;frame;... count` line per stack (flamegraph.pl / speedscope input)."""
+        with path.open("w", encoding="utf-8") as f:
+            for stack, n in self.stacks.most_common():
+                f.write(f"{stack} {n}\n")
+
+
+class RunProfiler:
+    """Profile the thread that runs a pipeline; writes <dir>/<pipeline>-<run_id>.*"""
+
+    def __init__(
+        self,
+        pipeline: str,
+        run_id: object,
+        mode: str = "cprofile",
+        out_dir: str | Path | None = None,
+        interval: float | None = None,
+    ):
+        self.mode = mode
+        self.out_dir = Path(out_dir or os.getenv("D2D_PROFILE_DIR", DEFAULT_PROFILE_DIR))
+        self.stem = f"{pipeline}-{run_id}"
+        self.interval = interval or float(
+            os.getenv("D2D_PROFILE_INTERVAL", DEFAULT_SAMPLE_INTERVAL)
+        )
+        self._cprofile: cProfile.Profile | None = None
+        self._sampler: StackSampler | None = None
+
+    def start(self) -> None:
+        if self.mode == "cprofile":
+            prof = cProfile.Profile()
+            try:
+                prof.enable()
+                self._cprofile = prof
+            except ValueError:
+                # another profiler is already active (e.g. an outer cProfile); keep sampling
+                self._cprofile = None
+        self._sampler = StackSampler(threading.get_ident(), self.interval)
+        self._sampler.start()
+
+    def stop(self) -> dict:
+        """Stop profiling, write the artifacts and return their paths for run meta."""
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        if self._sampler is not None:
+            self._sampler.stop()
+
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        out: dict = {"mode": self.mode}
+        if self._cprofile is not None:
+            pstats_path = self.out_dir / f"{self.stem}.pstats"
+            self._cprofile.dump_stats(str(pstats_path))
+            out["pstats"] = str(pstats_path)
+        if self._sampler is not None:
+            collapsed_path = self.out_dir / f"{self.stem}.collapsed.txt"
+            self._sampler.write_collapsed(collapsed_path)
+            out["collapsed"] = str(collapsed_path)
+            out["samples"] = sum(self._sampler.stacks.values())
+            out["sample_interval_ms"] = self.interval * 1000
+        return out
@@ -6,10 +6,14 @@ import uuid
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 
-from sqlalchemy.orm import Session
-
 from app.db.models import PipelineRun
 
+from . import run_writer
+from .metrics import RECORDS_IN, RECORDS_OUT, RUN_DURATION, STEP_DURATION
+from .profiler import RunProfiler, profile_mode
+from .run_writer import RunWriter
+from .step_profile import StepProfiler, step_profile_mode
+
 
 @dataclass
 class StepInfo:
@@ -17,26 +21,44 @@ class StepInfo:
     status: str
     duration_ms: int
     meta: dict = field(default_factory=dict)
+    # resource usage when step profiling is on (see step_profile.StepProfiler)
+    profile: dict | None = None
+
+    def as_dict(self) -> dict:
+        # copy meta: the writer thread serializes it after the step has moved on
+        d = {**self.__dict__, "meta": dict(self.meta)}
+        if self.profile is None:
+            del d["profile"]
+        return d
 
 
 class StepTimer:
-    def __init__(self, tracker: RunTracker, step: str, meta: dict | None = None):
+    def __init__(
+        self, tracker: RunTracker, step: str, meta: dict | None = None, quiet: bool = False
+    ):
         self.tracker = tracker
         self.step = step
         self.meta = meta or {}
+        self.quiet = quiet
         self._t0 = 0.0
+        mode = tracker.profile_steps
+        self._profiler = StepProfiler(mode) if mode else None
 
     def __enter__(self):
+        if self._profiler is not None:
+            self._profiler.start()
         self._t0 = time.perf_counter()
-        self.tracker.log("step_started", step=self.step, status="running", meta=self.meta)
+        if not self.quiet:
+            self.tracker.log("step_started", step=self.step, status="running", meta=self.meta)
         return self
 
     def __exit__(self, exc_type, exc, tb):
         dt_ms = int((time.perf_counter() - self._t0) * 1000)
+        profile = self._profiler.stop(self.meta) if self._profiler is not None else None
 
         if exc is not None:
-            self.tracker.steps.append(
-                StepInfo(self.step, "failed", dt_ms, {"error": str(exc), **self.meta})
+            self.tracker.add_step(
+                StepInfo(self.step, "failed", dt_ms, {"error": str(exc), **self.meta}, profile)
             )
             self.tracker.log(
                 "step_failed",
@@ -48,30 +70,47 @@ class StepTimer:
             )
             return False
 
-        self.tracker.steps.append(StepInfo(self.step, "ok", dt_ms, self.meta))
-        self.tracker.log("step_succeeded", step=self.step, status="ok", duration_ms=dt_ms)
+        self.tracker.add_step(StepInfo(self.step, "ok", dt_ms, self.meta, profile))
+        if not self.quiet:
+            self.tracker.log("step_succeeded", step=self.step, status="ok", duration_ms=dt_ms)
         return False
 
 
 class RunTracker:
+    """Run lifecycle for one pipeline execution, persisted to pipeline_runs.
+
+    Persistence goes through a RunWriter (own sessions, background thread), so the
+    tracker is isolated from the pipeline's data transaction: it never flushes,
+    commits or rolls back the caller's Session. succeed()/fail() wait for the
+    queued events to land so the final status is durable when they return.
+
+    profile_steps ("rss" / "tracemalloc", default from D2D_STEP_PROFILE) adds CPU,
+    memory and SQL statement stats to every step under steps[].profile.
+    D2D_PROFILE wraps the whole run in a profiler (see profiler.RunProfiler); the
+    artifact paths are recorded in meta["profile"].
+    """
+
     def __init__(
         self,
-        db: Session,
         logger,
         pipeline: str,
         input_ref: str | None = None,
         meta: dict | None = None,
+        writer: RunWriter | None = None,
+        profile_steps: str | None = None,
     ):
-        self.db = db
         self.logger = logger
         self.pipeline = pipeline
         self.input_ref = input_ref
         self.meta = meta or {}
+        self.writer = writer or run_writer.get_run_writer()
+        self.profile_steps = profile_steps or step_profile_mode()
 
         self.run_id = uuid.uuid4()
         self.started_at = datetime.now(UTC)
         self.steps: list[StepInfo] = []
 
+        # in-memory mirror of the persisted row (never attached to a Session)
         self.row = PipelineRun(
             id=self.run_id,
             pipeline=pipeline,
@@ -81,13 +120,36 @@ class RunTracker:
             meta=self.meta,
             steps=[],
         )
-        db.add(self.row)
-        db.flush()
+        self.writer.insert(
+            self.run_id,
+            {
+                "pipeline": pipeline,
+                "status": "running",
+                "started_at": self.started_at,
+                "input_ref": input_ref,
+                "meta": dict(self.meta),
+                "steps": [],
+            },
+        )
 
         self.log("run_started", status="running")
 
-    def step(self, name: str, meta: dict | None = None) -> StepTimer:
-        return StepTimer(self, name, meta=meta)
+        self.profiler: RunProfiler | None = None
+        mode = profile_mode()
+        if mode:
+            self.profiler = RunProfiler(pipeline, self.run_id, mode=mode)
+            self.profiler.start()
+
+    def step(self, name: str, meta: dict | None = None, quiet: bool = False) -> StepTimer:
+        """Time a step. quiet=True skips started/succeeded log lines (per-batch steps)."""
+        return StepTimer(self, name, meta=meta, quiet=quiet)
+
+    def add_step(self, info: StepInfo) -> None:
+        self.steps.append(info)
+        self.writer.append_steps(self.run_id, [info.as_dict()])
+        STEP_DURATION.observe(
+            info.duration_ms / 1000, pipeline=self.pipeline, step=info.step, status=info.status
+        )
 
     def log(self, message: str, **fields):
         self.logger.info(
@@ -102,60 +164,83 @@ class RunTracker:
     def set_counts(self, records_in: int | None = None, records_out: int | None = None) -> None:
         """Set optional input/output counts on the persisted run row.
 
-        This flushes the change so other sessions can see the values before final commit.
+        Queued like every other tracking write; visible to other sessions once applied.
         """
+        values = {}
         if records_in is not None:
-            self.row.records_in = records_in
+            self.row.records_in = values["records_in"] = records_in
         if records_out is not None:
-            self.row.records_out = records_out
-        # persist the partial update without committing the whole run lifecycle
-        self.db.add(self.row)
+            self.row.records_out = values["records_out"] = records_out
+        if values:
+            self.writer.update(self.run_id, values)
+
+    def _stop_profiler(self) -> None:
+        if self.profiler is None:
+            return
+        profiler, self.profiler = self.profiler, None
         try:
-            self.db.flush()
-        except Exception:
-            # don't raise here; counts are best-effort and shouldn't break the pipeline
-            self.db.rollback()
+            artifacts = profiler.stop()
+        except OSError as exc:
+            # never fail a pipeline because the profile could not be written
+            self.logger.warning("profile_write_failed", extra={"error_message": str(exc)})
+            return
+        self.row.meta = {**(self.row.meta or {}), "profile": artifacts}
+        self.log("profile_written", **artifacts)
+
+    def _finish(self, values: dict) -> None:
+        self._stop_profiler()
+        self.row.steps = [s.as_dict() for s in self.steps]
+        for k, v in values.items():
+            setattr(self.row, k, v)
+        self.writer.update(self.run_id, {**values, "meta": dict(self.row.meta or {})})
+        self.writer.flush()
+
+        RUN_DURATION.observe(
+            values["duration_ms"] / 1000, pipeline=self.pipeline, status=values["status"]
+        )
+        if self.row.records_in is not None:
+            RECORDS_IN.inc(self.row.records_in, pipeline=self.pipeline)
+        if self.row.records_out is not None:
+            RECORDS_OUT.inc(self.row.records_out, pipeline=self.pipeline)
 
     def succeed(self, records_in: int | None = None, records_out: int | None = None):
         finished_at = datetime.now(UTC)
         duration_ms = int((finished_at - self.started_at).total_seconds() * 1000)
 
-        self.row.status = "succeeded"
-        self.row.finished_at = finished_at
-        self.row.duration_ms = duration_ms
-        # ensure error_summary is null on success
-        self.row.error_summary = None
+        values = {
+            "status": "succeeded",
+            "finished_at": finished_at,
+            "duration_ms": duration_ms,
+            # ensure error_summary is null on success
+            "error_summary": None,
+        }
         if records_in is not None:
-            self.row.records_in = records_in
+            values["records_in"] = records_in
         if records_out is not None:
-            self.row.records_out = records_out
-        self.row.steps = [s.__dict__ for s in self.steps]
-        self.db.add(self.row)
-        self.db.commit()
+            values["records_out"] = records_out
+        self._finish(values)
 
         self.log("run_succeeded", status="succeeded", duration_ms=duration_ms)
 
     def fail(self, exc: Exception, records_in: int | None = None, records_out: int | None = None):
+        """Persist the failed status. Rolling back the data work is the caller's job."""
         finished_at = datetime.now(UTC)
         duration_ms = int((finished_at - self.started_at).total_seconds() * 1000)
 
-        # IMPORTANT: rollback whatever work failed, but still persist run status
-        self.db.rollback()
-
-        self.row.status = "failed"
-        self.row.finished_at = finished_at
-        self.row.duration_ms = duration_ms
+        values = {
+            "status": "failed",
+            "finished_at": finished_at,
+            "duration_ms": duration_ms,
+            "error_type": type(exc).__name__,
+            "error_message": str(exc),
+            # set a concise error summary (nullable guidance)
+            "error_summary": str(exc),
+        }
         if records_in is not None:
-            self.row.records_in = records_in
+            values["records_in"] = records_in
         if records_out is not None:
-            self.row.records_out = records_out
-        self.row.error_type = type(exc).__name__
-        self.row.error_message = str(exc)
-        # set a concise error summary (nullable guidance)
-        self.row.error_summary = str(exc)
-        self.row.steps = [s.__dict__ for s in self.steps]
-        self.db.add(self.row)
-        self.db.commit()
+            values["records_out"] = records_out
+        self._finish(values)
 
         self.log(
             "run_failed",
@@ -0,0 +1,209 @@
+# app/observability/run_writer.py
+from __future__ import annotations
+
+import atexit
+import logging
+import queue
+import threading
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Session
+
+from app.db.models import PipelineRun
+
+_log = logging.getLogger(__name__)
+
+# max queued events applied per DB transaction
+DEFAULT_MAX_BATCH = 500
+
+
+@dataclass
+class _Op:
+    kind: str  # insert | update | append_steps | flush
+    run_id: uuid.UUID | None = None
+    values: dict[str, Any] = field(default_factory=dict)
+    steps: list[dict] = field(default_factory=list)
+    done: threading.Event | None = None
+
+
+def _coalesce(ops: list[_Op]) -> tuple[list[_Op], list[threading.Event]]:
+    """Fold a batch of events into at most one statement per run.
+
+    insert + later updates/steps for the same run become a single INSERT;
+    updates + step appends for an existing run become a single UPDATE.
+    """
+    acc: dict[uuid.UUID, _Op] = {}
+    order: list[_Op] = []
+    flushes: list[threading.Event] = []
+
+    for op in ops:
+        if op.kind == "flush":
+            if op.done is not None:
+                flushes.append(op.done)
+            continue
+
+        cur = acc.get(op.run_id)
+        if op.kind == "insert":
+            cur = _Op("insert", op.run_id, dict(op.values), list(op.steps))
+            acc[op.run_id] = cur
+            order.append(cur)
+            continue
+        if cur is None:
+            cur = _Op("update", op.run_id)
+            acc[op.run_id] = cur
+            order.append(cur)
+
+        if op.kind == "update":
+            cur.values.update(op.values)
+        else:
+            cur.steps.extend(op.steps)
+
+    return order, flushes
+
+
+def _default_session_factory() -> Session:
+    # imported lazily so unit tests can use RunTracker without DATABASE_URL
+    from app.db.session import SessionLocal
+
+    return SessionLocal()
+
+
+class RunWriter:
+    """Asynchronous writer for pipeline_runs.
+
+    Run-tracking events are queued by the calling thread and applied by a
+    background thread in short-lived sessions of their own, so tracking never
+    flushes, commits or rolls back the pipeline's data transaction.
+    Steps are appended to the JSONB list (steps || new) instead of rewriting it.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] | None = None,
+        *,
+        max_batch: int = DEFAULT_MAX_BATCH,
+    ):
+        self._session_factory = session_factory or _default_session_factory
+        self._max_batch = max_batch
+        self._queue: queue.SimpleQueue[_Op] = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    # --- producer side (pipeline threads) ----------------------------------
+
+    def insert(self, run_id: uuid.UUID, values: dict[str, Any]) -> None:
+        self._submit(_Op("insert", run_id, values=dict(values)))
+
+    def update(self, run_id: uuid.UUID, values: dict[str, Any]) -> None:
+        self._submit(_Op("update", run_id, values=dict(values)))
+
+    def append_steps(self, run_id: uuid.UUID, steps: list[dict]) -> None:
+        self._submit(_Op("append_steps", run_id, steps=list(steps)))
+
+    def flush(self, timeout: float | None = 10.0) -> bool:
+        """Block until everything queued so far is committed (or dropped on error)."""
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        self._queue.put(_Op("flush", done=done))
+        return done.wait(timeout)
+
+    def _submit(self, op: _Op) -> None:
+        if self._thread is None:
+            self._start()
+        self._queue.put(op)
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="run-writer", daemon=True)
+            self._thread.start()
+
+    # --- consumer side (writer thread) -------------------------------------
+
+    def _run(self) -> None:
+        while True:
+            ops = [self._queue.get()]
+            while len(ops) < self._max_batch:
+                try:
+                    ops.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            order, flushes = _coalesce(ops)
+            try:
+                if order:
+                    self._apply_batch(order)
+            finally:
+                for done in flushes:
+                    done.set()
+
+    def _apply_batch(self, order: list[_Op]) -> None:
+        """One transaction for the batch; on failure, retry run by run.
+
+        Tracking is best-effort and never breaks (or blocks) the pipeline, but one
+        bad run (e.g. step meta that isn't JSON-serializable) only loses its own
+        events, not those of the other runs coalesced into the batch.
+        """
+        try:
+            self._apply(order)
+            return
+        except Exception:
+            if len(order) == 1:
+                _log.warning(
+                    "pipeline_runs write failed; dropped events of run %s",
+                    order[0].run_id,
+                    exc_info=True,
+                )
+                return
+        for op in order:
+            try:
+                self._apply([op])
+            except Exception:
+                _log.warning(
+                    "pipeline_runs write failed; dropped events of run %s",
+                    op.run_id,
+                    exc_info=True,
+                )
+
+    def _apply(self, order: list[_Op]) -> None:
+        t = PipelineRun.__table__
+        with self._session_factory() as s:
+            try:
+                for op in order:
+                    if op.kind == "insert":
+                        values = dict(op.values)
+                        values["steps"] = list(values.get("steps") or []) + op.steps
+                        s.execute(sa.insert(t).values(id=op.run_id, **values))
+                        continue
+
+                    values = dict(op.values)
+                    if op.steps:
+                        values["steps"] = t.c.steps.op("||")(sa.literal(op.steps, JSONB))
+                    if values:
+                        s.execute(sa.update(t).where(t.c.id == op.run_id).values(**values))
+                s.commit()
+            except Exception:
+                s.rollback()
+                raise
+
+
+_writer: RunWriter | None = None
+_writer_lock = threading.Lock()
+
+
+def get_run_writer() -> RunWriter:
+    """Process-wide RunWriter (drained at interpreter exit)."""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = RunWriter()
+                atexit.register(_writer.flush)
+    return _writer
@@ -0,0 +1,135 @@
+# app/observability/step_profile.py
+from __future__ import annotations
+
+import os
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# meta keys that describe how many rows a step handled (first match wins)
+ROW_COUNT_KEYS = ("rows_written", "row_count", "record_count", "flagged_count", "rows")
+
+_local = threading.local()
+_hooks_installed = False
+_hooks_lock = threading.Lock()
+
+
+def step_profile_mode(value: str | None = None) -> str | None:
+    """D2D_STEP_PROFILE: unset/0 = off, 1/rss = cpu+rss+sql, tracemalloc = also Python heap peak."""
+    v = (value if value is not None else os.getenv("D2D_STEP_PROFILE", "")).strip().lower()
+    if v in {"", "0", "false", "no", "off"}:
+        return None
+    if v == "tracemalloc":
+        return "tracemalloc"
+    return "rss"
+
+
+class _SqlStats:
+    __slots__ = ("statements", "seconds")
+
+    def __init__(self) -> None:
+        self.statements = 0
+        self.seconds = 0.0
+
+
+def _active() -> list[_SqlStats]:
+    stack = getattr(_local, "active", None)
+    if stack is None:
+        stack = _local.active = []
+    return stack
+
+
+# The start time lives on the statement's execution context, not on the connection:
+# a statement that raises never reaches after_cursor_execute, and its start would
+# otherwise be paired with a later statement on the same pooled connection.
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and getattr(_local, "active", None):
+        context._d2d_t0 = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stack = getattr(_local, "active", None)
+    if not stack:
+        return
+    t0 = getattr(context, "_d2d_t0", None)
+    if t0 is None:
+        return
+    dt = time.perf_counter() - t0
+    for stats in stack:
+        stats.statements += 1
+        stats.seconds += dt
+
+
+def install_sql_hooks() -> None:
+    """Count statements on every Engine; no-op cost unless a profiled step is active."""
+    global _hooks_installed
+    if _hooks_installed:
+        return
+    with _hooks_lock:
+        if _hooks_installed:
+            return
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        _hooks_installed = True
+
+
+def _max_rss_kb() -> int:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+class StepProfiler:
+    """Resource usage of one step.
+
+    cpu_ms is process CPU time (all threads); SQL stats only count statements
+    issued from the thread that runs the step.
+    """
+
+    def __init__(self, mode: str = "rss"):
+        self.mode = mode
+        self._sql = _SqlStats()
+        self._started_tracemalloc = False
+
+    def start(self) -> None:
+        install_sql_hooks()
+        _active().append(self._sql)
+        if self.mode == "tracemalloc":
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracemalloc = True
+            tracemalloc.reset_peak()
+        self._rss0 = _max_rss_kb()
+        self._cpu0 = time.process_time()
+        self._wall0 = time.perf_counter()
+
+    def stop(self, meta: dict | None = None) -> dict:
+        wall = time.perf_counter() - self._wall0
+        cpu = time.process_time() - self._cpu0
+        stack = _active()
+        if self._sql in stack:
+            stack.remove(self._sql)
+
+        out = {
+            "cpu_ms": int(cpu * 1000),
+            "cpu_util": round(cpu / wall, 3) if wall > 0 else None,
+            "max_rss_delta_kb": max(0, _max_rss_kb() - self._rss0),
+            "sql_statements": self._sql.statements,
+            "sql_ms": int(self._sql.seconds * 1000),
+        }
+        if self.mode == "tracemalloc":
+            out["py_heap_peak_kb"] = tracemalloc.get_traced_memory()[1] // 1024
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+
+        for key in ROW_COUNT_KEYS:
+            rows = (meta or {}).get(key)
+            if isinstance(rows, int) and not isinstance(rows, bool):
+                out["rows_per_sec"] = round(rows / max(wall, 1e-6), 1)
+                break
+        return out
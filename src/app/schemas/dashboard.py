@@ -7,10 +7,12 @@ from pydantic import BaseModel, Field
 class MonthlySummaryRow(BaseModel):
     month_start: date
     total_records: int
-    distinct_records: int
-    distinct_source_ids: int
-    distinct_sources: int
-    distinct_categories: int
+    # distinct_* are null and value_sum is set for source/category slices
+    distinct_records: int | None = None
+    distinct_source_ids: int | None = None
+    distinct_sources: int | None = None
+    distinct_categories: int | None = None
+    value_sum: float | None = None
 
 
 class TrendPoint(BaseModel):
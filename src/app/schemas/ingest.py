@@ -0,0 +1,22 @@
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, field_validator
+
+
+class IngestRunStatus(BaseModel):
+    run_id: UUID
+    created_at: datetime
+    source: str
+    status: str
+    files: list[str]
+    error: str | None
+    record_count: int
+    # filename -> {"rows", "offset", "done"}; see ingestion.service.resume_run
+    checkpoints: dict[str, dict] | None = None
+
+    @field_validator("files", mode="before")
+    @classmethod
+    def _split_files(cls, v):
+        # ingest_runs.files is newline-separated
+        return [f for f in v.splitlines() if f] if isinstance(v, str) else v
@@ -0,0 +1,52 @@
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class RunRow(BaseModel):
+    run_id: UUID
+    pipeline: str
+    status: str
+    started_at: datetime
+    finished_at: datetime | None
+    duration_ms: int | None
+    records_in: int | None
+    records_out: int | None
+    error_summary: str | None
+
+
+class RunStatsRow(BaseModel):
+    pipeline: str
+    bucket_start: datetime
+    runs: int
+    p50_ms: float | None
+    p95_ms: float | None
+    p99_ms: float | None
+    records_in_per_sec: float | None
+    records_out_per_sec: float | None
+
+
+class StepStatsRow(BaseModel):
+    step: str
+    bucket_start: datetime
+    samples: int
+    p50_ms: float | None
+    p95_ms: float | None
+    p99_ms: float | None
+
+
+class StepRegression(BaseModel):
+    step: str
+    run_id: UUID
+    started_at: datetime
+    duration_ms: int
+    baseline_ms: float
+    ratio: float
+
+
+class RegressionResponse(BaseModel):
+    pipeline: str
+    factor: float
+    window: int
+    regressions: list[StepRegression]
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
-from datetime import date
+from collections.abc import Mapping, Sequence
+from datetime import date, timedelta
 from typing import Literal
 
 from sqlalchemy import text
 from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.transform import hll
 
 Metric = Literal[
     "total_records",
@@ -16,8 +20,8 @@ Metric = Literal[
 Granularity = Literal["day", "week", "month"]
 
 
-def fetch_monthly_summary(conn: Connection, start: date | None, end: date | None):
-    sql = """
+MONTHLY_SUMMARY_SQL = text(
+    """
     SELECT
       month_start,
       total_records,
@@ -30,22 +34,32 @@ def fetch_monthly_summary(conn: Connection, start: date | None, end: date | None
       AND (CAST(:end AS date) IS NULL OR month_start < CAST(:end AS date))
     ORDER BY month_start;
     """
-    return conn.execute(text(sql), {"start": start, "end": end}).mappings().all()
+)
 
 
-def fetch_trend(conn: Connection, start: date, end: date, granularity: Granularity, metric: Metric):
-    # Trend view is powered by summary.daily_metrics (created in Week 06 migration)
-    # We re-bucket daily into day/week/month based on requested granularity.
+def fetch_monthly_summary(conn: Connection, start: date | None, end: date | None):
+    return conn.execute(MONTHLY_SUMMARY_SQL, {"start": start, "end": end}).mappings().all()
+
+
+async def fetch_monthly_summary_async(conn: AsyncConnection, start: date | None, end: date | None):
+    result = await conn.execute(MONTHLY_SUMMARY_SQL, {"start": start, "end": end})
+    return result.mappings().all()
+
+
+def _bucket_expr(granularity: Granularity) -> str:
     if granularity == "day":
-        bucket = "day_date"
-    elif granularity == "week":
-        bucket = "date_trunc('week', day_date)::date"
-    else:
-        bucket = "date_trunc('month', day_date)::date"
+        return "day_date"
+    if granularity == "week":
+        return "date_trunc('week', day_date)::date"
+    return "date_trunc('month', day_date)::date"
 
+
+def _trend_sql(granularity: Granularity, metric: Metric):
+    # Trend view is powered by summary.daily_metrics (created in Week 06 migration)
+    # We re-bucket daily into day/week/month based on requested granularity.
     sql = f"""
     SELECT
-      {bucket} AS bucket_start,
+      {_bucket_expr(granularity)} AS bucket_start,
       SUM({metric})::bigint AS value
     FROM summary.daily_metrics
     WHERE day_date >= :start
@@ -53,4 +67,230 @@ def fetch_trend(conn: Connection, start: date, end: date, granularity: Granulari
     GROUP BY 1
     ORDER BY 1;
     """
-    return conn.execute(text(sql), {"start": start, "end": end}).mappings().all()
+    return text(sql)
+
+
+# distinct metrics can't be summed across days; weeks/months merge the daily
+# HyperLogLog sketches instead (summary.daily_metrics.hll_*, see transform/hll.py)
+SKETCH_COLUMNS: dict[str, str] = {
+    "distinct_records": "hll_records",
+    "distinct_source_ids": "hll_source_ids",
+    "distinct_sources": "hll_sources",
+    "distinct_categories": "hll_categories",
+}
+
+# exact fallback for buckets with days that have no sketch yet (same definitions as
+# the daily rollup, read from raw_records by event_time range)
+_EXACT_DISTINCT_EXPR: dict[str, str] = {
+    "distinct_records": "(source, record_hash)",
+    "distinct_source_ids": "source_id",
+    "distinct_sources": "source",
+    "distinct_categories": "category",
+}
+
+
+def _uses_sketches(granularity: Granularity, metric: Metric) -> bool:
+    return granularity != "day" and metric in SKETCH_COLUMNS
+
+
+def _sketch_sql(metric: Metric):
+    return text(
+        f"""
+        SELECT day_date, {SKETCH_COLUMNS[metric]} AS sketch
+        FROM summary.daily_metrics
+        WHERE day_date >= :start
+          AND day_date < :end
+        ORDER BY day_date;
+        """
+    )
+
+
+def _exact_distinct_sql(metric: Metric):
+    return text(
+        f"""
+        SELECT count(DISTINCT {_EXACT_DISTINCT_EXPR[metric]})
+        FROM public.raw_records
+        WHERE event_time >= CAST(:lo AS date)::timestamptz
+          AND event_time < CAST(:hi AS date)::timestamptz;
+        """
+    )
+
+
+def bucket_start(day: date, granularity: Granularity) -> date:
+    """Python twin of date_trunc(granularity, day) (ISO weeks start on Monday)."""
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+def bucket_range(b: date, granularity: Granularity, start: date, end: date) -> tuple[date, date]:
+    """[lo, hi) of bucket `b`, clipped to the requested [start, end)."""
+    if granularity == "week":
+        nxt = b + timedelta(days=7)
+    else:
+        nxt = (b.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return max(b, start), min(nxt, end)
+
+
+def merge_sketch_trend(rows: Sequence[Mapping], granularity: Granularity) -> dict[date, int | None]:
+    """Distinct estimate per bucket from daily sketches; None when a day lacks one."""
+    buckets: dict[date, list[bytes | None]] = {}
+    for r in rows:
+        buckets.setdefault(bucket_start(r["day_date"], granularity), []).append(r["sketch"])
+    out: dict[date, int | None] = {}
+    for b, sketches in buckets.items():
+        if any(s is None for s in sketches):
+            out[b] = None
+        else:
+            out[b] = round(hll.estimate(hll.merge(bytes(s) for s in sketches)))
+    return out
+
+
+def _points(values: dict[date, int | None]) -> list[dict]:
+    return [{"bucket_start": b, "value": v} for b, v in sorted(values.items())]
+
+
+def fetch_trend(conn: Connection, start: date, end: date, granularity: Granularity, metric: Metric):
+    params = {"start": start, "end": end}
+    if not _uses_sketches(granularity, metric):
+        return conn.execute(_trend_sql(granularity, metric), params).mappings().all()
+
+    values = merge_sketch_trend(
+        conn.execute(_sketch_sql(metric), params).mappings().all(), granularity
+    )
+    for b, v in values.items():
+        if v is None:
+            lo, hi = bucket_range(b, granularity, start, end)
+            values[b] = conn.execute(_exact_distinct_sql(metric), {"lo": lo, "hi": hi}).scalar()
+    return _points(values)
+
+
+async def fetch_trend_async(
+    conn: AsyncConnection, start: date, end: date, granularity: Granularity, metric: Metric
+):
+    params = {"start": start, "end": end}
+    if not _uses_sketches(granularity, metric):
+        result = await conn.execute(_trend_sql(granularity, metric), params)
+        return result.mappings().all()
+
+    result = await conn.execute(_sketch_sql(metric), params)
+    values = merge_sketch_trend(result.mappings().all(), granularity)
+    for b, v in values.items():
+        if v is None:
+            lo, hi = bucket_range(b, granularity, start, end)
+            exact = await conn.execute(_exact_distinct_sql(metric), {"lo": lo, "hi": hi})
+            values[b] = exact.scalar()
+    return _points(values)
+
+
+def _rollup_where(source: str | None, category: str | None) -> tuple[str, dict]:
+    """Only the given filters, so the planner can pick the matching covering index."""
+    clauses, params = [], {}
+    if source is not None:
+        clauses.append("source = :source")
+        params["source"] = source
+    if category is not None:
+        clauses.append("category = :category")
+        params["category"] = category
+    return "".join(f"\n      AND {c}" for c in clauses), params
+
+
+def month_day_bounds(start: date | None, end: date | None) -> tuple[date | None, date | None]:
+    """Day range covering the months with start <= month_start < end."""
+
+    def next_month(d: date) -> date:
+        return (d.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+    lo = start if start is None or start.day == 1 else next_month(start)
+    hi = end if end is None or end.day == 1 else next_month(end)
+    return lo, hi
+
+
+# Filtered slices come from summary.daily_rollup (clean.clean_records grouped by
+# day x source x category). Only additive measures exist there, so no distinct_*.
+def _rollup_monthly_sql(source: str | None, category: str | None):
+    where, params = _rollup_where(source, category)
+    sql = f"""
+    SELECT
+      date_trunc('month', day_date)::date AS month_start,
+      SUM(record_count)::bigint AS total_records,
+      SUM(value_sum) AS value_sum
+    FROM summary.daily_rollup
+    WHERE (CAST(:lo AS date) IS NULL OR day_date >= CAST(:lo AS date))
+      AND (CAST(:hi AS date) IS NULL OR day_date < CAST(:hi AS date)){where}
+    GROUP BY 1
+    ORDER BY 1;
+    """
+    return text(sql), params
+
+
+def _monthly_rollup_params(start, end, source, category):
+    stmt, params = _rollup_monthly_sql(source, category)
+    lo, hi = month_day_bounds(start, end)
+    return stmt, {**params, "lo": lo, "hi": hi}
+
+
+def fetch_monthly_rollup(
+    conn: Connection,
+    start: date | None,
+    end: date | None,
+    source: str | None = None,
+    category: str | None = None,
+):
+    stmt, params = _monthly_rollup_params(start, end, source, category)
+    return conn.execute(stmt, params).mappings().all()
+
+
+async def fetch_monthly_rollup_async(
+    conn: AsyncConnection,
+    start: date | None,
+    end: date | None,
+    source: str | None = None,
+    category: str | None = None,
+):
+    stmt, params = _monthly_rollup_params(start, end, source, category)
+    result = await conn.execute(stmt, params)
+    return result.mappings().all()
+
+
+def _rollup_trend_sql(granularity: Granularity, source: str | None, category: str | None):
+    where, params = _rollup_where(source, category)
+    sql = f"""
+    SELECT
+      {_bucket_expr(granularity)} AS bucket_start,
+      SUM(record_count)::bigint AS value
+    FROM summary.daily_rollup
+    WHERE day_date >= :start
+      AND day_date < :end{where}
+    GROUP BY 1
+    ORDER BY 1;
+    """
+    return text(sql), params
+
+
+def fetch_trend_rollup(
+    conn: Connection,
+    start: date,
+    end: date,
+    granularity: Granularity,
+    source: str | None = None,
+    category: str | None = None,
+):
+    """total_records per bucket for a source/category slice."""
+    stmt, params = _rollup_trend_sql(granularity, source, category)
+    return conn.execute(stmt, {**params, "start": start, "end": end}).mappings().all()
+
+
+async def fetch_trend_rollup_async(
+    conn: AsyncConnection,
+    start: date,
+    end: date,
+    granularity: Granularity,
+    source: str | None = None,
+    category: str | None = None,
+):
+    stmt, params = _rollup_trend_sql(granularity, source, category)
+    result = await conn.execute(stmt, {**params, "start": start, "end": end})
+    return result.mappings().all()
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import uuid
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+# record_count uses ix_raw_records_run_id
+_RUN_COLUMNS = """
+  r.id AS run_id,
+  r.created_at,
+  r.source,
+  r.status,
+  r.files,
+  r.error,
+  r.checkpoints,
+  (SELECT count(*) FROM raw_records rr WHERE rr.run_id = r.id) AS record_count
+"""
+
+INGEST_RUN_SQL = text(f"SELECT {_RUN_COLUMNS} FROM ingest_runs r WHERE r.id = :run_id")
+
+RECENT_INGEST_RUNS_SQL = text(
+    f"""
+    SELECT {_RUN_COLUMNS}
+    FROM ingest_runs r
+    WHERE (CAST(:source AS text) IS NULL OR r.source = CAST(:source AS text))
+    ORDER BY r.created_at DESC
+    LIMIT :limit
+    """
+)
+
+
+async def fetch_ingest_run(conn: AsyncConnection, run_id: uuid.UUID):
+    result = await conn.execute(INGEST_RUN_SQL, {"run_id": run_id})
+    return result.mappings().one_or_none()
+
+
+async def fetch_recent_ingest_runs(conn: AsyncConnection, source: str | None, limit: int):
+    result = await conn.execute(RECENT_INGEST_RUNS_SQL, {"source": source, "limit": limit})
+    return result.mappings().all()
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import json
+import statistics
+from collections import defaultdict
+from collections.abc import Iterable, Mapping
+from datetime import datetime
+from typing import Literal
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+Bucket = Literal["hour", "day", "week"]
+
+
+def fetch_recent_runs(conn: Connection, pipeline: str | None, status: str | None, limit: int):
+    # served by ix_pipeline_runs_pipeline_started_at when a pipeline is given
+    sql = """
+    SELECT id AS run_id, pipeline, status, started_at, finished_at, duration_ms,
+           records_in, records_out, error_summary
+    FROM pipeline_runs
+    WHERE (CAST(:pipeline AS text) IS NULL OR pipeline = CAST(:pipeline AS text))
+      AND (CAST(:status AS text) IS NULL OR status = CAST(:status AS text))
+    ORDER BY started_at DESC
+    LIMIT :limit;
+    """
+    params = {"pipeline": pipeline, "status": status, "limit": limit}
+    return conn.execute(text(sql), params).mappings().all()
+
+
+def fetch_run_stats(conn: Connection, since: datetime, bucket: Bucket, pipeline: str | None):
+    """Duration percentiles and throughput of succeeded runs per pipeline and time bucket."""
+    sql = """
+    SELECT
+      pipeline,
+      date_trunc(:bucket, started_at) AS bucket_start,
+      count(*) AS runs,
+      percentile_cont(0.50) WITHIN GROUP (ORDER BY duration_ms) AS p50_ms,
+      percentile_cont(0.95) WITHIN GROUP (ORDER BY duration_ms) AS p95_ms,
+      percentile_cont(0.99) WITHIN GROUP (ORDER BY duration_ms) AS p99_ms,
+      sum(records_in)::float8 * 1000 / NULLIF(sum(duration_ms), 0) AS records_in_per_sec,
+      sum(records_out)::float8 * 1000 / NULLIF(sum(duration_ms), 0) AS records_out_per_sec
+    FROM pipeline_runs
+    WHERE status = 'succeeded'
+      AND started_at >= :since
+      AND (CAST(:pipeline AS text) IS NULL OR pipeline = CAST(:pipeline AS text))
+    GROUP BY 1, 2
+    ORDER BY 1, 2;
+    """
+    params = {"bucket": bucket, "since": since, "pipeline": pipeline}
+    return conn.execute(text(sql), params).mappings().all()
+
+
+def _step_where(step: str | None) -> tuple[str, dict]:
+    """Step filter only when a step is given, so the planner can use the GIN index.
+
+    `steps @> '[{"step": ...}]'` lets the jsonb_path_ops index skip runs that never
+    executed the step before the array is unnested.
+    """
+    if not step:
+        return "", {}
+    clauses = ("r.steps @> CAST(:probe AS jsonb)", "s->>'step' = :step")
+    params = {"probe": json.dumps([{"step": step}]), "step": step}
+    return "".join(f"\n      AND {c}" for c in clauses), params
+
+
+def fetch_step_stats(
+    conn: Connection, pipeline: str, since: datetime, bucket: Bucket, step: str | None
+):
+    """Per-step duration percentiles (ok steps only) per time bucket."""
+    where, params = _step_where(step)
+    sql = f"""
+    SELECT
+      s->>'step' AS step,
+      date_trunc(:bucket, r.started_at) AS bucket_start,
+      count(*) AS samples,
+      percentile_cont(0.50) WITHIN GROUP (ORDER BY (s->>'duration_ms')::int) AS p50_ms,
+      percentile_cont(0.95) WITHIN GROUP (ORDER BY (s->>'duration_ms')::int) AS p95_ms,
+      percentile_cont(0.99) WITHIN GROUP (ORDER BY (s->>'duration_ms')::int) AS p99_ms
+    FROM pipeline_runs r
+    CROSS JOIN LATERAL jsonb_array_elements(r.steps) AS s
+    WHERE r.pipeline = :pipeline
+      AND r.started_at >= :since
+      AND s->>'status' = 'ok'{where}
+    GROUP BY 1, 2
+    ORDER BY 1, 2;
+    """
+    params |= {"bucket": bucket, "pipeline": pipeline, "since": since}
+    return conn.execute(text(sql), params).mappings().all()
+
+
+def fetch_step_samples(conn: Connection, pipeline: str, since: datetime, step: str | None):
+    """Per-run step durations in run order (input for detect_regressions).
+
+    Steps recorded several times in one run (per-batch steps) are summed per run.
+    """
+    where, params = _step_where(step)
+    sql = f"""
+    SELECT r.id AS run_id, r.started_at, s->>'step' AS step,
+           sum((s->>'duration_ms')::int) AS duration_ms
+    FROM pipeline_runs r
+    CROSS JOIN LATERAL jsonb_array_elements(r.steps) AS s
+    WHERE r.pipeline = :pipeline
+      AND r.status = 'succeeded'
+      AND r.started_at >= :since{where}
+    GROUP BY 1, 2, 3
+    ORDER BY r.started_at;
+    """
+    params |= {"pipeline": pipeline, "since": since}
+    return conn.execute(text(sql), params).mappings().all()
+
+
+def detect_regressions(
+    samples: Iterable[Mapping],
+    factor: float = 1.5,
+    window: int = 20,
+    min_samples: int = 5,
+    latest_only: bool = True,
+) -> list[dict]:
+    """Flag step durations above `factor` x the rolling baseline.
+
+    `samples` are dicts with run_id, started_at, step, duration_ms in run order. The
+    baseline of a sample is the median of the previous `window` samples of the same
+    step; samples with fewer than `min_samples` predecessors are never flagged.
+    With latest_only, only each step's most recent sample is evaluated.
+    """
+    by_step: dict[str, list[Mapping]] = defaultdict(list)
+    for s in samples:
+        by_step[s["step"]].append(s)
+
+    flags: list[dict] = []
+    for step, rows in by_step.items():
+        first = len(rows) - 1 if latest_only else 0
+        for i in range(max(first, min_samples), len(rows)):
+            history = [r["duration_ms"] for r in rows[max(0, i - window) : i]]
+            baseline = statistics.median(history)
+            current = rows[i]["duration_ms"]
+            if baseline > 0 and current > factor * baseline:
+                flags.append(
+                    {
+                        "step": step,
+                        "run_id": rows[i]["run_id"],
+                        "started_at": rows[i]["started_at"],
+                        "duration_ms": current,
+                        "baseline_ms": baseline,
+                        "ratio": round(current / baseline, 2),
+                    }
+                )
+    return flags
@@ -1,32 +1,76 @@
 from __future__ import annotations
 
-import re
+import argparse
 from pathlib import Path
 
 from sqlalchemy import text
 
+from app.db.data_version import bump_data_version
 from app.db.session import SessionLocal
 from app.observability.logging import get_logger
 from app.observability.run_tracking import RunTracker
 
+from .daily_rollup import refresh_daily_rollup
+from .sql_script import split_sql_statements
+
 SQL_PATH = Path("src/app/transform/monthly_metrics.sql")
+MONTHLY_METRICS = "summary.monthly_metrics"
+
+
+def refresh_materialized_view(db, name: str) -> bool:
+    """Refresh `name`; CONCURRENTLY once populated so dashboard reads never block.
+
+    Returns True when the concurrent path was used. A view created WITH NO DATA
+    can't be refreshed concurrently, so the first refresh is a plain one.
+    """
+    populated = db.execute(
+        text("SELECT relispopulated FROM pg_class WHERE oid = CAST(:name AS regclass)"),
+        {"name": name},
+    ).scalar_one()
+    if populated:
+        db.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {name}"))
+    else:
+        db.execute(text(f"REFRESH MATERIALIZED VIEW {name}"))
+    return bool(populated)
 
 
 def main() -> None:
+    p = argparse.ArgumentParser(description="Refresh the summary tables.")
+    p.add_argument(
+        "--full-rollup",
+        action="store_true",
+        help="rebuild all of summary.daily_rollup instead of the pairs cleaned since "
+        "the watermark (periodic reconcile)",
+    )
+    args = p.parse_args()
+
     logger = get_logger(__name__)
     with SessionLocal() as db:
-        tracker = RunTracker(db, logger, pipeline="metrics", input_ref=str(SQL_PATH))
+        tracker = RunTracker(logger, pipeline="metrics", input_ref=str(SQL_PATH))
         try:
-            with tracker.step("apply_sql", meta={"path": str(SQL_PATH)}):
-                sql = SQL_PATH.read_text(encoding="utf-8")
-                # Remove single-line comments
-                sql = re.sub(r"--.*$", "", sql, flags=re.MULTILINE)
-                # Split on semicolons and filter empty statements
-                parts = [p.strip() for p in sql.split(";") if p.strip()]
-                for stmt in parts:
+            with tracker.step("apply_sql", meta={"path": str(SQL_PATH)}) as step:
+                statements = split_sql_statements(SQL_PATH.read_text(encoding="utf-8"))
+                for stmt in statements:
                     db.execute(text(stmt))
                 db.commit()
-            tracker.succeed()
+                step.meta["statement_count"] = len(statements)
+
+            with tracker.step("refresh_monthly_metrics", meta={"view": MONTHLY_METRICS}) as step:
+                step.meta["concurrent"] = refresh_materialized_view(db, MONTHLY_METRICS)
+                bump_data_version(db)
+                db.commit()
+                step.meta["row_count"] = db.execute(
+                    text(f"SELECT count(*) FROM {MONTHLY_METRICS}")
+                ).scalar_one()
+            month_count = step.meta["row_count"]
+
+            # incremental: only (day, source) pairs cleaned since the last refresh
+            with tracker.step("refresh_daily_rollup", meta={"full": args.full_rollup}) as step:
+                step.meta.update(refresh_daily_rollup(db, full=args.full_rollup))
+                bump_data_version(db)
+                db.commit()
+
+            tracker.succeed(records_out=month_count)
         except Exception as e:
             db.rollback()
             tracker.fail(e)
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import uuid
+from datetime import date
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY, DATE
+from sqlalchemy.orm import Session
+
+from app.observability.logging import get_logger
+from app.observability.run_tracking import RunTracker
+
+# Same definitions as the eb012713281d backfill (source: public.raw_records).
+# Each day is read through a range predicate on event_time (ix_raw_records_event_time),
+# so the cost is proportional to the rows of the affected days, not the table.
+#
+# hll_* columns hold one HyperLogLog sketch per distinct_* metric (see hll.py for the
+# layout): hash = first 64 bits of md5, register = top 12 bits, rank = position of
+# the first 1 bit in the remaining 52 (53 when all zero). Weekly/monthly distinct
+# counts merge these instead of summing daily counts.
+_UPSERT_DAYS_SQL = text(
+    """
+    WITH days AS (
+      SELECT DISTINCT d AS day_date FROM unnest(:days) AS d
+    ),
+    day_rows AS (
+      SELECT d.day_date, r.source, r.record_hash, r.source_id, r.category
+      FROM days d
+      JOIN public.raw_records r
+        ON r.event_time >= d.day_date::timestamptz
+       AND r.event_time < (d.day_date + 1)::timestamptz
+    ),
+    counts AS (
+      SELECT
+        day_date,
+        count(*) AS total_records,
+        count(DISTINCT (source, record_hash)) AS distinct_records,
+        count(DISTINCT source_id) AS distinct_source_ids,
+        count(DISTINCT source) AS distinct_sources,
+        count(DISTINCT category) AS distinct_categories
+      FROM day_rows
+      GROUP BY 1
+    ),
+    hashed AS (
+      SELECT dr.day_date, k.metric, ('x' || substr(md5(k.val), 1, 16))::bit(64) AS h
+      FROM day_rows dr
+      CROSS JOIN LATERAL (
+        VALUES
+          ('records', dr.source || ':' || dr.record_hash),
+          ('source_ids', dr.source_id),
+          ('sources', dr.source),
+          ('categories', dr.category)
+      ) AS k(metric, val)
+    ),
+    registers AS (
+      SELECT
+        day_date,
+        metric,
+        substring(h FROM 1 FOR 12)::int AS idx,
+        max(COALESCE(NULLIF(position(B'1' IN substring(h FROM 13)), 0), 53)) AS rank
+      FROM hashed
+      GROUP BY 1, 2, 3
+    ),
+    sketches AS (
+      SELECT
+        c.day_date,
+        m.metric,
+        decode(
+          string_agg(lpad(to_hex(COALESCE(r.rank, 0)), 2, '0'), '' ORDER BY i.idx), 'hex'
+        ) AS sketch
+      FROM counts c
+      CROSS JOIN (VALUES ('records'), ('source_ids'), ('sources'), ('categories')) AS m(metric)
+      CROSS JOIN generate_series(0, 4095) AS i(idx)
+      LEFT JOIN registers r
+        ON r.day_date = c.day_date AND r.metric = m.metric AND r.idx = i.idx
+      GROUP BY 1, 2
+    ),
+    pivoted AS (
+      SELECT
+        day_date,
+        (array_agg(sketch) FILTER (WHERE metric = 'records'))[1] AS hll_records,
+        (array_agg(sketch) FILTER (WHERE metric = 'source_ids'))[1] AS hll_source_ids,
+        (array_agg(sketch) FILTER (WHERE metric = 'sources'))[1] AS hll_sources,
+        (array_agg(sketch) FILTER (WHERE metric = 'categories'))[1] AS hll_categories
+      FROM sketches
+      GROUP BY 1
+    )
+    INSERT INTO summary.daily_metrics (
+      day_date, total_records, distinct_records, distinct_source_ids,
+      distinct_sources, distinct_categories,
+      hll_records, hll_source_ids, hll_sources, hll_categories
+    )
+    SELECT
+      c.day_date, c.total_records, c.distinct_records, c.distinct_source_ids,
+      c.distinct_sources, c.distinct_categories,
+      p.hll_records, p.hll_source_ids, p.hll_sources, p.hll_categories
+    FROM counts c
+    JOIN pivoted p USING (day_date)
+    ON CONFLICT (day_date) DO UPDATE SET
+      total_records = EXCLUDED.total_records,
+      distinct_records = EXCLUDED.distinct_records,
+      distinct_source_ids = EXCLUDED.distinct_source_ids,
+      distinct_sources = EXCLUDED.distinct_sources,
+      distinct_categories = EXCLUDED.distinct_categories,
+      hll_records = EXCLUDED.hll_records,
+      hll_source_ids = EXCLUDED.hll_source_ids,
+      hll_sources = EXCLUDED.hll_sources,
+      hll_categories = EXCLUDED.hll_categories
+    """
+).bindparams(bindparam("days", type_=ARRAY(DATE)))
+
+# days that no longer have any rows (e.g. after a manual cleanup)
+_DELETE_EMPTY_DAYS_SQL = text(
+    """
+    DELETE FROM summary.daily_metrics m
+    WHERE m.day_date = ANY(:days)
+      AND NOT EXISTS (
+        SELECT 1 FROM public.raw_records r
+        WHERE r.event_time >= m.day_date::timestamptz
+          AND r.event_time < (m.day_date + 1)::timestamptz
+      )
+    """
+).bindparams(bindparam("days", type_=ARRAY(DATE)))
+
+# Serializes refreshes until commit: a concurrent ingest recomputing the same day
+# waits, then its statements see this transaction's rows (READ COMMITTED), so the
+# last writer never overwrites a day with counts that miss committed rows.
+_LOCK_SQL = text("SELECT pg_advisory_xact_lock(hashtext('summary.daily_metrics'))")
+
+_RUN_DAYS_SQL = text(
+    """
+    SELECT DISTINCT date_trunc('day', event_time)::date
+    FROM public.raw_records
+    WHERE run_id = :run_id
+    ORDER BY 1
+    """
+)
+
+
+_ALL_DAYS_SQL = text(
+    """
+    SELECT DISTINCT date_trunc('day', event_time)::date
+    FROM public.raw_records
+    ORDER BY 1
+    """
+)
+
+
+def days_for_ingest_run(db: Session, run_id: uuid.UUID) -> list[date]:
+    """Day buckets of the rows an ingest run inserted (deduped rows keep their old run_id)."""
+    return list(db.execute(_RUN_DAYS_SQL, {"run_id": run_id}).scalars())
+
+
+def refresh_daily_metrics(db: Session, days: list[date]) -> int:
+    """Recompute summary.daily_metrics for `days` only, in the caller's transaction.
+
+    Day buckets use the session time zone, like the original backfill. Holds a
+    transaction-level advisory lock, so call it right before committing.
+    Returns the number of upserted days.
+    """
+    if not days:
+        return 0
+    db.execute(_LOCK_SQL)
+    upserted = db.execute(_UPSERT_DAYS_SQL, {"days": days}).rowcount
+    db.execute(_DELETE_EMPTY_DAYS_SQL, {"days": days})
+    return upserted
+
+
+def backfill_daily_metrics(db: Session, tracker: RunTracker, batch_days: int = 31) -> int:
+    """Recompute every day (e.g. to build hll_* sketches for rows ingested before them)."""
+    days = list(db.execute(_ALL_DAYS_SQL).scalars())
+    for i in range(0, len(days), batch_days):
+        batch = days[i : i + batch_days]
+        with tracker.step("refresh_daily_metrics", meta={"from": str(batch[0])}, quiet=True):
+            refresh_daily_metrics(db, batch)
+            db.commit()
+    return len(days)
+
+
+def main() -> None:
+    from app.db.data_version import bump_data_version
+    from app.db.session import SessionLocal
+
+    logger = get_logger(__name__)
+    with SessionLocal() as db:
+        tracker = RunTracker(logger, pipeline="daily_metrics_backfill")
+        try:
+            day_count = backfill_daily_metrics(db, tracker)
+            bump_data_version(db)
+            db.commit()
+            tracker.succeed(records_out=day_count)
+        except Exception as e:
+            db.rollback()
+            tracker.fail(e)
+            raise
+
+
+if __name__ == "__main__":
+    main()
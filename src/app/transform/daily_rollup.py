@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+ROLLUP = "daily_rollup"
+
+# Extra overlap re-read before the previous watermark. Late commits are already
+# covered by _NEW_WATERMARK_SQL; this only absorbs clock oddities (e.g. rows stamped
+# by another writer's clock). Recomputing a (day, source) pair is idempotent.
+WATERMARK_LAG = timedelta(minutes=10)
+
+_READ_WATERMARK_SQL = text(
+    "SELECT watermark FROM summary.rollup_watermarks WHERE name = :name FOR UPDATE"
+)
+
+_WRITE_WATERMARK_SQL = text(
+    """
+    INSERT INTO summary.rollup_watermarks (name, watermark, updated_at)
+    VALUES (:name, :watermark, now())
+    ON CONFLICT (name) DO UPDATE
+      SET watermark = EXCLUDED.watermark, updated_at = now()
+    """
+)
+
+# (day, source) pairs with silver rows changed since `since` (ix_clean_records_cleaned_at).
+# Each pair is rebuilt over all its categories, so a record whose category was
+# re-mapped by cleaning leaves its old bucket too.
+_CHANGED_PAIRS_SQL = text(
+    """
+    CREATE TEMP TABLE rollup_changed ON COMMIT DROP AS
+    SELECT DISTINCT date_trunc('day', event_time)::date AS day_date, source
+    FROM clean.clean_records
+    WHERE CAST(:since AS timestamptz) IS NULL OR cleaned_at > CAST(:since AS timestamptz)
+    """
+)
+
+_CLEAR_PAIRS_SQL = text(
+    """
+    DELETE FROM summary.daily_rollup r
+    USING rollup_changed c
+    WHERE r.day_date = c.day_date AND r.source = c.source
+    """
+)
+
+# pairs are read through ix_clean_records_source_event_time
+_INSERT_PAIRS_SQL = text(
+    """
+    INSERT INTO summary.daily_rollup (
+      day_date, source, category, record_count, value_count, value_sum
+    )
+    SELECT
+      c.day_date,
+      c.source,
+      COALESCE(cr.category, '') AS category,
+      count(*) AS record_count,
+      count(cr.value_decimal) AS value_count,
+      COALESCE(sum(cr.value_decimal), 0) AS value_sum
+    FROM rollup_changed c
+    JOIN clean.clean_records cr
+      ON cr.source = c.source
+     AND cr.event_time >= c.day_date::timestamptz
+     AND cr.event_time < (c.day_date + 1)::timestamptz
+    GROUP BY 1, 2, 3
+    """
+)
+
+# The newest cleaned_at seen, held back to the start of the oldest other open
+# transaction: cleaning stamps cleaned_at = now() (its transaction start), so rows a
+# still-running clean commits later are stamped at or after that and are picked up
+# by the next refresh however long the transaction takes. A session idling in a
+# transaction holds the watermark back (more re-reads, never missed rows).
+_NEW_WATERMARK_SQL = text(
+    """
+    SELECT LEAST(
+      (SELECT max(cleaned_at) FROM clean.clean_records),
+      (SELECT min(xact_start) FROM pg_stat_activity
+       WHERE xact_start IS NOT NULL AND pid <> pg_backend_pid())
+    )
+    """
+)
+
+
+def refresh_daily_rollup(db: Session, *, full: bool = False) -> dict:
+    """Bring summary.daily_rollup up to date with clean.clean_records (caller commits).
+
+    Only (day, source) pairs with rows cleaned after the watermark are rebuilt; the
+    first run (no watermark) and `full` reconciles build the whole table. Must run
+    inside a transaction (the pair list is an ON COMMIT DROP temp table).
+    """
+    db.execute(
+        text(
+            "INSERT INTO summary.rollup_watermarks (name) VALUES (:name) "
+            "ON CONFLICT (name) DO NOTHING"
+        ),
+        {"name": ROLLUP},
+    )
+    # row lock serializes concurrent refreshes until commit
+    watermark = db.execute(_READ_WATERMARK_SQL, {"name": ROLLUP}).scalar()
+    since = None if watermark is None or full else watermark - WATERMARK_LAG
+
+    new_watermark = db.execute(_NEW_WATERMARK_SQL).scalar()
+    pairs = db.execute(_CHANGED_PAIRS_SQL, {"since": since}).rowcount
+    db.execute(_CLEAR_PAIRS_SQL)
+    rows = db.execute(_INSERT_PAIRS_SQL).rowcount
+    if new_watermark is not None:
+        db.execute(_WRITE_WATERMARK_SQL, {"name": ROLLUP, "watermark": new_watermark})
+    return {
+        "since": None if since is None else since.isoformat(),
+        "pair_count": pairs,
+        "rows_written": rows,
+    }
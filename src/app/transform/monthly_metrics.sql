@@ -8,7 +8,7 @@ Inputs:
   - clean.clean_records   (silver)
 
 Outputs:
-  - summary.monthly_metrics (view)
+  - summary.monthly_metrics (materialized view, refreshed by app.transform)
   - summary.data_quality_checks (table)  [optional but recommended]
 
 Notes:
@@ -19,7 +19,7 @@ Notes:
 -- 0) Schemas
 CREATE SCHEMA IF NOT EXISTS summary;
 
--- 1) Drop any existing monthly_metrics object safely (table/view/matview)
+-- 1) Replace any legacy monthly_metrics TABLE/VIEW (a materialized view is kept)
 DO $$
 DECLARE
   kind char;
@@ -31,22 +31,23 @@ BEGIN
   WHERE n.nspname = 'summary'
     AND c.relname = 'monthly_metrics';
 
-  IF kind IS NULL THEN
-    -- nothing to drop
+  IF kind IS NULL OR kind = 'm' THEN
+    -- nothing to drop; the materialized view is refreshed by app.transform
     RETURN;
   ELSIF kind = 'r' THEN
     EXECUTE 'DROP TABLE summary.monthly_metrics';
   ELSIF kind = 'v' THEN
     EXECUTE 'DROP VIEW summary.monthly_metrics';
-  ELSIF kind = 'm' THEN
-    EXECUTE 'DROP MATERIALIZED VIEW summary.monthly_metrics';
   ELSE
     RAISE NOTICE 'summary.monthly_metrics exists with relkind=% (not dropped)', kind;
   END IF;
 END $$;
 
--- 2) Monthly metrics view (clean → summary)
-CREATE OR REPLACE VIEW summary.monthly_metrics AS
+-- 2) Monthly metrics materialized view (clean → summary)
+--    Dashboard reads are O(months). app.transform refreshes it with
+--    REFRESH MATERIALIZED VIEW CONCURRENTLY (needs the unique index below).
+--    Changing the definition: DROP MATERIALIZED VIEW summary.monthly_metrics first.
+CREATE MATERIALIZED VIEW IF NOT EXISTS summary.monthly_metrics AS
 WITH base AS (
   SELECT
     date_trunc('month', event_time)::date AS month_start,
@@ -73,7 +74,10 @@ SELECT
   -- you can add numeric rollups later once "value" is typed/cleaned
 FROM base
 GROUP BY 1
-ORDER BY 1;
+WITH NO DATA;
+
+CREATE UNIQUE INDEX IF NOT EXISTS ux_monthly_metrics_month_start
+  ON summary.monthly_metrics (month_start);
 
 -- 3) Data quality checks table (stores pass/fail results over time)
 CREATE TABLE IF NOT EXISTS summary.data_quality_checks (
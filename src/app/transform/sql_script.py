@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import re
+
+# $$ or $tag$ (tags follow identifier rules)
+_DOLLAR_TAG = re.compile(r"\$(?:[A-Za-z_][A-Za-z0-9_]*)?\$")
+
+
+def split_sql_statements(sql: str) -> list[str]:
+    """Split a SQL script on top-level semicolons.
+
+    Semicolons inside quoted strings, quoted identifiers, dollar-quoted bodies
+    (DO $$ ... $$, function bodies) and comments do not end a statement.
+    Comments are dropped; empty statements are skipped.
+    """
+    statements: list[str] = []
+    buf: list[str] = []
+    i, n = 0, len(sql)
+
+    def flush() -> None:
+        stmt = "".join(buf).strip()
+        if stmt:
+            statements.append(stmt)
+        buf.clear()
+
+    while i < n:
+        ch = sql[i]
+        nxt = sql[i + 1] if i + 1 < n else ""
+
+        if ch == "-" and nxt == "-":
+            end = sql.find("\n", i)
+            i = n if end == -1 else end
+        elif ch == "/" and nxt == "*":
+            # block comments nest in Postgres
+            depth, i = 1, i + 2
+            while i < n and depth:
+                if sql.startswith("/*", i):
+                    depth, i = depth + 1, i + 2
+                elif sql.startswith("*/", i):
+                    depth, i = depth - 1, i + 2
+                else:
+                    i += 1
+            buf.append(" ")
+        elif ch in ("'", '"'):
+            # '' / "" escape a quote inside the literal
+            j = i + 1
+            while j < n:
+                if sql[j] == ch:
+                    if j + 1 < n and sql[j + 1] == ch:
+                        j += 2
+                        continue
+                    break
+                j += 1
+            buf.append(sql[i : j + 1])
+            i = j + 1
+        elif ch == "$" and (m := _DOLLAR_TAG.match(sql, i)):
+            tag = m.group(0)
+            end = sql.find(tag, m.end())
+            j = n if end == -1 else end + len(tag)
+            buf.append(sql[i:j])
+            i = j
+        elif ch == ";":
+            flush()
+            i += 1
+        else:
+            buf.append(ch)
+            i += 1
+
+    flush()
+    return statements
@@ -0,0 +1,196 @@
+# Tests (no DB needed): the Arrow engine must stage exactly what the Python engine inserts
+from __future__ import annotations
+
+import gzip
+import io
+import json
+import uuid
+from datetime import UTC, date, datetime
+from decimal import Decimal
+
+import pytest
+
+from app.core.config import settings
+from app.ingestion.service import IngestionError, _open_rows, _raw_values
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+arrow_engine = pytest.importorskip("app.ingestion.arrow_engine")
+
+CSV = (
+    "source_id,event_time,value,category,note\n"
+    " a1 ,2026-03-01T10:00:00Z,10,Food,plain\n"
+    'a2,2026-03-01T10:00:00.250000+02:00,  11 ,  FOOD ,"quoted ""x"" \\ back"\n'
+    'a3,2026-03-01 10:00:00,12,Café,"multi\nline"\n'
+    "a4,2026-03-01,13,Straße,tab\there\n"
+    "a5,2026-03-01T10:00:00.000001Z,x\x1fy,ok,ctrl\x01\n"
+).encode()
+
+
+def _python_rows(name: str, data: bytes) -> list[dict]:
+    now = datetime.now(UTC)
+    return [
+        _raw_values(uuid.uuid4(), "s", i, row, now)
+        for i, row in enumerate(_open_rows(name, data), start=1)
+    ]
+
+
+def _arrow_rows(name: str, data: bytes) -> list[dict]:
+    stream = io.BytesIO(data)
+    staged = [
+        arrow_engine.normalize_batch(b, 1)
+        for b in arrow_engine._record_batches(stream, name.removesuffix(".gz"))
+    ]
+    assert all(t is not None for t in staged)
+    return pa.concat_tables(staged).to_pylist()
+
+
+def _assert_same(python_rows: list[dict], arrow_rows: list[dict]) -> None:
+    assert len(python_rows) == len(arrow_rows)
+    for py, ar in zip(python_rows, arrow_rows, strict=True):
+        assert ar["record_hash"] == py["record_hash"]
+        for key in ("source_id", "category", "value", "row_num"):
+            assert ar[key] == py[key]
+        assert datetime.fromisoformat(ar["event_time"]) == py["event_time"]
+        assert json.loads(ar["payload"]) == json.loads(json.dumps(py["payload"]))
+
+
+@pytest.mark.parametrize("mode", ["full", "extras"])
+def test_csv_batches_match_python_engine(monkeypatch, mode):
+    monkeypatch.setattr(settings, "raw_payload_mode", mode)
+
+    _assert_same(_python_rows("a.csv", CSV), _arrow_rows("a.csv", CSV))
+
+
+def test_parquet_typed_columns_match_python_engine():
+    table = pa.table(
+        {
+            "source_id": pa.array([1, 2, 3], type=pa.int64()),
+            "event_time": pa.array(
+                [datetime(2026, 3, 1, 10, 0, 0, 5, tzinfo=UTC)] * 3, type=pa.timestamp("us", "UTC")
+            ),
+            "value": ["1", " 2", "3 "],
+            "category": ["A", "b", None],
+            "amount": pa.array([Decimal("1.50")] * 3),
+            "day": pa.array([date(2026, 3, 1)] * 3),
+            "flag": [True, False, None],
+            "ratio": [0.5, 1.25, None],
+        }
+    )
+    buf = io.BytesIO()
+    pq.write_table(table, buf)
+    data = buf.getvalue()
+
+    _assert_same(_python_rows("a.parquet", data), _arrow_rows("a.parquet", data))
+
+
+def test_unreproducible_key_types_fall_back_to_python():
+    batch = pa.record_batch(
+        {
+            "source_id": ["a"],
+            "event_time": ["2026-03-01T10:00:00Z"],
+            "value": pa.array([1.0]),  # str(1.0) == "1.0", Arrow casts to "1"
+            "category": ["x"],
+        }
+    )
+
+    assert arrow_engine.normalize_batch(batch, 1) is None
+
+
+def test_missing_event_time_fails_like_python():
+    data = b"source_id,event_time,value,category\na1,,1,x\n"
+    with pytest.raises(IngestionError, match="event_time is required"):
+        _arrow_rows("a.csv", data)
+
+
+def test_open_batches_validates_headers_and_skips_other_formats():
+    with pytest.raises(IngestionError, match="Missing required columns"):
+        arrow_engine.open_batches(None, uuid.uuid4(), "s", "a.csv.gz", gzip.compress(b"a,b\n1,2\n"))
+
+    assert arrow_engine.open_batches(None, uuid.uuid4(), "s", "a.xlsx", b"") is None
+    assert arrow_engine.open_batches(None, uuid.uuid4(), "s", "a.ndjson.gz", b"") is None
+
+
+def test_arrow_batches_resume_from_checkpoints(monkeypatch):
+    monkeypatch.setattr(settings, "ingest_batch_size", 2)
+    data = (
+        "source_id,event_time,value,category\n"
+        + "".join(f"r{i},2026-03-01T10:00:00Z,{i},x\n" for i in range(5))
+    ).encode()
+
+    # row index checkpoint (Arrow engine)
+    batches = arrow_engine.open_batches(None, uuid.uuid4(), "s", "a.csv", data, {"rows": 2})
+    batches = list(batches)
+    assert [b.checkpoint for b in batches] == [
+        {"rows": 4, "offset": None},
+        {"rows": 5, "offset": None},
+    ]
+    staged = pa.concat_tables(b.write.args[4] for b in batches).to_pylist()
+    assert [(r["row_num"], r["source_id"]) for r in staged] == [(3, "r2"), (4, "r3"), (5, "r4")]
+
+    # byte offset checkpoint (Python engine) after the first three rows
+    offset = len(data.split(b"r3,")[0])
+    checkpoint = {"rows": 3, "offset": offset}
+    batches = list(arrow_engine.open_batches(None, uuid.uuid4(), "s", "a.csv", data, checkpoint))
+    staged = pa.concat_tables(b.write.args[4] for b in batches).to_pylist()
+    assert [(r["row_num"], r["source_id"]) for r in staged] == [(4, "r3"), (5, "r4")]
+
+
+def _staged_rows(batches) -> list[dict]:
+    rows = []
+    for b in batches:
+        staged = b.write.args[-1]
+        if isinstance(staged, pa.Table):
+            rows.extend(staged.to_pylist())
+        else:  # Python engine batch: (db, source, values, rejects)
+            rows.extend(
+                {
+                    **v,
+                    "event_time": v["event_time"].isoformat(),
+                    "payload": json.dumps(v["payload"]),
+                }
+                for v in b.write.args[2]
+            )
+    return rows
+
+
+def test_ragged_csv_falls_back_to_python_engine():
+    data = (
+        b"source_id,event_time,value,category\n"
+        b"a1,2026-03-01T10:00:00Z,1,x\n"
+        b"a2,2026-03-01T10:00:00Z,2\n"  # one field short: category is ""
+        b"a3,2026-03-01T10:00:00Z,3,y\n"
+    )
+
+    batches = arrow_engine.open_batches(None, uuid.uuid4(), "s", "a.csv", data)
+    arrow_rows = _staged_rows(batches)
+
+    python_rows = _python_rows("a.csv", data)
+    _assert_same(python_rows, arrow_rows)
+    assert [r["category"] for r in arrow_rows] == ["x", "", "y"]
+
+
+def test_parse_error_mid_file_continues_after_yielded_batches(monkeypatch):
+    monkeypatch.setattr(settings, "ingest_batch_size", 2)
+    data = (
+        "source_id,event_time,value,category\n"
+        + "".join(f"r{i},2026-03-01T10:00:00Z,{i},x\n" for i in range(5))
+    ).encode()
+    first = next(iter(arrow_engine._record_batches(io.BytesIO(data), "a.csv"))).slice(0, 2)
+
+    def batches():
+        yield first
+        raise pa.ArrowInvalid("CSV parse error")
+
+    done = []
+
+    def fallback(rows_done):
+        done.append(rows_done)
+        return iter(())
+
+    out = list(arrow_engine._arrow_batches(None, uuid.uuid4(), "s", batches(), fallback=fallback))
+    assert [b.checkpoint["rows"] for b in out] == [2]
+    assert done == [2]
+
+    with pytest.raises(IngestionError, match="CSV parse error"):
+        list(arrow_engine._arrow_batches(None, uuid.uuid4(), "s", batches(), filename="a.csv"))
@@ -0,0 +1,176 @@
+# Tests (no DB needed): async routes with the AsyncSession dependency overridden
+from __future__ import annotations
+
+import uuid
+from datetime import UTC, date, datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import dashboard as dashboard_api
+from app.api import ingest as ingest_api
+from app.core.cache import TTLCache
+from app.db.data_version import DataVersionReader
+from app.db.session import get_async_db
+from app.main import app
+
+
+class _Scalar:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar(self):
+        return self.value
+
+
+class FakeAsyncSession:
+    """Serves summary.data_versions reads; everything else goes through fake services."""
+
+    data_version = 1
+
+    async def connection(self):
+        return "conn"
+
+    async def execute(self, stmt, params=None):
+        return _Scalar(FakeAsyncSession.data_version)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    async def _fake_db():
+        yield FakeAsyncSession()
+
+    FakeAsyncSession.data_version = 1
+    monkeypatch.setattr(dashboard_api, "_data_version", DataVersionReader(max_age=0))
+    cache = TTLCache(max_entries=16)
+    monkeypatch.setattr(dashboard_api, "get_response_cache", lambda: cache)
+
+    app.dependency_overrides[get_async_db] = _fake_db
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_trend_endpoint_awaits_async_service(client, monkeypatch):
+    calls = []
+
+    async def fake_fetch_trend_async(conn, **kw):
+        calls.append((conn, kw))
+        return [{"bucket_start": date(2026, 1, 5), "value": 7}]
+
+    monkeypatch.setattr(dashboard_api, "fetch_trend_async", fake_fetch_trend_async)
+    r = client.get(
+        "/dashboard/trend",
+        params={"start": "2026-01-01", "end": "2026-02-01", "granularity": "week"},
+    )
+
+    assert r.status_code == 200
+    assert r.json()["points"] == [{"bucket_start": "2026-01-05", "value": 7}]
+    assert calls[0][0] == "conn" and calls[0][1]["granularity"] == "week"
+
+
+def test_trend_is_cached_per_data_version_and_revalidates_with_etag(client, monkeypatch):
+    calls = []
+
+    async def fake_fetch_trend_async(conn, **kw):
+        calls.append(kw)
+        return [{"bucket_start": date(2026, 1, 1), "value": len(calls)}]
+
+    monkeypatch.setattr(dashboard_api, "fetch_trend_async", fake_fetch_trend_async)
+    params = {"start": "2026-01-01", "end": "2026-02-01"}
+
+    first = client.get("/dashboard/trend", params=params)
+    second = client.get("/dashboard/trend", params=params)
+    assert (first.headers["x-cache"], second.headers["x-cache"]) == ("miss", "hit")
+    assert first.json() == second.json() and len(calls) == 1
+    assert "must-revalidate" in first.headers["cache-control"]
+
+    etag = first.headers["etag"]
+    r304 = client.get("/dashboard/trend", params=params, headers={"If-None-Match": etag})
+    assert r304.status_code == 304 and not r304.content
+
+    # a successful refresh bumps the version: new ETag, fresh query
+    FakeAsyncSession.data_version = 2
+    third = client.get("/dashboard/trend", params=params, headers={"If-None-Match": etag})
+    assert third.status_code == 200 and third.headers["etag"] != etag
+    assert third.json()["points"][0]["value"] == 2
+
+
+def test_sliced_trend_reads_the_rollup_and_rejects_distinct_metrics(client, monkeypatch):
+    calls = []
+
+    async def fake_fetch_trend_rollup_async(conn, **kw):
+        calls.append(kw)
+        return [{"bucket_start": date(2026, 1, 1), "value": 3}]
+
+    monkeypatch.setattr(dashboard_api, "fetch_trend_rollup_async", fake_fetch_trend_rollup_async)
+    params = {"start": "2026-01-01", "end": "2026-02-01", "source": "csv"}
+
+    r = client.get("/dashboard/trend", params=params)
+    assert r.status_code == 200
+    assert r.json()["points"] == [{"bucket_start": "2026-01-01", "value": 3}]
+    assert calls[0]["source"] == "csv" and calls[0]["category"] is None
+
+    # the filter is part of the cache key
+    other = client.get("/dashboard/trend", params={**params, "source": "xlsx"})
+    assert other.headers["x-cache"] == "miss" and len(calls) == 2
+
+    bad = client.get("/dashboard/trend", params={**params, "metric": "distinct_sources"})
+    assert bad.status_code == 400
+
+
+def test_sliced_monthly_returns_value_sum_without_distinct_fields(client, monkeypatch):
+    async def fake_fetch_monthly_rollup_async(conn, **kw):
+        assert kw["category"] == ""
+        return [{"month_start": date(2026, 1, 1), "total_records": 5, "value_sum": 12.5}]
+
+    monkeypatch.setattr(
+        dashboard_api, "fetch_monthly_rollup_async", fake_fetch_monthly_rollup_async
+    )
+
+    r = client.get("/dashboard/monthly", params={"category": ""})
+    assert r.status_code == 200
+    assert r.json() == [{"month_start": "2026-01-01", "total_records": 5, "value_sum": 12.5}]
+
+
+def test_ttl_cache_evicts_least_recently_used_and_expired():
+    import asyncio
+
+    async def scenario():
+        c = TTLCache(max_entries=2)
+        await c.set("a", b"1", ttl=60)
+        await c.set("b", b"2", ttl=60)
+        assert await c.get("a") == b"1"  # a is now most recent
+        await c.set("c", b"3", ttl=60)
+        assert await c.get("b") is None
+        await c.set("d", b"4", ttl=-1)
+        assert await c.get("d") is None
+
+    asyncio.run(scenario())
+
+
+def test_ingest_run_status_lookup(client, monkeypatch):
+    run_id = uuid.uuid4()
+
+    async def fake_fetch_ingest_run(conn, rid):
+        if rid != run_id:
+            return None
+        return {
+            "run_id": rid,
+            "created_at": datetime(2026, 1, 1, tzinfo=UTC),
+            "source": "samples",
+            "status": "completed",
+            "files": "sample.csv\nsample.xlsx",
+            "error": None,
+            "record_count": 12,
+        }
+
+    monkeypatch.setattr(ingest_api, "fetch_ingest_run", fake_fetch_ingest_run)
+
+    r = client.get(f"/ingest/runs/{run_id}")
+    assert r.status_code == 200
+    assert r.json()["files"] == ["sample.csv", "sample.xlsx"]
+    assert r.json()["record_count"] == 12
+
+    assert client.get(f"/ingest/runs/{uuid.uuid4()}").status_code == 404
@@ -0,0 +1,83 @@
+# Tests (no DB needed)
+from __future__ import annotations
+
+from app.db.batched import MAX_PARAMS, batched_update
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return self.rows
+
+
+class FakeConnection:
+    """Serves `rows` (sorted by id) through the keyset SELECTs; records UPDATEs."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.selects = []
+        self.updates = []
+
+    def execute(self, stmt, params=None):
+        sql = str(stmt)
+        if sql.startswith("UPDATE"):
+            self.updates.append((sql, params))
+            return FakeResult([])
+        self.selects.append((sql, params))
+        after = params.get("after")
+        page = [r for r in self.rows if after is None or r["id"] > after]
+        return FakeResult(page[: params["limit"]])
+
+
+def _rows(n):
+    return [{"id": i, "payload": {"v": i}} for i in range(1, n + 1)]
+
+
+def test_batched_update_pages_by_key_and_writes_one_values_update_per_batch():
+    conn = FakeConnection(_rows(5))
+    commits = []
+
+    updated = batched_update(
+        conn,
+        "raw_records",
+        read=["payload"],
+        columns={"value": "text"},
+        compute=lambda r: {"value": str(r["payload"]["v"])},
+        key_type="int",
+        pending="value IS NULL",
+        batch_size=2,
+        commit=lambda: commits.append(1),
+    )
+
+    assert updated == 5
+    assert [p.get("after") for _, p in conn.selects] == [None, 2, 4, 5]
+    assert "id > CAST(:after AS int) AND (value IS NULL)" in conn.selects[1][0]
+    assert "ORDER BY id LIMIT :limit" in conn.selects[0][0]
+    assert len(conn.updates) == 3 and len(commits) == 3
+
+    sql, params = conn.updates[0]
+    assert "FROM (VALUES (:p0_0, :p0_1), (:p1_0, :p1_1)) AS v(id, value)" in sql
+    assert "SET value = CAST(v.value AS text)" in sql
+    assert params == {"p0_0": 1, "p0_1": "1", "p1_0": 2, "p1_1": "2"}
+
+
+def test_rows_without_changes_are_skipped_and_batch_size_respects_param_cap():
+    conn = FakeConnection(_rows(3))
+
+    updated = batched_update(
+        conn,
+        "t",
+        read=["payload"],
+        columns={f"c{i}": "text" for i in range(9)},
+        compute=lambda r: None if r["id"] == 2 else {f"c{i}": "x" for i in range(9)},
+        key_type="int",
+        batch_size=10**6,
+    )
+
+    assert updated == 2
+    assert conn.selects[0][1]["limit"] == MAX_PARAMS // 10
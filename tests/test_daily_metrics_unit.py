@@ -0,0 +1,40 @@
+# Tests (no DB needed)
+from __future__ import annotations
+
+from datetime import date
+
+from sqlalchemy.dialects import postgresql
+
+from app.transform.daily_metrics import refresh_daily_metrics
+
+
+class FakeResult:
+    rowcount = 2
+
+
+class FakeSession:
+    def __init__(self):
+        self.executed = []
+
+    def execute(self, stmt, params=None):
+        self.executed.append((stmt, params))
+        return FakeResult()
+
+
+def test_refresh_daily_metrics_is_noop_without_days():
+    db = FakeSession()
+    assert refresh_daily_metrics(db, []) == 0
+    assert db.executed == []
+
+
+def test_refresh_daily_metrics_locks_then_upserts_and_prunes_only_given_days():
+    db = FakeSession()
+    days = [date(2026, 3, 1), date(2026, 3, 2)]
+
+    assert refresh_daily_metrics(db, days) == 2
+
+    sql = [str(s.compile(dialect=postgresql.dialect())) for s, _ in db.executed]
+    assert "pg_advisory_xact_lock" in sql[0]
+    assert "INSERT INTO summary.daily_metrics" in sql[1] and "unnest" in sql[1]
+    assert sql[2].lstrip().startswith("DELETE FROM summary.daily_metrics")
+    assert all(p == {"days": days} for _, p in db.executed[1:])
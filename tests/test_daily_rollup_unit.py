@@ -0,0 +1,109 @@
+# Tests (no DB needed)
+from __future__ import annotations
+
+from datetime import UTC, date, datetime
+
+from sqlalchemy.dialects import postgresql
+
+from app.services.dashboard import _rollup_trend_sql, month_day_bounds
+from app.transform.daily_rollup import WATERMARK_LAG, refresh_daily_rollup
+
+
+class FakeResult:
+    rowcount = 4
+
+    def __init__(self, value=None):
+        self.value = value
+
+    def scalar(self):
+        return self.value
+
+
+class FakeSession:
+    """Answers the watermark read and max(cleaned_at); records every statement."""
+
+    def __init__(self, watermark, max_cleaned_at):
+        self.watermark = watermark
+        self.max_cleaned_at = max_cleaned_at
+        self.executed = []
+
+    def execute(self, stmt, params=None):
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        self.executed.append((sql, params))
+        if "SELECT watermark" in sql:
+            return FakeResult(self.watermark)
+        if "max(cleaned_at)" in sql:
+            return FakeResult(self.max_cleaned_at)
+        return FakeResult()
+
+
+def test_refresh_daily_rollup_rebuilds_pairs_changed_since_watermark_minus_lag():
+    watermark = datetime(2026, 3, 1, 12, 0, tzinfo=UTC)
+    newest = datetime(2026, 3, 2, 8, 0, tzinfo=UTC)
+    db = FakeSession(watermark, newest)
+
+    out = refresh_daily_rollup(db)
+
+    assert out == {
+        "since": (watermark - WATERMARK_LAG).isoformat(),
+        "pair_count": 4,
+        "rows_written": 4,
+    }
+    sql = [s for s, _ in db.executed]
+    changed = next(i for i, s in enumerate(sql) if "CREATE TEMP TABLE rollup_changed" in s)
+    assert db.executed[changed][1] == {"since": watermark - WATERMARK_LAG}
+    assert sql[changed + 1].lstrip().startswith("DELETE FROM summary.daily_rollup")
+    assert sql[changed + 2].lstrip().startswith("INSERT INTO summary.daily_rollup")
+    assert db.executed[-1][1] == {"name": "daily_rollup", "watermark": newest}
+
+
+def test_refresh_daily_rollup_first_run_builds_everything_and_keeps_null_watermark():
+    db = FakeSession(watermark=None, max_cleaned_at=None)
+
+    out = refresh_daily_rollup(db)
+
+    assert out["since"] is None
+    assert not any("rollup_watermarks (name, watermark" in s for s, _ in db.executed)
+
+
+def test_refresh_daily_rollup_full_reconcile_ignores_the_watermark():
+    watermark = datetime(2026, 3, 1, 12, 0, tzinfo=UTC)
+    db = FakeSession(watermark, watermark)
+
+    out = refresh_daily_rollup(db, full=True)
+
+    assert out["since"] is None
+    changed = next(p for s, p in db.executed if "CREATE TEMP TABLE rollup_changed" in s)
+    assert changed == {"since": None}
+
+
+def test_new_watermark_is_held_back_by_open_transactions():
+    db = FakeSession(None, datetime(2026, 3, 1, tzinfo=UTC))
+
+    refresh_daily_rollup(db)
+
+    sql = next(s for s, _ in db.executed if "max(cleaned_at)" in s)
+    assert "LEAST" in sql and "min(xact_start) FROM pg_stat_activity" in sql
+
+
+def test_month_day_bounds_cover_months_starting_in_range():
+    assert month_day_bounds(None, None) == (None, None)
+    assert month_day_bounds(date(2026, 1, 1), date(2026, 3, 1)) == (
+        date(2026, 1, 1),
+        date(2026, 3, 1),
+    )
+    # mid-month start skips that month; mid-month end includes it
+    assert month_day_bounds(date(2026, 1, 15), date(2026, 12, 2)) == (
+        date(2026, 2, 1),
+        date(2027, 1, 1),
+    )
+
+
+def test_rollup_trend_sql_only_filters_on_given_columns():
+    stmt, params = _rollup_trend_sql("week", source="csv", category=None)
+    sql = str(stmt)
+    assert "FROM summary.daily_rollup" in sql and "source = :source" in sql
+    assert "category" not in sql and params == {"source": "csv"}
+
+    stmt, params = _rollup_trend_sql("day", source=None, category="")
+    assert "category = :category" in str(stmt) and params == {"category": ""}
@@ -19,18 +19,18 @@ class _NoopLogger:
         return None
 
 
-class _NoopSession:
-    def add(self, _obj: Any) -> None:
+class _NoopWriter:
+    def insert(self, _run_id: Any, _values: dict) -> None:
         return None
 
-    def flush(self) -> None:
+    def update(self, _run_id: Any, _values: dict) -> None:
         return None
 
-    def commit(self) -> None:
+    def append_steps(self, _run_id: Any, _steps: list) -> None:
         return None
 
-    def rollback(self) -> None:
-        return None
+    def flush(self, timeout: float | None = None) -> bool:
+        return True
 
 
 def _parse_dotenv(path: Path) -> dict[str, str]:
@@ -69,13 +69,13 @@ def _database_url_from_config(config: dict[str, str]) -> str | None:
 
 
 def _success_status_value() -> str:
-    tracker = RunTracker(db=_NoopSession(), logger=_NoopLogger(), pipeline="status_probe")
+    tracker = RunTracker(logger=_NoopLogger(), pipeline="status_probe", writer=_NoopWriter())
     tracker.succeed()
     return tracker.row.status
 
 
 def _failure_status_value() -> str:
-    tracker = RunTracker(db=_NoopSession(), logger=_NoopLogger(), pipeline="status_probe")
+    tracker = RunTracker(logger=_NoopLogger(), pipeline="status_probe", writer=_NoopWriter())
     tracker.fail(RuntimeError("forced failure probe"))
     return tracker.row.status
 
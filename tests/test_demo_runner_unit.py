@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+from types import SimpleNamespace
 from typing import Any
 
 import pytest
 
 from app.demo import __main__ as demo_main
+from app.observability import run_writer
 
 
 class FakeLogger:
@@ -39,8 +41,28 @@ class FakeSession:
         self.closed += 1
 
 
-def _latest_demo_row(fake_db: FakeSession):
-    rows = [row for row in fake_db.added if getattr(row, "pipeline", None) == "demo"]
+class FakeWriter:
+    """Applies run-tracking events to in-memory rows keyed by run id."""
+
+    def __init__(self) -> None:
+        self.rows: dict[Any, SimpleNamespace] = {}
+
+    def insert(self, run_id: Any, values: dict) -> None:
+        self.rows[run_id] = SimpleNamespace(id=run_id, **values)
+
+    def update(self, run_id: Any, values: dict) -> None:
+        for k, v in values.items():
+            setattr(self.rows[run_id], k, v)
+
+    def append_steps(self, run_id: Any, steps: list) -> None:
+        self.rows[run_id].steps.extend(steps)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        return True
+
+
+def _latest_demo_row(fake_writer: FakeWriter):
+    rows = [row for row in fake_writer.rows.values() if row.pipeline == "demo"]
     assert rows
     return rows[-1]
 
@@ -71,9 +93,11 @@ def test_demo_fail_marks_failed_and_prints_summary_once(
     monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
 ) -> None:
     fake_db = FakeSession()
+    fake_writer = FakeWriter()
     fake_logger = FakeLogger()
 
     monkeypatch.setattr(demo_main, "SessionLocal", lambda: fake_db)
+    monkeypatch.setattr(run_writer, "get_run_writer", lambda: fake_writer)
     monkeypatch.setattr(demo_main, "get_logger", lambda _name: fake_logger)
     monkeypatch.setattr(demo_main, "_run_python_module", lambda _module, _args=(): None)
     monkeypatch.setattr(demo_main, "_collect_subpipeline_counts", lambda _db, _since: (20, 10))
@@ -85,10 +109,9 @@ def test_demo_fail_marks_failed_and_prints_summary_once(
     assert exit_code == 1
     assert out.count("DEMO SUMMARY") == 1
 
-    row = _latest_demo_row(fake_db)
+    row = _latest_demo_row(fake_writer)
     assert row.status == "failed"
     assert row.error_summary is not None
     assert "Forced demo failure" in row.error_summary
     assert row.records_in == 20
     assert row.records_out == 10
-
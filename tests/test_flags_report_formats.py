@@ -0,0 +1,103 @@
+# Tests (no DB needed)
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+
+from app.flags.models import Flag, FlaggedRecord
+from app.flags.report import (
+    ReportFormatError,
+    normalize_format,
+    resolve_report_path,
+    write_flag_report,
+)
+from app.flags.report_csv import REPORT_COLUMNS
+
+
+def _flagged(n: int = 3) -> list[FlaggedRecord]:
+    now = datetime(2026, 1, 16, tzinfo=UTC)
+    return [
+        FlaggedRecord(
+            record={
+                "id": f"id-{i}",
+                "run_id": "run-1",
+                "row_num": i,
+                "source": "s",
+                "source_id": f"S{i}",
+                "category": "c",
+                "event_time": now,
+                "value": "-5",
+                "record_hash": f"h{i}",
+                "ingested_at": now,
+            },
+            severity=35,
+            flags=[Flag(code="VALUE_OUT_OF_RANGE", weight=35, message="value=-5.0 must be > 0")],
+        )
+        for i in range(1, n + 1)
+    ]
+
+
+@pytest.mark.parametrize(
+    "path,fmt,expected",
+    [
+        ("out/flags_report.csv", "parquet", "out/flags_report.parquet"),
+        ("out/flags_report.csv.gz", "csv", "out/flags_report.csv"),
+        ("out/flags_report.parquet", "csv.zst", "out/flags_report.csv.zst"),
+        ("out/report", "csv.gz", "out/report.csv.gz"),
+    ],
+)
+def test_resolve_report_path_swaps_suffix(path, fmt, expected):
+    assert resolve_report_path(path, fmt) == Path(expected)
+
+
+def test_unknown_format_is_rejected():
+    with pytest.raises(ReportFormatError):
+        normalize_format("xml")
+
+
+def test_csv_gz_round_trips_and_reports_throughput(tmp_path: Path):
+    out = tmp_path / "flags_report.csv.gz"
+    stats = write_flag_report(_flagged(), out, "csv.gz")
+
+    with gzip.open(out, "rt", newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+
+    assert rows[0] == REPORT_COLUMNS
+    assert len(rows) == 4
+    assert rows[1][REPORT_COLUMNS.index("flag_codes")] == "VALUE_OUT_OF_RANGE"
+
+    meta = stats.as_meta()
+    assert meta["rows_written"] == 3
+    assert meta["bytes_written"] == out.stat().st_size
+    assert meta["format"] == "csv.gz"
+    assert meta["rows_per_sec"] > 0
+
+
+def test_csv_zst_round_trips(tmp_path: Path):
+    zstandard = pytest.importorskip("zstandard")
+    out = tmp_path / "flags_report.csv.zst"
+    write_flag_report(_flagged(), out, "csv.zst")
+
+    data = zstandard.ZstdDecompressor().stream_reader(out.read_bytes()).read()
+    rows = list(csv.reader(io.StringIO(data.decode("utf-8"))))
+    assert rows[0] == REPORT_COLUMNS
+    assert len(rows) == 4
+
+
+def test_parquet_streams_row_groups(tmp_path: Path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    out = tmp_path / "flags_report.parquet"
+    stats = write_flag_report(_flagged(5), out, "parquet", row_group_size=2)
+
+    f = pq.ParquetFile(out)
+    assert f.metadata.num_rows == 5
+    assert f.metadata.num_row_groups == 3
+    table = f.read()
+    assert table.column_names == REPORT_COLUMNS
+    assert table.column("severity").to_pylist() == [35] * 5
+    assert stats.rows == 5
@@ -8,3 +8,56 @@ def test_health():
     r = c.get("/health")
     assert r.status_code == 200
     assert r.json() == {"status": "ok"}
+
+
+def test_health_pool_reports_shared_engine_pool():
+    c = TestClient(app)
+    r = c.get("/health/pool")
+    assert r.status_code == 200
+    body = r.json()
+    assert {"size", "checked_in", "checked_out", "overflow"} <= body.keys()
+    assert "d2d_db_pool_connections" in c.get("/metrics").text
+
+
+def test_health_pool_includes_async_pool():
+    body = TestClient(app).get("/health/pool").json()
+    assert {"size", "checked_in", "checked_out"} <= body["async"].keys()
+    assert body["max_connections"] > body["size"] + body["max_overflow"]
+
+
+def test_async_engine_has_its_own_pool_budget(monkeypatch):
+    from app.core.config import Settings
+    from app.db import session
+
+    captured = {}
+    monkeypatch.setattr(session, "create_async_engine", lambda url, **kw: captured.update(kw))
+    cfg = Settings(
+        database_url="postgresql+psycopg://u:p@h/db",
+        db_pool_size=8,
+        db_max_overflow=4,
+        db_async_pool_size=3,
+        db_async_max_overflow=2,
+    )
+    session.build_async_engine(cfg)
+
+    assert (captured["pool_size"], captured["max_overflow"]) == (3, 2)
+    assert session.max_connections(cfg) == 17
+
+
+def test_build_engine_applies_pool_settings_and_statement_timeout(monkeypatch):
+    from app.core.config import Settings
+    from app.db import session
+
+    captured = {}
+    monkeypatch.setattr(session, "create_engine", lambda url, **kw: captured.update(kw))
+    cfg = Settings(
+        database_url="postgresql+psycopg://u:p@h/db",
+        db_pool_size=8,
+        db_pool_recycle=600,
+        db_statement_timeout_ms=5000,
+    )
+    session.build_engine(cfg)
+
+    assert captured["pool_size"] == 8
+    assert captured["pool_recycle"] == 600
+    assert captured["connect_args"] == {"options": "-c statement_timeout=5000"}
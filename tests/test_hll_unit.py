@@ -0,0 +1,67 @@
+# Tests (no DB needed)
+from __future__ import annotations
+
+from datetime import date
+
+import pytest
+
+from app.services.dashboard import bucket_range, bucket_start, merge_sketch_trend
+from app.transform import hll
+
+
+def _sketch(values) -> bytes:
+    s = hll.empty()
+    for v in values:
+        hll.add(s, v)
+    return bytes(s)
+
+
+@pytest.mark.parametrize("n", [0, 10, 1000, 50_000])
+def test_estimate_is_within_a_few_percent(n):
+    est = hll.estimate(_sketch(f"id-{i}" for i in range(n)))
+    assert est == pytest.approx(n, rel=0.05, abs=1)
+
+
+def test_merge_counts_ids_seen_on_several_days_once():
+    # 7 days, 1000 ids per day, 800 of them shared by every day: 1000 + 6 * 200 distinct
+    days = [
+        _sketch([f"shared-{i}" for i in range(800)] + [f"d{d}-{i}" for i in range(200)])
+        for d in range(7)
+    ]
+    summed = sum(round(hll.estimate(s)) for s in days)
+    merged = hll.estimate(hll.merge(days))
+
+    assert summed == pytest.approx(7000, rel=0.05)  # what SUM(distinct_*) reported
+    assert merged == pytest.approx(2200, rel=0.05)
+    assert hll.merge(days) == _sketch(
+        [f"shared-{i}" for i in range(800)] + [f"d{d}-{i}" for d in range(7) for i in range(200)]
+    )
+
+
+def test_merge_rejects_foreign_sketches():
+    with pytest.raises(ValueError):
+        hll.merge([b"\x00" * 16])
+
+
+def test_weekly_trend_merges_sketches_and_marks_buckets_without_one():
+    a, b = _sketch(["x", "y"]), _sketch(["y", "z"])
+    rows = [
+        {"day_date": date(2026, 3, 2), "sketch": a},  # Monday
+        {"day_date": date(2026, 3, 8), "sketch": b},  # Sunday, same ISO week
+        {"day_date": date(2026, 3, 9), "sketch": None},  # next week: not built yet
+    ]
+
+    assert merge_sketch_trend(rows, "week") == {date(2026, 3, 2): 3, date(2026, 3, 9): None}
+
+
+def test_bucket_helpers_follow_date_trunc_and_clip_to_range():
+    assert bucket_start(date(2026, 3, 8), "week") == date(2026, 3, 2)
+    assert bucket_start(date(2026, 2, 17), "month") == date(2026, 2, 1)
+    assert bucket_range(date(2026, 12, 1), "month", date(2026, 12, 10), date(2027, 6, 1)) == (
+        date(2026, 12, 10),
+        date(2027, 1, 1),
+    )
+    assert bucket_range(date(2026, 3, 2), "week", date(2026, 1, 1), date(2026, 3, 5)) == (
+        date(2026, 3, 2),
+        date(2026, 3, 5),
+    )
@@ -0,0 +1,83 @@
+# EXPLAIN-based regression tests: the hot query shapes must stay on their indexes.
+# Sequential scans and sorts are disabled so the planner only falls back to them
+# (at a huge cost, still visible in the plan) when no matching index exists; the
+# result no longer depends on how many rows the test database happens to hold.
+from __future__ import annotations
+
+import json
+
+import pytest
+from sqlalchemy import text
+
+from app.db.session import SessionLocal
+
+pytestmark = pytest.mark.integration
+
+
+def _plan_nodes(sql: str, params: dict | None = None) -> list[dict]:
+    with SessionLocal() as db:
+        db.execute(text("SET LOCAL enable_seqscan = off"))
+        db.execute(text("SET LOCAL enable_bitmapscan = off"))
+        db.execute(text("SET LOCAL enable_sort = off"))
+        raw = db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"), params or {}).scalar_one()
+        db.rollback()
+
+    plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+    nodes, stack = [], [plan]
+    while stack:
+        node = stack.pop()
+        nodes.append(node)
+        stack.extend(node.get("Plans", []))
+    return nodes
+
+
+def _types(nodes: list[dict]) -> set[str]:
+    return {n["Node Type"] for n in nodes}
+
+
+def test_newest_first_fetch_uses_ingested_at_index_without_sort():
+    nodes = _plan_nodes(
+        "SELECT id, payload FROM public.raw_records ORDER BY ingested_at DESC, id LIMIT 5000"
+    )
+    types = _types(nodes)
+    assert "Sort" not in types and "Seq Scan" not in types
+    assert {"Index Scan", "Index Only Scan"} & types
+
+
+def test_daily_metrics_day_read_is_index_only():
+    nodes = _plan_nodes(
+        """
+        SELECT source, record_hash, source_id, category
+        FROM public.raw_records
+        WHERE event_time >= '2026-03-01' AND event_time < '2026-03-02'
+        """
+    )
+    scans = [n for n in nodes if "Scan" in n["Node Type"]]
+    assert scans and all(n["Node Type"] == "Index Only Scan" for n in scans)
+
+
+def test_rollup_pair_read_is_index_only():
+    nodes = _plan_nodes(
+        """
+        SELECT category, value_decimal
+        FROM clean.clean_records
+        WHERE source = 'samples'
+          AND event_time >= '2026-03-01' AND event_time < '2026-03-02'
+        """
+    )
+    scans = [n for n in nodes if "Scan" in n["Node Type"]]
+    assert scans and all(n["Node Type"] == "Index Only Scan" for n in scans)
+
+
+def test_filtered_dashboard_slice_is_index_only():
+    nodes = _plan_nodes(
+        """
+        SELECT day_date, SUM(record_count)
+        FROM summary.daily_rollup
+        WHERE source = 'samples' AND day_date >= '2026-01-01' AND day_date < '2026-02-01'
+        GROUP BY 1
+        """
+    )
+    scan = next(n for n in nodes if "Scan" in n["Node Type"])
+    assert scan["Node Type"] == "Index Only Scan"
+    assert scan["Index Name"] == "ix_daily_rollup_source_day"
@@ -64,3 +64,364 @@ def test_ingest_csv_missing_column_fails():
     r = client.post("/ingest/files", files=files)
     assert r.status_code == 400
     assert "Missing required columns" in r.text
+
+
+def test_ingest_keeps_daily_metrics_in_sync_for_touched_days():
+    _truncate_ingestion_tables()
+    with SessionLocal() as db:
+        db.execute(text("TRUNCATE TABLE summary.daily_metrics;"))
+        db.commit()
+
+    header = "source_id,event_time,value,category\n"
+    csv_1 = header + "a,2026-03-01T10:00:00Z,1,x\nb,2026-03-02T10:00:00Z,2,y\n"
+    csv_2 = header + "c,2026-03-02T11:00:00Z,3,z\n"
+    for name, body in (("d1.csv", csv_1), ("d2.csv", csv_2)):
+        r = client.post("/ingest/files", files=[("files", (name, body.encode(), "text/csv"))])
+        assert r.status_code == 200, r.text
+
+    with SessionLocal() as db:
+        rollup = db.execute(
+            text("SELECT day_date, total_records, distinct_categories FROM summary.daily_metrics")
+        ).all()
+        full = db.execute(
+            text(
+                """
+                SELECT date_trunc('day', event_time)::date, count(*), count(DISTINCT category)
+                FROM raw_records GROUP BY 1
+                """
+            )
+        ).all()
+    assert sorted(rollup) == sorted(full)
+    assert len(rollup) == 2
+
+
+def test_weekly_distinct_trend_merges_daily_sketches():
+    from datetime import date
+
+    from app.services.dashboard import fetch_trend
+
+    _truncate_ingestion_tables()
+    with SessionLocal() as db:
+        db.execute(text("TRUNCATE TABLE summary.daily_metrics;"))
+        db.commit()
+
+    # the same source_id on three days of one ISO week
+    body = "source_id,event_time,value,category\n" + "".join(
+        f"dev-1,2026-03-0{d}T10:00:00Z,{d},x\n" for d in (2, 3, 4)
+    )
+    r = client.post("/ingest/files", files=[("files", ("w.csv", body.encode(), "text/csv"))])
+    assert r.status_code == 200, r.text
+
+    with SessionLocal() as db:
+        points = fetch_trend(
+            db.connection(),
+            start=date(2026, 3, 1),
+            end=date(2026, 4, 1),
+            granularity="week",
+            metric="distinct_source_ids",
+        )
+    assert [(p["bucket_start"], p["value"]) for p in points] == [(date(2026, 3, 2), 1)]
+
+
+def test_records_are_range_partitioned_and_new_months_leave_the_default_partition():
+    from app.db.partitions import default_partition_name, ensure_partitions
+
+    _truncate_ingestion_tables()
+    assert client.post("/ingest/samples").status_code == 200
+
+    with SessionLocal() as db:
+        kinds = db.execute(
+            text(
+                "SELECT c.relname FROM pg_partitioned_table p "
+                "JOIN pg_class c ON c.oid = p.partrelid"
+            )
+        ).scalars()
+        assert {"raw_records", "clean_records"} <= set(kinds)
+
+        default = default_partition_name("public.raw_records")
+        month = db.execute(
+            text(
+                "SELECT min(date_trunc('month', event_time AT TIME ZONE 'UTC'))::date "
+                f"FROM {default}"
+            )
+        ).scalar()
+        if month is None:
+            pytest.skip("sample rows already fall into monthly partitions")
+
+        total = _count("raw_records")
+        ensure_partitions(db, "public.raw_records", month, month)
+        db.commit()
+
+        left = db.execute(
+            text(
+                f"SELECT count(*) FROM {default} "
+                "WHERE date_trunc('month', event_time AT TIME ZONE 'UTC')::date = :m"
+            ),
+            {"m": month},
+        ).scalar_one()
+    assert left == 0
+    assert _count("raw_records") == total
+
+
+def test_concurrent_overlapping_ingests_keep_exact_counts():
+    import threading
+
+    from app.ingestion.service import ingest_files
+
+    _truncate_ingestion_tables()
+
+    def csv_rows(lo: int, hi: int) -> bytes:
+        return (
+            "source_id,event_time,value,category\n"
+            + "".join(f"dev-{i:03d},2026-04-01T10:00:00Z,{i},x\n" for i in range(lo, hi))
+        ).encode()
+
+    # 0..59 and 30..89 overlap on 30 rows
+    files = [("a.csv", csv_rows(0, 60)), ("b.csv", csv_rows(30, 90))]
+    barrier = threading.Barrier(len(files))
+    results, errors = [], []
+
+    def run(name: str, data: bytes) -> None:
+        try:
+            with SessionLocal() as db:
+                barrier.wait()
+                results.append(ingest_files(db, "concurrent", [(name, data)]))
+        except Exception as e:  # surfaced below
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=f) for f in files]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not errors
+    assert all(r.inserted_records + r.deduped_records == 60 for r in results)
+    assert sum(r.inserted_records for r in results) == 90
+    assert sum(r.deduped_records for r in results) == 30
+    assert _count("raw_records") == 90
+
+
+@pytest.mark.parametrize("lock_mode", ["none", "advisory"])
+def test_stress_concurrent_shuffled_ingests_do_not_deadlock(monkeypatch, lock_mode):
+    from app.bench.ingest import run_round
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "ingest_batch_size", 100)
+    monkeypatch.setattr(settings, "ingest_lock_mode", lock_mode)
+
+    # 4 workers x 400 shuffled rows, consecutive workers share half their rows
+    result = run_round(4, rows=400, overlap=0.5, seed=3)
+
+    assert result["failures"] == []
+    assert result["inserted"] == 1000
+    assert result["deduped"] == 600
+
+
+def test_cli_ingests_landing_dir_once_per_file_content(tmp_path, monkeypatch, capsys):
+    import gzip
+    import json
+    import sys
+
+    from app.ingestion.__main__ import main
+
+    _truncate_ingestion_tables()
+
+    landing = tmp_path / "landing"
+    landing.mkdir()
+    header = "source_id,event_time,value,category\n"
+    (landing / "a.csv").write_text(header + "l1,2026-04-02T10:00:00Z,1,x\n")
+    (landing / "b.csv.gz").write_bytes(
+        gzip.compress((header + "l2,2026-04-02T11:00:00Z,2,x\n").encode())
+    )
+
+    def run_cli() -> dict:
+        monkeypatch.setattr(sys, "argv", ["app.ingestion", str(landing), "--source", "landing"])
+        assert main() == 0
+        return json.loads(capsys.readouterr().out)
+
+    first = run_cli()
+    assert [f["status"] for f in first["files"]] == ["succeeded", "succeeded"]
+    assert _count("raw_records") == 2
+
+    # a new file lands next to the already-loaded ones
+    (landing / "c.csv").write_text(header + "l3,2026-04-02T12:00:00Z,3,x\n")
+    second = run_cli()
+    assert [f["status"] for f in second["files"]] == ["skipped", "skipped", "succeeded"]
+    assert _count("raw_records") == 3
+    assert _count("ingest_runs") == 3
+
+
+def test_arrow_engine_copies_rows_that_dedupe_against_python_engine(monkeypatch):
+    pytest.importorskip("pyarrow")
+    from app.core.config import settings
+    from app.ingestion.service import ingest_files
+
+    _truncate_ingestion_tables()
+    monkeypatch.setattr(settings, "ingest_batch_size", 2)
+    data = (
+        "source_id,event_time,value,category\n"
+        "e1,2026-04-03T10:00:00Z,1,x\n"
+        "e2,2026-04-03T11:00:00+02:00,2,Café\n"
+        'e3,2026-04-03 12:00:00,3,"q""uote"\n'
+    ).encode()
+
+    with SessionLocal() as db:
+        monkeypatch.setattr(settings, "ingest_engine", "arrow")
+        first = ingest_files(db, "engines", [("a.csv", data)])
+        monkeypatch.setattr(settings, "ingest_engine", "python")
+        second = ingest_files(db, "engines", [("a.csv", data)])
+
+    assert (first.inserted_records, first.deduped_records) == (3, 0)
+    assert (second.inserted_records, second.deduped_records) == (0, 3)
+    assert _count("raw_records") == 3
+
+
+def test_failed_run_resumes_from_its_checkpoint(tmp_path, monkeypatch):
+    from app.core.config import settings
+    from app.db.models import IngestRun
+    from app.ingestion import service
+
+    _truncate_ingestion_tables()
+    monkeypatch.setattr(settings, "ingest_batch_size", 2)
+    path = tmp_path / "big.csv"
+    path.write_text(
+        "source_id,event_time,value,category\n"
+        + "".join(f"r{i},2026-04-04T10:00:0{i}Z,{i},x\n" for i in range(7))
+    )
+
+    real_upsert = service._upsert_batch
+    calls = {"n": 0}
+
+    def flaky_upsert(db, source, batch):
+        calls["n"] += 1
+        if calls["n"] == 3:
+            raise ConnectionError("network blip")
+        return real_upsert(db, source, batch)
+
+    monkeypatch.setattr(service, "_upsert_batch", flaky_upsert)
+    with SessionLocal() as db, path.open("rb") as fh, pytest.raises(ConnectionError):
+        service.ingest_files(db, "resume", [(str(path), fh)])
+
+    with SessionLocal() as db:
+        run = db.query(IngestRun).one()
+        assert run.status == "failed"
+        assert run.checkpoints[str(path)]["rows"] == 4
+        assert _count("raw_records") == 4
+
+        result = service.resume_run(db, run.id)
+
+    assert result.ingest_run_id == run.id
+    assert (result.total_records, result.inserted_records, result.deduped_records) == (7, 3, 0)
+    assert _count("raw_records") == 7
+    with SessionLocal() as db:
+        run = db.get(IngestRun, run.id)
+        assert run.status == "success"
+        assert run.checkpoints[str(path)]["done"] is True
+
+
+def test_quarantine_commits_valid_rows_and_fails_above_error_rate(monkeypatch):
+    from app.core.config import settings
+    from app.ingestion.service import IngestionError, ingest_files
+
+    _truncate_ingestion_tables()
+    monkeypatch.setattr(settings, "ingest_on_error", "quarantine")
+    monkeypatch.setattr(settings, "ingest_max_error_rate", 0.5)
+    data = (
+        b"source_id,event_time,value,category\n"
+        b"q1,2026-04-05T10:00:00Z,1,x\n"
+        b"q2,not-a-time,2,x\n"
+        b"q3,2026-04-05T11:00:00Z,3,x\n"
+    )
+
+    with SessionLocal() as db:
+        result = ingest_files(db, "quarantine", [("q.csv", data)])
+    assert (result.inserted_records, result.rejected_records) == (2, 1)
+    assert _count("raw_records") == 2
+    with SessionLocal() as db:
+        row_num, error = db.execute(text("SELECT row_num, error FROM ingest_rejects")).one()
+    assert row_num == 2 and "not-a-time" in error
+
+    monkeypatch.setattr(settings, "ingest_max_error_rate", 0.1)
+    with SessionLocal() as db, pytest.raises(IngestionError, match="INGEST_MAX_ERROR_RATE"):
+        ingest_files(db, "quarantine", [("q.csv", data)])
+    assert _count("ingest_rejects") == 2
+
+
+def test_resumed_run_checks_the_error_rate_over_the_whole_file(tmp_path, monkeypatch):
+    from app.core.config import settings
+    from app.db.models import IngestRun
+    from app.ingestion import service
+
+    _truncate_ingestion_tables()
+    monkeypatch.setattr(settings, "ingest_batch_size", 2)
+    monkeypatch.setattr(settings, "ingest_on_error", "quarantine")
+    monkeypatch.setattr(settings, "ingest_max_error_rate", 0.1)
+    path = tmp_path / "rejects.csv"
+    path.write_text(
+        "source_id,event_time,value,category\n"
+        + "".join(
+            f"r{i},{'bad' if i == 1 else f'2026-04-06T10:00:0{i}Z'},{i},x\n" for i in range(6)
+        )
+    )
+
+    real_upsert = service._upsert_batch
+    calls = {"n": 0}
+
+    def flaky_upsert(db, source, batch):
+        calls["n"] += 1
+        if calls["n"] == 3:
+            raise ConnectionError("network blip")
+        return real_upsert(db, source, batch)
+
+    monkeypatch.setattr(service, "_upsert_batch", flaky_upsert)
+    with SessionLocal() as db, path.open("rb") as fh, pytest.raises(ConnectionError):
+        service.ingest_files(db, "resume-rejects", [(str(path), fh)])
+
+    with SessionLocal() as db:
+        run = db.query(IngestRun).one()
+        checkpoint = run.checkpoints[str(path)]
+        assert (checkpoint["rows"], checkpoint["rejected"]) == (4, 1)
+        # 1 of 6 rows: the reject read before the failure still counts after resuming
+        with pytest.raises(service.IngestionError, match="Rejected 1 of 6 rows"):
+            service.resume_run(db, run.id)
+
+    monkeypatch.setattr(settings, "ingest_max_error_rate", 0.2)
+    with SessionLocal() as db:
+        result = service.resume_run(db, run.id)
+    assert (result.total_records, result.rejected_records) == (6, 1)
+
+
+def test_failed_status_is_saved_when_the_metrics_refresh_fails_too(tmp_path, monkeypatch):
+    from app.core.config import settings
+    from app.db.models import IngestRun
+    from app.ingestion import service
+
+    _truncate_ingestion_tables()
+    monkeypatch.setattr(settings, "ingest_batch_size", 2)
+    data = (
+        "source_id,event_time,value,category\n"
+        + "".join(f"m{i},2026-04-07T10:00:0{i}Z,{i},x\n" for i in range(4))
+    ).encode()
+
+    real_upsert = service._upsert_batch
+    calls = {"n": 0}
+
+    def flaky_upsert(db, source, batch):
+        calls["n"] += 1
+        if calls["n"] == 2:
+            raise ConnectionError("network blip")
+        return real_upsert(db, source, batch)
+
+    def broken_refresh(db, days):
+        raise ConnectionError("still down")
+
+    monkeypatch.setattr(service, "_upsert_batch", flaky_upsert)
+    monkeypatch.setattr(service, "refresh_daily_metrics", broken_refresh)
+    with SessionLocal() as db, pytest.raises(ConnectionError, match="network blip"):
+        service.ingest_files(db, "refresh-fails", [("m.csv", data)])
+
+    with SessionLocal() as db:
+        run = db.query(IngestRun).one()
+        assert (run.status, run.error) == ("failed", "network blip")
+    assert _count("raw_records") == 2
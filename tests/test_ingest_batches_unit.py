@@ -0,0 +1,76 @@
+# Tests (no DB needed)
+from __future__ import annotations
+
+import random
+
+from app.core.config import settings
+from app.ingestion import service
+
+
+class FakeResult:
+    rowcount = 2
+
+
+class FakeSession:
+    def __init__(self):
+        self.executed = []
+
+    def execute(self, stmt, params=None):
+        self.executed.append((str(stmt), params))
+        return FakeResult()
+
+
+def _values(n):
+    rows = [{"source": "s", "record_hash": f"{i:04x}", "event_time": i} for i in range(n)]
+    random.Random(1).shuffle(rows)
+    return rows
+
+
+def test_upsert_batches_are_key_ordered_and_bounded(monkeypatch):
+    monkeypatch.setattr(settings, "ingest_batch_size", 4)
+
+    batches = service._upsert_batches(_values(10))
+
+    assert [len(b) for b in batches] == [4, 4, 2]
+    hashes = [v["record_hash"] for b in batches for v in b]
+    assert hashes == sorted(hashes)
+
+
+def test_upsert_batches_stay_under_the_bind_parameter_limit(monkeypatch):
+    monkeypatch.setattr(settings, "ingest_batch_size", 10_000)
+    columns = len(service.RawRecord.__table__.columns)
+
+    batches = service._upsert_batches(_values(10_000))
+
+    assert sum(len(b) for b in batches) == 10_000
+    assert max(len(b) for b in batches) * columns <= 65_535
+
+
+def test_advisory_lock_mode_takes_a_per_source_lock_before_inserting(monkeypatch):
+    batch = [
+        {
+            "id": i,
+            "run_id": None,
+            "row_num": i,
+            "payload": {},
+            "ingested_at": None,
+            "source": "s",
+            "record_hash": str(i),
+            "source_id": "x",
+            "event_time": None,
+            "category": "c",
+            "value": "v",
+        }
+        for i in range(2)
+    ]
+
+    monkeypatch.setattr(settings, "ingest_lock_mode", "none")
+    db = FakeSession()
+    assert service._upsert_batch(db, "s", batch) == 2
+    assert len(db.executed) == 1 and db.executed[0][0].startswith("INSERT INTO raw_records")
+
+    monkeypatch.setattr(settings, "ingest_lock_mode", "advisory")
+    db = FakeSession()
+    service._upsert_batch(db, "s", batch)
+    assert "pg_advisory_xact_lock" in db.executed[0][0]
+    assert db.executed[0][1] == {"key": "raw_records:s"}
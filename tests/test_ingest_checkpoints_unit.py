@@ -0,0 +1,74 @@
+# Tests (no DB needed)
+from __future__ import annotations
+
+import gzip
+import io
+import uuid
+from itertools import islice
+
+import pytest
+from openpyxl import Workbook
+
+from app.core.config import settings
+from app.ingestion.service import _open_rows, _python_batches
+
+HEADER = "source_id,event_time,value,category\n"
+CSV = (
+    HEADER
+    + "".join(f'c{i},2026-03-01T10:00:0{i}Z,{i},"multi\nline"\n' for i in range(3))
+    + "".join(f"c{i},2026-03-01T10:00:0{i}Z,{i},x\n" for i in range(3, 6))
+).encode()
+
+
+def _zstd(data: bytes) -> bytes:
+    zstandard = pytest.importorskip("zstandard")
+    return zstandard.ZstdCompressor().compress(data)
+
+
+@pytest.mark.parametrize(
+    ("name", "encode"),
+    [("a.csv", lambda d: d), ("a.csv.gz", gzip.compress), ("a.csv.zst", _zstd)],
+)
+def test_csv_resumes_from_byte_offset(name, encode):
+    data = encode(CSV)
+    rows = _open_rows(name, data)
+    first = list(islice(rows, 4))
+    checkpoint = {"rows": 4, "offset": rows.offset}
+
+    rest = list(_open_rows(name, io.BytesIO(data), checkpoint))
+
+    assert [r["source_id"] for r in first + rest] == [f"c{i}" for i in range(6)]
+    assert first[0]["category"] == "multi\nline"
+
+
+def test_row_index_checkpoint_skips_rows_for_other_formats():
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["source_id", "event_time", "value", "category"])
+    for i in range(5):
+        ws.append([f"x{i}", "2026-03-01T10:00:00Z", i, "c"])
+    buf = io.BytesIO()
+    wb.save(buf)
+    ndjson = b"".join(
+        b'{"source_id": "x%d", "event_time": "2026-03-01T10:00:00Z", "value": 1, "category": "c"}\n'
+        % i
+        for i in range(5)
+    )
+
+    for name, data in (("a.xlsx", buf.getvalue()), ("a.ndjson", ndjson)):
+        rest = list(_open_rows(name, data, {"rows": 3, "offset": None}))
+        assert [r["source_id"] for r in rest] == ["x3", "x4"]
+
+
+def test_python_batches_carry_checkpoints_and_continue_row_numbers(monkeypatch):
+    monkeypatch.setattr(settings, "ingest_batch_size", 2)
+    rows = _open_rows("a.csv", CSV, {"rows": 1, "offset": None})
+
+    batches = list(_python_batches(None, uuid.uuid4(), "s", rows, first_row_num=2))
+
+    assert [b.row_count for b in batches] == [2, 2, 1]
+    assert [b.checkpoint["rows"] for b in batches] == [3, 5, 6]
+    assert batches[-1].checkpoint["offset"] == len(CSV)
+    # write() upserts the batch's values; row numbers continue after the checkpoint
+    values = [v for b in batches for v in b.write.args[2]]
+    assert [v["row_num"] for v in values] == [2, 3, 4, 5, 6]
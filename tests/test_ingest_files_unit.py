@@ -0,0 +1,219 @@
+# Tests (no DB needed)
+from __future__ import annotations
+
+import gzip
+import hashlib
+import io
+import json
+import sys
+import uuid
+from datetime import UTC, datetime
+from decimal import Decimal
+
+import pytest
+from openpyxl import Workbook
+
+from app.core.config import settings
+from app.ingestion.files import expand_paths, file_sha256
+from app.ingestion.service import IngestionError, _open_rows, _raw_values
+
+CSV = b"source_id,event_time,value,category\na1,2026-03-01T10:00:00Z,10,Food\n"
+
+
+def _xlsx() -> bytes:
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["source_id", "event_time", "value", "category"])
+    ws.append(["a1", "2026-03-01T10:00:00Z", 10, "Food"])
+    buf = io.BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+def test_expand_paths_walks_dirs_and_globs_and_skips_unsupported(tmp_path):
+    landing = tmp_path / "landing"
+    (landing / "2026" / "03").mkdir(parents=True)
+    (landing / "a.csv").write_bytes(CSV)
+    (landing / "2026" / "03" / "b.csv.gz").write_bytes(gzip.compress(CSV))
+    (landing / "notes.txt").write_text("x")
+    (landing / ".c.csv.gz").write_bytes(b"partial upload")
+    (tmp_path / "d.xlsx").write_bytes(_xlsx())
+
+    found = expand_paths([str(landing), str(tmp_path / "*.xlsx"), str(landing / "a.csv")])
+
+    assert [p.name for p in found] == ["d.xlsx", "b.csv.gz", "a.csv"]
+
+
+def test_expand_paths_rejects_missing_path(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        expand_paths([str(tmp_path / "nope.csv")])
+
+
+def test_file_sha256_hashes_stored_bytes(tmp_path):
+    path = tmp_path / "a.csv.gz"
+    data = gzip.compress(CSV)
+    path.write_bytes(data)
+
+    assert file_sha256(path) == hashlib.sha256(data).hexdigest()
+
+
+@pytest.mark.parametrize(
+    ("name", "data"),
+    [
+        ("a.csv", CSV),
+        ("a.CSV.GZ", gzip.compress(CSV)),
+        ("a.xlsx", _xlsx()),
+        ("a.xlsx.gz", gzip.compress(_xlsx())),
+    ],
+)
+def test_open_rows_decompresses_and_streams(name, data):
+    rows = list(_open_rows(name, io.BytesIO(data)))
+
+    assert len(rows) == 1
+    assert rows[0]["source_id"] == "a1"
+    assert str(rows[0]["value"]) == "10"
+
+
+def test_open_rows_reads_zstd():
+    zstandard = pytest.importorskip("zstandard")
+    data = zstandard.ZstdCompressor().compress(CSV)
+
+    rows = list(_open_rows("a.csv.zst", data))
+
+    assert rows[0]["category"] == "Food"
+
+
+def test_open_rows_validates_headers_before_streaming():
+    with pytest.raises(IngestionError, match="Missing required columns"):
+        _open_rows("a.csv.gz", gzip.compress(b"source_id,value\na1,10\n"))
+
+
+def test_open_rows_rejects_unknown_type():
+    with pytest.raises(IngestionError, match="Unsupported file type"):
+        _open_rows("a.json.gz", gzip.compress(b"{}"))
+
+
+NDJSON = (
+    b'{"source_id": "a1", "event_time": "2026-03-01T10:00:00Z", "value": 10, "category": "Food"}\n'
+    b"\n"
+    b'{"source_id": "a2", "event_time": "2026-03-01T11:00:00Z", "value": 11, "category": "Food",'
+    b' "extra": {"k": 1}}\n'
+)
+
+
+@pytest.mark.parametrize("name", ["a.ndjson", "a.jsonl.gz"])
+def test_open_rows_streams_ndjson(name):
+    data = gzip.compress(NDJSON) if name.endswith(".gz") else NDJSON
+
+    rows = list(_open_rows(name, data))
+
+    assert [r["source_id"] for r in rows] == ["a1", "a2"]
+    assert rows[1]["extra"] == {"k": 1}
+
+
+def test_ndjson_works_without_orjson(monkeypatch):
+    monkeypatch.setitem(sys.modules, "orjson", None)
+
+    assert len(list(_open_rows("a.ndjson", NDJSON))) == 2
+
+
+def test_ndjson_rejects_bad_lines():
+    with pytest.raises(IngestionError, match="Missing required columns"):
+        _open_rows("a.ndjson", b'{"source_id": "a1"}\n')
+    with pytest.raises(IngestionError, match="line 2"):
+        list(_open_rows("a.ndjson", NDJSON.splitlines()[0] + b"\n{oops\n"))
+    with pytest.raises(IngestionError, match="not a JSON object"):
+        list(_open_rows("a.ndjson", NDJSON.splitlines()[0] + b"\n[1, 2]\n"))
+
+
+def test_parquet_rows_keep_typed_event_time(monkeypatch):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    monkeypatch.setattr(settings, "ingest_batch_size", 2)
+
+    ts = [datetime(2026, 3, 1, 10, i, tzinfo=UTC) for i in range(5)]
+    table = pa.table(
+        {
+            "source_id": [f"p{i}" for i in range(5)],
+            "event_time": pa.array(ts, type=pa.timestamp("us", tz="UTC")),
+            "value": [Decimal("1.50")] * 5,
+            "category": ["Food"] * 5,
+        }
+    )
+    buf = io.BytesIO()
+    pq.write_table(table, buf)
+
+    rows = list(_open_rows("a.parquet", buf.getvalue()))
+
+    assert [r["event_time"] for r in rows] == ts
+    values = _raw_values(uuid.uuid4(), "s", 1, rows[0], datetime.now(UTC))
+    assert values["event_time"] == ts[0]
+    assert values["value"] == "1.50"
+    # the payload column is JSONB: typed cells are stored as JSON values
+    assert json.loads(json.dumps(values["payload"]))["event_time"] == ts[0].isoformat()
+
+
+def test_parquet_without_pyarrow_is_a_clear_error(monkeypatch):
+    monkeypatch.setitem(sys.modules, "pyarrow.parquet", None)
+
+    with pytest.raises(IngestionError, match="optional 'pyarrow'"):
+        _open_rows("a.parquet", b"PAR1")
+
+
+class _RollbackSession:
+    def __init__(self):
+        self.rolled_back = 0
+
+    def rollback(self):
+        self.rolled_back += 1
+
+    def close(self):
+        pass
+
+
+def test_cli_keeps_going_when_the_failed_run_lookup_fails(tmp_path, monkeypatch):
+    from app.ingestion import __main__ as cli
+
+    (tmp_path / "a.csv").write_bytes(CSV)
+    (tmp_path / "b.csv").write_bytes(CSV + b"a2,2026-03-01T11:00:00Z,11,Food\n")
+    lookups = {"n": 0}
+
+    def resumable_run(db, source, digest):
+        lookups["n"] += 1
+        if lookups["n"] == 2:  # after a.csv failed: the session is still broken
+            raise RuntimeError("current transaction is aborted")
+        return None
+
+    def ingest_files(db, source, files, content_hash):
+        if files[0][0].endswith("a.csv"):
+            raise RuntimeError("connection lost")
+        return cli.IngestResult(uuid.uuid4(), 2, 2, 0, {}, uuid.uuid4())
+
+    monkeypatch.setattr(cli, "already_ingested", lambda *a: False)
+    monkeypatch.setattr(cli, "resumable_run", resumable_run)
+    monkeypatch.setattr(cli, "ingest_files", ingest_files)
+    db = _RollbackSession()
+
+    results, exit_code = cli._ingest_paths(db, "s", sorted(tmp_path.glob("*.csv")), False)
+
+    assert exit_code == 1 and db.rolled_back == 2
+    assert [r["status"] for r in results] == ["failed", "succeeded"]
+    assert results[0]["error"] == "connection lost" and results[0]["ingest_run_id"] is None
+
+
+def test_cli_failed_resume_prints_error_json(monkeypatch, capsys):
+    from app.ingestion import __main__ as cli
+
+    run_id = uuid.uuid4()
+
+    def resume_run(db, ingest_run_id):
+        raise IngestionError(f"Ingest run not found: {ingest_run_id}")
+
+    monkeypatch.setattr(cli, "SessionLocal", _RollbackSession)
+    monkeypatch.setattr(cli, "resume_run", resume_run)
+    monkeypatch.setattr(sys, "argv", ["ingest", "--resume", str(run_id)])
+
+    assert cli.main() == 1
+    out = json.loads(capsys.readouterr().out)
+    assert out["status"] == "failed" and out["ingest_run_id"] == str(run_id)
+    assert "not found" in out["error"]
@@ -0,0 +1,115 @@
+# Tests (no DB needed)
+from __future__ import annotations
+
+import uuid
+
+import pytest
+
+from app.core.config import settings
+from app.ingestion import service
+
+CSV = (
+    b"source_id,event_time,value,category\n"
+    b"g1,2026-03-01T10:00:00Z,1,x\n"
+    b"b1,yesterday,2,x\n"
+    b"g2,2026-03-01T11:00:00Z,3,x\n"
+    b"b2,,4,x\n"
+)
+
+
+class FakeResult:
+    rowcount = 1
+
+
+class FakeSession:
+    def __init__(self):
+        self.executed = []
+
+    def execute(self, stmt, params=None):
+        self.executed.append(str(stmt))
+        return FakeResult()
+
+
+def _batches(name: str = "a.csv", data: bytes = CSV):
+    return list(service._open_batches(None, uuid.uuid4(), "s", name, data))
+
+
+def test_fail_mode_raises_on_the_first_bad_row(monkeypatch):
+    monkeypatch.setattr(settings, "ingest_on_error", "fail")
+
+    with pytest.raises(service.IngestionError, match="Invalid event_time"):
+        _batches()
+
+
+def test_quarantine_mode_sets_bad_rows_aside(monkeypatch):
+    monkeypatch.setattr(settings, "ingest_on_error", "quarantine")
+    monkeypatch.setattr(settings, "ingest_batch_size", 3)
+
+    batches = _batches()
+
+    assert [(b.row_count, b.rejected) for b in batches] == [(3, 1), (1, 1)]
+    values = [v for b in batches for v in b.write.args[2]]
+    rejects = [r for b in batches for r in b.write.args[3]]
+    assert [(v["row_num"], v["source_id"]) for v in values] == [(1, "g1"), (3, "g2")]
+    assert [(r["row_num"], r["filename"]) for r in rejects] == [(2, "a.csv"), (4, "a.csv")]
+    assert rejects[0]["payload"]["event_time"] == "yesterday"
+    assert "Invalid event_time" in rejects[0]["error"]
+    assert rejects[1]["error"] == "event_time is required"
+
+
+def test_rejects_are_written_in_bulk_with_the_batch(monkeypatch):
+    monkeypatch.setattr(settings, "ingest_on_error", "quarantine")
+    (batch,) = _batches()
+    assert batch.rejected == 2
+    db = FakeSession()
+
+    service._upsert_values(db, "s", batch.write.args[2], batch.write.args[3])
+
+    assert db.executed[0].startswith("INSERT INTO ingest_rejects")
+    assert sum(s.startswith("INSERT INTO ingest_rejects") for s in db.executed) == 1
+    assert db.executed[-1].startswith("INSERT INTO raw_records")
+
+
+def test_error_rate_threshold(monkeypatch):
+    monkeypatch.setattr(settings, "ingest_max_error_rate", 0.25)
+    monkeypatch.setattr(settings, "ingest_error_rate_min_rows", 0)
+
+    service._check_error_rate(1, 4)
+    with pytest.raises(service.IngestionError, match="Rejected 2 of 4 rows"):
+        service._check_error_rate(2, 4)
+
+
+def test_error_rate_waits_for_a_minimum_sample_until_the_end(monkeypatch):
+    monkeypatch.setattr(settings, "ingest_max_error_rate", 0.01)
+    monkeypatch.setattr(settings, "ingest_error_rate_min_rows", 100)
+
+    service._check_error_rate(5, 50)  # early cluster: not enforced yet
+    service._check_error_rate(5, 1000)  # diluted below the limit by the end
+    with pytest.raises(service.IngestionError, match="Rejected 5 of 100 rows"):
+        service._check_error_rate(5, 100)
+    with pytest.raises(service.IngestionError, match="Rejected 5 of 50 rows"):
+        service._check_error_rate(5, 50, final=True)
+
+
+def test_rejects_insert_stays_under_the_bind_parameter_limit():
+    db = FakeSession()
+    rejects = [{"id": i} for i in range(20_000)]
+
+    service._upsert_values(db, "s", [], rejects)
+
+    per_statement = service._max_rows(service.IngestReject.__table__)
+    assert per_statement * len(service.IngestReject.__table__.columns) <= 65_535
+    assert len(db.executed) == -(-20_000 // per_statement)
+
+
+def test_arrow_engine_quarantines_through_the_python_path(monkeypatch):
+    pytest.importorskip("pyarrow")
+    monkeypatch.setattr(settings, "ingest_engine", "arrow")
+    monkeypatch.setattr(settings, "ingest_on_error", "quarantine")
+    good = b"source_id,event_time,value,category\ng1,2026-03-01T10:00:00Z,1,x\n"
+
+    # a clean batch stays columnar; one with a bad row is handed to the Python engine
+    assert [b.rejected for b in _batches(data=good)] == [0]
+    batches = _batches()
+    assert sum(b.rejected for b in batches) == 2
+    assert [r["row_num"] for b in batches for r in b.write.args[3]] == [2, 4]
@@ -0,0 +1,90 @@
+# Tests (no DB needed)
+from __future__ import annotations
+
+import io
+import json
+import logging
+import logging.handlers
+import queue
+
+from app.observability.logging import AsyncQueueHandler, JsonFormatter, RateLimitFilter
+
+
+def _async_logger(name: str, q: queue.Queue) -> logging.Logger:
+    logger = logging.getLogger(name)
+    logger.handlers.clear()
+    logger.setLevel(logging.INFO)
+    logger.addHandler(AsyncQueueHandler(q))
+    logger.propagate = False
+    return logger
+
+
+def test_async_handler_defers_json_encoding_to_listener():
+    q: queue.Queue = queue.Queue()
+    logger = _async_logger("test_async_log", q)
+    stream = io.StringIO()
+    out = logging.StreamHandler(stream)
+    out.setFormatter(JsonFormatter())
+    listener = logging.handlers.QueueListener(q, out)
+    listener.start()
+    try:
+        logger.info("step_%s", "started", extra={"run_id": "r1", "rows": 3})
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("step_failed")
+    finally:
+        listener.stop()
+
+    events = [json.loads(ln) for ln in stream.getvalue().splitlines()]
+    assert events[0]["message"] == "step_started"
+    assert events[0]["run_id"] == "r1" and events[0]["rows"] == 3
+    assert "taskName" not in events[0]
+    assert "ValueError: boom" in events[1]["exc_info"]
+
+
+def test_async_handler_snapshots_dict_extras_at_log_time():
+    q: queue.Queue = queue.Queue()
+    logger = _async_logger("test_async_meta", q)
+    meta = {"filename": "a.csv"}
+
+    logger.info("step_started", extra={"meta": meta, "files": ["a.csv"]})
+    meta["inserted"] = 3  # the step moves on before the listener formats the record
+
+    record = q.get_nowait()
+    assert record.meta == {"filename": "a.csv"}
+    assert record.meta is not meta
+    assert record.files == ["a.csv"]
+
+
+def test_async_handler_drops_instead_of_blocking_when_queue_is_full():
+    q: queue.Queue = queue.Queue(maxsize=1)
+    logger = _async_logger("test_async_full", q)
+
+    logger.info("a")
+    logger.info("b")  # must not block or raise
+
+    assert q.qsize() == 1
+
+
+def test_rate_limit_filter_suppresses_bursts_but_never_warnings():
+    f = RateLimitFilter(per_second=0.001, burst=2)
+
+    def rec(level: int) -> logging.LogRecord:
+        return logging.LogRecord("x", level, __file__, 1, "upsert_batch", None, None)
+
+    assert [f.filter(rec(logging.INFO)) for _ in range(4)] == [True, True, False, False]
+    assert f.filter(rec(logging.WARNING)) is True
+
+
+def test_rate_limit_filter_evicts_least_recently_seen_keys():
+    f = RateLimitFilter(per_second=0.001, burst=1, max_keys=2)
+
+    def rec(msg: str) -> logging.LogRecord:
+        return logging.LogRecord("x", logging.INFO, __file__, 1, msg, None, None)
+
+    assert f.filter(rec("a")) and f.filter(rec("b"))
+    assert f.filter(rec("a")) is False  # "a" is now the most recently seen
+    assert f.filter(rec("c")) is True  # evicts "b"
+
+    assert list(f._buckets) == [("x", "a"), ("x", "c")]
@@ -0,0 +1,85 @@
+# Tests (no DB needed)
+from __future__ import annotations
+
+import logging
+import threading
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.observability.metrics import STEP_DURATION, Counter, Histogram, MetricsRegistry
+from app.observability.run_tracking import RunTracker
+
+
+class NullWriter:
+    def insert(self, run_id, values):
+        pass
+
+    def update(self, run_id, values):
+        pass
+
+    def append_steps(self, run_id, steps):
+        pass
+
+    def flush(self, timeout=None):
+        return True
+
+
+def test_counter_sums_per_thread_shards():
+    c = Counter("t_total", "test", ("pipeline",))
+
+    def work():
+        for _ in range(1000):
+            c.inc(pipeline="ingest")
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert c.value(pipeline="ingest") == 4000
+    assert 't_total{pipeline="ingest"} 4000' in c.render()
+
+
+def test_histogram_renders_cumulative_buckets():
+    h = Histogram("t_seconds", "test", ("step",), buckets=(0.1, 1.0))
+    h.observe(0.05, step="a")
+    h.observe(0.5, step="a")
+    h.observe(5, step="a")
+
+    lines = h.render()
+    assert 't_seconds_bucket{step="a",le="0.1"} 1' in lines
+    assert 't_seconds_bucket{step="a",le="1"} 2' in lines
+    assert 't_seconds_bucket{step="a",le="+Inf"} 3' in lines
+    assert 't_seconds_count{step="a"} 3' in lines
+    assert h.count(step="a") == 3
+
+
+def test_registry_returns_existing_metric_and_runs_collectors():
+    reg = MetricsRegistry()
+    assert reg.counter("x_total", "x") is reg.counter("x_total", "x")
+    reg.register_collector(lambda: ["# TYPE y gauge", "y 1"])
+    assert "y 1" in reg.render()
+
+
+def test_run_tracker_feeds_step_histogram():
+    logger = logging.getLogger("test_metrics")
+    tracker = RunTracker(logger=logger, pipeline="metrics_probe", writer=NullWriter())
+    with tracker.step("apply_sql"):
+        pass
+    tracker.succeed(records_in=3, records_out=2)
+
+    assert STEP_DURATION.count(pipeline="metrics_probe", step="apply_sql", status="ok") == 1
+
+
+def test_metrics_endpoint_exposes_request_latency_by_route():
+    c = TestClient(app)
+    assert c.get("/health").status_code == 200
+
+    r = c.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'd2d_http_request_duration_seconds_count{method="GET",route="/health",status="200"}' in (
+        r.text
+    )
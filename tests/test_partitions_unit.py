@@ -0,0 +1,64 @@
+# Tests (no DB needed)
+from __future__ import annotations
+
+from datetime import date
+
+from app.db.partitions import add_months, ensure_partitions, partition_name
+
+
+class FakeResult:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar(self):
+        return self.value
+
+
+class FakeSession:
+    """Knows which relations exist and whether the default partition has rows in range."""
+
+    def __init__(self, existing=(), default_has_rows=False):
+        self.existing = set(existing)
+        self.default_has_rows = default_has_rows
+        self.executed = []
+
+    def execute(self, stmt, params=None):
+        sql = str(stmt)
+        self.executed.append(sql)
+        if "to_regclass" in sql:
+            return FakeResult(params["name"] in self.existing)
+        if "SELECT EXISTS" in sql:
+            return FakeResult(self.default_has_rows)
+        return FakeResult(None)
+
+
+def test_add_months_and_partition_names():
+    assert add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+    assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+    assert partition_name("clean.clean_records", date(2026, 3, 1)) == (
+        "clean.clean_records_p2026_03"
+    )
+
+
+def test_ensure_partitions_creates_only_missing_months():
+    db = FakeSession(existing={"public.raw_records_p2026_02"})
+
+    created = ensure_partitions(db, "public.raw_records", date(2026, 1, 15), date(2026, 3, 1))
+
+    assert created == ["public.raw_records_p2026_01", "public.raw_records_p2026_03"]
+    creates = [s for s in db.executed if s.startswith("CREATE TABLE")]
+    assert creates[0] == (
+        "CREATE TABLE public.raw_records_p2026_01 PARTITION OF public.raw_records "
+        "FOR VALUES FROM ('2026-01-01 00:00:00+00') TO ('2026-02-01 00:00:00+00')"
+    )
+
+
+def test_month_with_rows_in_default_partition_is_moved_then_attached():
+    db = FakeSession(existing={"public.raw_records_default"}, default_has_rows=True)
+
+    ensure_partitions(db, "public.raw_records", date(2026, 5, 1), date(2026, 5, 1))
+
+    ddl = [s for s in db.executed if "to_regclass" not in s and "SELECT EXISTS" not in s]
+    assert ddl[0].startswith("CREATE TABLE public.raw_records_p2026_05 (LIKE")
+    assert "DELETE FROM public.raw_records_default" in ddl[1]
+    assert ddl[2].startswith("ALTER TABLE public.raw_records ATTACH PARTITION")
@@ -0,0 +1,49 @@
+# Tests (no DB needed)
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+from app.cleaning.pipeline import CleaningConfig, clean_row
+from app.ingestion.payload import full_payload, stored_payload
+
+ROW = {
+    "source_id": " A-1 ",
+    "event_time": "2026-01-05T10:00:00Z",
+    "category": "Sales",
+    "value": "$12.50",
+    "channel": "web",
+}
+TYPED = {
+    "source_id": "A-1",
+    "event_time": datetime(2026, 1, 5, 10, tzinfo=UTC),
+    "category": "sales",
+    "value": "$12.50",
+}
+
+
+def test_extras_mode_keeps_only_non_denormalized_columns():
+    assert stored_payload(ROW, "extras") == {"channel": "web"}
+    assert stored_payload(ROW, "full") is ROW
+
+
+def test_full_payload_rebuilds_row_from_typed_columns_plus_extras():
+    rebuilt = full_payload({"channel": "web"}, **TYPED)
+    assert rebuilt == {
+        "source_id": "A-1",
+        "event_time": "2026-01-05T10:00:00+00:00",
+        "category": "sales",
+        "value": "$12.50",
+        "channel": "web",
+    }
+    # rows stored in full mode are passed through unchanged
+    assert full_payload(ROW, **TYPED) == ROW
+
+
+def test_cleaning_an_extras_row_matches_the_full_row_up_to_normalization():
+    cfg = CleaningConfig(allowed_keys={"source_id", "event_time", "value", "category"})
+    from_full = clean_row(full_payload(ROW, **TYPED), cfg)
+    from_extras = clean_row(full_payload(stored_payload(ROW, "extras"), **TYPED), cfg)
+
+    assert from_extras["value"] == from_full["value"]
+    assert from_extras["category"].lower() == from_full["category"].lower()
+    assert set(from_extras) == set(from_full)
@@ -9,22 +9,48 @@ import pytest
 
 from app.observability.logging import JsonFormatter
 from app.observability.run_tracking import RunTracker
+from app.observability.run_writer import RunWriter, _coalesce, _Op
 
 
-class FakeSession:
-    """Unit-test DB session: no real database, just records calls."""
+class FakeWriter:
+    """Unit-test run writer: no real database, just records calls."""
 
     def __init__(self):
-        self.added = []
+        self.inserted = []
+        self.updates = []
+        self.steps = []
         self.flushed = 0
+
+    def insert(self, run_id, values):
+        self.inserted.append((run_id, values))
+
+    def update(self, run_id, values):
+        self.updates.append((run_id, values))
+
+    def append_steps(self, run_id, steps):
+        self.steps.extend(steps)
+
+    def flush(self, timeout=None):
+        self.flushed += 1
+        return True
+
+
+class FakeSession:
+    """Unit-test DB session for RunWriter: records executed statements."""
+
+    def __init__(self):
+        self.executed = []
         self.committed = 0
         self.rolled_back = 0
 
-    def add(self, obj):
-        self.added.append(obj)
+    def __enter__(self):
+        return self
 
-    def flush(self):
-        self.flushed += 1
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, stmt):
+        self.executed.append(stmt)
 
     def commit(self):
         self.committed += 1
@@ -52,14 +78,19 @@ def parse_lines(stream: io.StringIO) -> list[dict]:
 
 
 def test_run_tracker_creates_running_row_and_logs_run_started():
-    db = FakeSession()
+    writer = FakeWriter()
     logger, stream = make_json_logger()
 
-    tracker = RunTracker(db=db, logger=logger, pipeline="flags", input_ref="sample.csv")
+    tracker = RunTracker(logger=logger, pipeline="flags", input_ref="sample.csv", writer=writer)
 
     assert tracker.row.status == "running"
     assert tracker.row.pipeline == "flags"
-    assert db.flushed == 1
+    assert len(writer.inserted) == 1
+    run_id, values = writer.inserted[0]
+    assert run_id == tracker.run_id
+    assert values["status"] == "running"
+    # creation is queued, not awaited
+    assert writer.flushed == 0
 
     events = parse_lines(stream)
     assert any(e["message"] == "run_started" for e in events)
@@ -67,10 +98,10 @@ def test_run_tracker_creates_running_row_and_logs_run_started():
 
 
 def test_step_timer_records_success_step_and_duration():
-    db = FakeSession()
+    writer = FakeWriter()
     logger, stream = make_json_logger()
 
-    tracker = RunTracker(db=db, logger=logger, pipeline="flags")
+    tracker = RunTracker(logger=logger, pipeline="flags", writer=writer)
     with tracker.step("fetch_raw"):
         pass
 
@@ -79,17 +110,19 @@ def test_step_timer_records_success_step_and_duration():
     assert step.step == "fetch_raw"
     assert step.status == "ok"
     assert step.duration_ms >= 0
+    # steps are appended as they complete
+    assert [s["step"] for s in writer.steps] == ["fetch_raw"]
 
     events = parse_lines(stream)
     assert any(e["message"] == "step_started" and e["step"] == "fetch_raw" for e in events)
     assert any(e["message"] == "step_succeeded" and e["step"] == "fetch_raw" for e in events)
 
 
-def test_run_tracker_fail_marks_failed_and_rolls_back_and_persists_error():
-    db = FakeSession()
+def test_run_tracker_fail_marks_failed_and_persists_error():
+    writer = FakeWriter()
     logger, stream = make_json_logger()
 
-    tracker = RunTracker(db=db, logger=logger, pipeline="flags")
+    tracker = RunTracker(logger=logger, pipeline="flags", writer=writer)
 
     with pytest.raises(ValueError):
         with tracker.step("write_report"):
@@ -98,10 +131,12 @@ def test_run_tracker_fail_marks_failed_and_rolls_back_and_persists_error():
     # the step is recorded as failed
     assert tracker.steps[-1].status == "failed"
 
-    # when we explicitly fail the run, it rolls back then commits status
+    # failing the run queues the final status and waits for it to be written
     tracker.fail(ValueError("boom"))
-    assert db.rolled_back == 1
-    assert db.committed == 1
+    assert writer.flushed == 1
+    _, final = writer.updates[-1]
+    assert final["status"] == "failed"
+    assert final["error_type"] == "ValueError"
 
     assert tracker.row.status == "failed"
     assert tracker.row.error_type == "ValueError"
@@ -113,10 +148,10 @@ def test_run_tracker_fail_marks_failed_and_rolls_back_and_persists_error():
 
 
 def test_fail_sets_finished_and_error_summary():
-    db = FakeSession()
+    writer = FakeWriter()
     logger, stream = make_json_logger()
 
-    tracker = RunTracker(db=db, logger=logger, pipeline="flags")
+    tracker = RunTracker(logger=logger, pipeline="flags", writer=writer)
 
     # simulate a failing step
     with pytest.raises(RuntimeError):
@@ -132,3 +167,169 @@ def test_fail_sets_finished_and_error_summary():
     # error_summary should contain the error message
     assert getattr(tracker.row, "error_summary", None) is not None
     assert "kaboom" in (tracker.row.error_summary or "")
+
+
+def test_quiet_steps_skip_progress_logs_but_are_persisted():
+    writer = FakeWriter()
+    logger, stream = make_json_logger()
+
+    tracker = RunTracker(logger=logger, pipeline="ingest", writer=writer)
+    for i in range(3):
+        with tracker.step("upsert_batch", meta={"batch": i}, quiet=True):
+            pass
+
+    assert [s["meta"]["batch"] for s in writer.steps] == [0, 1, 2]
+    events = parse_lines(stream)
+    assert not any(e.get("step") == "upsert_batch" for e in events)
+
+
+def test_coalesce_folds_events_into_one_statement_per_run():
+    ops = [
+        _Op("insert", "r1", values={"status": "running", "steps": []}),
+        _Op("append_steps", "r1", steps=[{"step": "a"}]),
+        _Op("update", "r2", values={"records_in": 1}),
+        _Op("append_steps", "r2", steps=[{"step": "b"}]),
+        _Op("update", "r1", values={"status": "succeeded"}),
+        _Op("flush"),
+    ]
+    order, flushes = _coalesce(ops)
+
+    assert [(o.kind, o.run_id) for o in order] == [("insert", "r1"), ("update", "r2")]
+    assert order[0].values["status"] == "succeeded"
+    assert order[0].steps == [{"step": "a"}]
+    assert order[1].steps == [{"step": "b"}]
+    assert len(flushes) == 0  # flush op without an event
+
+
+def test_run_writer_uses_its_own_sessions_and_commits_per_batch():
+    sessions: list[FakeSession] = []
+
+    def factory():
+        sessions.append(FakeSession())
+        return sessions[-1]
+
+    writer = RunWriter(session_factory=factory)
+    logger, _ = make_json_logger()
+    tracker = RunTracker(logger=logger, pipeline="flags", writer=writer)
+    with tracker.step("s1"):
+        pass
+    tracker.succeed(records_in=1, records_out=1)
+
+    assert sessions, "writer should open its own session"
+    assert all(s.committed == 1 for s in sessions)
+    assert sum(len(s.executed) for s in sessions) >= 1
+
+
+def test_run_writer_failure_only_drops_the_bad_runs_events():
+    sessions: list[FakeSession] = []
+
+    class FailingSession(FakeSession):
+        def execute(self, stmt):
+            if "bad" in stmt.compile().params.values():
+                raise TypeError("Object of type set is not JSON serializable")
+            super().execute(stmt)
+
+    def factory():
+        sessions.append(FailingSession())
+        return sessions[-1]
+
+    writer = RunWriter(session_factory=factory)
+    writer._apply_batch(
+        [
+            _Op("insert", "r1", values={"status": "running"}),
+            _Op("update", "r2", values={"status": "bad"}),
+            _Op("update", "r3", values={"status": "succeeded"}),
+        ]
+    )
+
+    # the batch transaction rolls back, then each run is retried on its own
+    assert sessions[0].rolled_back == 1 and sessions[0].committed == 0
+    assert [(len(s.executed), s.committed) for s in sessions[1:]] == [(1, 1), (0, 0), (1, 1)]
+
+
+def test_step_profile_is_off_by_default(monkeypatch):
+    monkeypatch.delenv("D2D_STEP_PROFILE", raising=False)
+    writer = FakeWriter()
+    tracker = RunTracker(logger=logging.getLogger("t_prof_off"), pipeline="t", writer=writer)
+    with tracker.step("s"):
+        pass
+
+    assert "profile" not in writer.steps[0]
+
+
+def test_step_profile_records_cpu_sql_and_rows_per_sec():
+    import sqlalchemy as sa
+
+    writer = FakeWriter()
+    tracker = RunTracker(
+        logger=logging.getLogger("t_prof"), pipeline="t", writer=writer, profile_steps="tracemalloc"
+    )
+    engine = sa.create_engine("sqlite://")
+    with tracker.step("load", meta={"row_count": 500}), engine.connect() as conn:
+        for _ in range(3):
+            conn.execute(sa.text("SELECT 1"))
+        _ = [bytearray(1024) for _ in range(256)]
+
+    prof = writer.steps[0]["profile"]
+    assert prof["sql_statements"] == 3
+    assert prof["sql_ms"] >= 0 and prof["cpu_ms"] >= 0
+    assert prof["max_rss_delta_kb"] >= 0
+    assert prof["py_heap_peak_kb"] > 0
+    assert prof["rows_per_sec"] > 0
+    json.dumps(writer.steps[0])  # persisted as JSONB
+
+    # statements outside a profiled step are not counted
+    with tracker.step("idle"):
+        pass
+    with engine.connect() as conn:
+        conn.execute(sa.text("SELECT 1"))
+    assert writer.steps[1]["profile"]["sql_statements"] == 0
+
+
+def test_step_profile_failed_statement_does_not_skew_later_timings(monkeypatch):
+    import sqlalchemy as sa
+
+    from app.observability import step_profile
+
+    clock = iter([100.0, 500.0, 501.0])  # failed start, then one 1s statement
+    monkeypatch.setattr(step_profile.time, "perf_counter", lambda: next(clock))
+    profiler = step_profile.StepProfiler()
+    step_profile.install_sql_hooks()
+    step_profile._active().append(profiler._sql)
+    engine = sa.create_engine("sqlite://")
+    try:
+        with engine.connect() as conn:
+            with pytest.raises(sa.exc.OperationalError):
+                conn.execute(sa.text("SELECT * FROM missing_table"))
+            conn.execute(sa.text("SELECT 1"))
+            # nothing is left behind on the pooled connection for later statements
+            assert not conn.info.get("_d2d_t0")
+    finally:
+        step_profile._active().remove(profiler._sql)
+
+    assert profiler._sql.statements == 1
+    assert profiler._sql.seconds == 1.0
+
+
+def test_run_profile_writes_artifacts_and_records_paths(monkeypatch, tmp_path):
+    import pstats
+
+    monkeypatch.setenv("D2D_PROFILE", "1")
+    monkeypatch.setenv("D2D_PROFILE_DIR", str(tmp_path))
+    monkeypatch.setenv("D2D_PROFILE_INTERVAL", "0.001")
+    writer = FakeWriter()
+    tracker = RunTracker(logger=logging.getLogger("t_run_prof"), pipeline="clean", writer=writer)
+
+    def busy():
+        return sum(i * i for i in range(200_000))
+
+    with tracker.step("work"):
+        busy()
+    tracker.succeed()
+
+    prof = writer.updates[-1][1]["meta"]["profile"]
+    assert prof["pstats"] == str(tmp_path / f"clean-{tracker.run_id}.pstats")
+    stats = pstats.Stats(prof["pstats"])
+    assert any(func[2] == "busy" for func in stats.stats)
+    collapsed = (tmp_path / f"clean-{tracker.run_id}.collapsed.txt").read_text()
+    assert prof["samples"] > 0 and collapsed.endswith("\n")
@@ -0,0 +1,100 @@
+# Tests (no DB needed)
+from __future__ import annotations
+
+import uuid
+from datetime import UTC, datetime, timedelta
+
+from fastapi.testclient import TestClient
+
+from app.api import runs as runs_api
+from app.db.session import get_db
+from app.main import app
+from app.services.runs import detect_regressions, fetch_step_samples, fetch_step_stats
+
+T0 = datetime(2026, 2, 1, tzinfo=UTC)
+
+
+def _samples(step: str, durations: list[int]) -> list[dict]:
+    return [
+        {
+            "run_id": uuid.uuid4(),
+            "started_at": T0 + timedelta(hours=i),
+            "step": step,
+            "duration_ms": d,
+        }
+        for i, d in enumerate(durations)
+    ]
+
+
+def test_detect_regressions_flags_latest_sample_above_rolling_median():
+    samples = _samples("upsert", [100, 110, 90, 105, 95, 400]) + _samples("parse", [10] * 6)
+
+    flags = detect_regressions(samples, factor=1.5, window=20, min_samples=5)
+
+    assert [f["step"] for f in flags] == ["upsert"]
+    assert flags[0]["baseline_ms"] == 100
+    assert flags[0]["ratio"] == 4.0
+
+
+def test_detect_regressions_needs_enough_history_and_respects_window():
+    assert detect_regressions(_samples("s", [10, 100]), min_samples=5) == []
+
+    # old slow runs fall out of a window of 3; 40 vs baseline 10 is flagged
+    samples = _samples("s", [50, 50, 50, 10, 10, 10, 40])
+    assert len(detect_regressions(samples, factor=2, window=3, min_samples=3)) == 1
+    assert detect_regressions(samples, factor=2, window=7, min_samples=3) == []
+
+
+def test_detect_regressions_history_mode_checks_every_sample():
+    samples = _samples("s", [10, 10, 10, 50, 10, 10])
+    flags = detect_regressions(samples, factor=2, min_samples=3, latest_only=False)
+    assert [f["duration_ms"] for f in flags] == [50]
+
+
+def test_regressions_endpoint(monkeypatch):
+    class FakeSession:
+        def connection(self):
+            return None
+
+    samples = _samples("apply_sql", [20, 20, 20, 20, 20, 90])
+    monkeypatch.setattr(runs_api, "fetch_step_samples", lambda conn, **kw: samples)
+    app.dependency_overrides[get_db] = lambda: FakeSession()
+    try:
+        r = TestClient(app).get("/runs/regressions", params={"pipeline": "metrics", "factor": 2})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert r.status_code == 200
+    body = r.json()
+    assert body["factor"] == 2
+    assert body["regressions"][0]["step"] == "apply_sql"
+    assert body["regressions"][0]["ratio"] == 4.5
+
+
+def test_step_queries_add_the_steps_filter_only_for_a_step():
+    class FakeConn:
+        def __init__(self):
+            self.calls = []
+
+        def execute(self, sql, params):
+            self.calls.append((str(sql), params))
+            return self
+
+        def mappings(self):
+            return self
+
+        def all(self):
+            return []
+
+    conn = FakeConn()
+    fetch_step_stats(conn, pipeline="metrics", since=T0, bucket="day", step=None)
+    fetch_step_samples(conn, pipeline="metrics", since=T0, step=None)
+    fetch_step_samples(conn, pipeline="metrics", since=T0, step="apply_sql")
+
+    for sql, params in conn.calls[:2]:
+        assert "@>" not in sql and ":step" not in sql
+        assert "probe" not in params and "step" not in params
+    sql, params = conn.calls[2]
+    assert "r.steps @> CAST(:probe AS jsonb)" in sql
+    assert params["probe"] == '[{"step": "apply_sql"}]'
+    assert params["step"] == "apply_sql"
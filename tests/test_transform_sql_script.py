@@ -0,0 +1,39 @@
+# Tests (no DB needed)
+from __future__ import annotations
+
+from pathlib import Path
+
+from app.transform.sql_script import split_sql_statements
+
+
+def test_split_respects_dollar_quotes_strings_and_comments():
+    sql = """
+    -- leading comment; with a semicolon
+    CREATE SCHEMA IF NOT EXISTS summary;
+    DO $$
+    BEGIN
+      EXECUTE 'DROP VIEW x; -- not a comment';
+    END $$;
+    /* block; /* nested; */ still comment */
+    SELECT 'it''s; fine', "odd;name" FROM t;
+    CREATE FUNCTION f() RETURNS int AS $body$ SELECT 1; $body$ LANGUAGE sql;
+    ;
+    """
+    stmts = split_sql_statements(sql)
+
+    assert len(stmts) == 4
+    assert stmts[0] == "CREATE SCHEMA IF NOT EXISTS summary"
+    assert "EXECUTE 'DROP VIEW x; -- not a comment';" in stmts[1]
+    assert stmts[1].endswith("END $$")
+    assert stmts[2].endswith("""SELECT 'it''s; fine', "odd;name" FROM t""")
+    assert "$body$ SELECT 1; $body$" in stmts[3]
+
+
+def test_monthly_metrics_script_splits_into_whole_statements():
+    path = Path(__file__).resolve().parents[1] / "src/app/transform/monthly_metrics.sql"
+    stmts = split_sql_statements(path.read_text(encoding="utf-8"))
+
+    do_block = next(s for s in stmts if s.startswith("DO $$"))
+    assert do_block.endswith("END $$")
+    assert any(s.startswith("CREATE MATERIALIZED VIEW IF NOT EXISTS") for s in stmts)
+    assert any(s.startswith("CREATE UNIQUE INDEX IF NOT EXISTS") for s in stmts)